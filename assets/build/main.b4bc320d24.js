@@ -0,0 +1,139 @@
+const CARD_IMAGE_SIZES="(max-width: 720px) 100vw, 420px";const DETAIL_IMAGE_SIZES="(max-width: 960px) 100vw, 960px";function variantSrcsets(item){const byType={};(item.imageVariants||[]).forEach((variant)=>{if(!variant||!variant.src||!variant.width)return;(byType[variant.type]=byType[variant.type]||[]).push(`${variant.src} ${variant.width}w`);});return["image/avif","image/webp"]
+.filter((type)=>byType[type])
+.map((type)=>({type,srcset:byType[type].join(", ")}));}
+const lazyImages=
+typeof IntersectionObserver==="undefined"?null:new IntersectionObserver(showImages,{rootMargin:"300px 0px"});function showImages(entries){entries.forEach((entry)=>{if(!entry.isIntersecting)return;lazyImages.unobserve(entry.target);const img=entry.target;if(img.parentNode&&img.parentNode.tagName==="PICTURE"){img.parentNode.querySelectorAll("source").forEach((source)=>{source.srcset=source.dataset.srcset;});}
+img.src=img.dataset.src;});}
+function createPicture(item,sizes,alt){const img=document.createElement("img");if(lazyImages)img.dataset.src=item.image;else img.src=item.image;img.alt=alt;img.loading="lazy";img.decoding="async";if(lazyImages)lazyImages.observe(img);const sources=variantSrcsets(item);if(sources.length===0)return img;const picture=document.createElement("picture");sources.forEach(({type,srcset})=>{const source=document.createElement("source");source.type=type;if(lazyImages)source.dataset.srcset=srcset;else source.srcset=srcset;source.sizes=sizes;picture.appendChild(source);});picture.appendChild(img);return picture;}
+function pictureHtml(item,sizes,alt){const sources=variantSrcsets(item)
+.map(({type,srcset})=>`<source type="${type}" srcset="${srcset}" sizes="${sizes}" />`)
+.join("");const img=`<img src="${item.image}" alt="${alt}" decoding="async" />`;return sources?`<picture>${sources}${img}</picture>`:img;}
+function detailHref(kind,id){if(document.documentElement.dataset.prerendered==="true"){return`pages/${kind}/${encodeURIComponent(id)}.html`;}
+return`detail.html?type=${encodeURIComponent(kind)}&id=${encodeURIComponent(id)}`;}
+function createCard(item,kind="generic"){const article=document.createElement("article");article.className="content-card";const isDetailKind=kind==="article"||kind==="project";const detailId=item.id||slugify(item.title||"item");const detailLink=detailHref(kind,detailId);if(item.image){const media=document.createElement("div");media.className="card-media";media.appendChild(createPicture(item,CARD_IMAGE_SIZES,item.imageAlt||`${item.title} cover image`));if(isDetailKind){const mediaAnchor=document.createElement("a");mediaAnchor.href=detailLink;mediaAnchor.setAttribute("aria-label",`Open details for ${item.title}`);mediaAnchor.appendChild(media);article.appendChild(mediaAnchor);}else{article.appendChild(media);}}
+const title=document.createElement("h3");if(isDetailKind){const titleAnchor=document.createElement("a");titleAnchor.className="title-link";titleAnchor.href=detailLink;titleAnchor.textContent=item.title;title.appendChild(titleAnchor);}else{title.textContent=item.title;}
+const summary=document.createElement("p");summary.textContent=item.summary;const tags=document.createElement("div");tags.className="tags";(item.tags||[]).forEach((tag)=>{const span=document.createElement("span");span.className="tag";span.textContent=tag;tags.appendChild(span);});article.appendChild(title);article.appendChild(summary);article.appendChild(tags);if(kind==="article"&&item.category){const meta=document.createElement("p");meta.className="muted";meta.textContent=`Category: ${item.category}`;article.appendChild(meta);}
+if(item.link&&item.link!=="#"){const cta=document.createElement("a");cta.className="text-link";cta.href=item.link;cta.textContent="External link →";cta.target="_blank";cta.rel="noopener noreferrer";article.appendChild(cta);}
+if(isDetailKind){const detailsCta=document.createElement("a");detailsCta.className="text-link";detailsCta.href=detailLink;detailsCta.textContent=kind==="project"?"View project details →":"Read article →";article.appendChild(detailsCta);}
+return article;}
+const WINDOW_MIN_ITEMS=60;const WINDOW_STEP=24;const WINDOW_MAX_CARDS=96;const WINDOW_MARGIN_PX=1200;const CARD_CACHE_SIZE=400;const cardWindows=new Map();function renderItems(containerId,data,kind){const container=document.getElementById(containerId);if(!container)return;let view=cardWindows.get(containerId);if(!view||view.container!==container){view=cardWindow(container,kind);cardWindows.set(containerId,view);}
+view.update(Array.isArray(data)?data:[]);}
+function cardWindow(container,kind){const cards=new Map();const empty=document.createElement("p");empty.className="muted";empty.textContent="No items found.";const basePadding=parseFloat(getComputedStyle(container).paddingTop)||0;const observer=
+typeof IntersectionObserver==="undefined"
+?null
+:new IntersectionObserver(onEdges,{rootMargin:`${WINDOW_MARGIN_PX}px 0px`});let items=[];let start=0;let end=0;let trimmed=[];function cardFor(item){let card=cards.get(item);if(card)cards.delete(item);else card=createCard(item,kind);cards.set(item,card);return card;}
+function forgetCards(keep){for(const[item,card]of cards){if(cards.size<=keep)break;card.querySelectorAll("img").forEach((img)=>lazyImages&&lazyImages.unobserve(img));cards.delete(item);}}
+function draw(){const want=items.length?items.slice(start,end).map(cardFor):[empty];const wanted=new Set(want);Array.from(container.childNodes).forEach((node)=>{if(!wanted.has(node))container.removeChild(node);});let cursor=container.firstChild;want.forEach((node)=>{if(node===cursor)cursor=node.nextSibling;else container.insertBefore(node,cursor);});const offset=trimmed.reduce((sum,chunk)=>sum+chunk.height,0);container.style.paddingTop=offset?`${basePadding+offset}px`:"";forgetCards(Math.max(CARD_CACHE_SIZE,want.length));if(!observer)return;observer.disconnect();if(start>0)observer.observe(want[0]);if(end<items.length)observer.observe(want[want.length-1]);}
+function trimRows(){if(end-start<=WINDOW_MAX_CARDS)return;const nodes=container.children;let columns=1;while(columns<nodes.length&&nodes[columns].offsetTop===nodes[0].offsetTop)columns+=1;const count=Math.floor(WINDOW_STEP/columns)*columns;if(!count||count>=nodes.length)return;if(nodes[count].getBoundingClientRect().top>-WINDOW_MARGIN_PX)return;trimmed.push({count,height:nodes[count].offsetTop-nodes[0].offsetTop});start+=count;}
+function onEdges(entries){const near=new Set(entries.filter((entry)=>entry.isIntersecting).map((entry)=>entry.target));if(start>0&&near.has(container.firstChild)){start-=trimmed.pop().count;end=Math.min(end,start+WINDOW_MAX_CARDS);draw();}else if(end<items.length&&near.has(container.lastChild)){end=Math.min(items.length,end+WINDOW_STEP);trimRows();draw();}}
+function update(next){const keep=next.length>start&&next[0]===items[0]&&items.slice(0,start).every((item,i)=>next[i]===item);if(!keep){start=0;end=0;trimmed=[];}
+const step=observer&&next.length>WINDOW_MIN_ITEMS?WINDOW_STEP:next.length;end=Math.min(next.length,Math.max(end,start+step));if(step===next.length){start=0;trimmed=[];}
+items=next;draw();}
+return{container,update};}
+function slugify(text){return String(text||"")
+.toLowerCase()
+.trim()
+.replace(/[^a-z0-9\s-]/g,"")
+.replace(/\s+/g,"-")
+.replace(/-+/g,"-");}
+function escapeHtml(text){return String(text||"")
+.replace(/&/g,"&amp;")
+.replace(/</g,"&lt;")
+.replace(/>/g,"&gt;")
+.replace(/"/g,"&quot;")
+.replace(/'/g,"&#39;");}
+function renderInlineMarkdown(text){let html=escapeHtml(text);html=html.replace(/!\[([^\]]*)\]\((https?:\/\/[^\s)]+)\)/g,'<img src="$2" alt="$1" loading="lazy" referrerpolicy="no-referrer" />');html=html.replace(/`([^`]+)`/g,"<code>$1</code>");html=html.replace(/\*\*([^*]+)\*\*/g,"<strong>$1</strong>");html=html.replace(/__([^_]+)__/g,"<strong>$1</strong>");html=html.replace(/\*([^*]+)\*/g,"<em>$1</em>");html=html.replace(/_([^_]+)_/g,"<em>$1</em>");html=html.replace(/\[([^\]]+)\]\((https?:\/\/[^\s)]+)\)/g,'<a href="$2" target="_blank" rel="noopener noreferrer">$1</a>');return html;}
+function markdownToHtml(markdownText){const text=String(markdownText||"").replace(/\r\n/g,"\n");if(!text.trim())return"";const lines=text.split("\n");const blocks=[];let inUl=false;let inOl=false;let inCode=false;let codeLines=[];let paragraphLines=[];const flushParagraph=()=>{if(paragraphLines.length===0)return;const merged=paragraphLines.join(" ").trim();if(merged){blocks.push(`<p>${renderInlineMarkdown(merged)}</p>`);}
+paragraphLines=[];};const closeLists=()=>{if(inUl){blocks.push("</ul>");inUl=false;}
+if(inOl){blocks.push("</ol>");inOl=false;}};const closeOpenBlocks=()=>{flushParagraph();closeLists();};for(const rawLine of lines){const line=rawLine.trim();if(inCode){if(/^```/.test(line)){blocks.push(`<pre><code>${escapeHtml(codeLines.join("\n"))}</code></pre>`);codeLines=[];inCode=false;}else{codeLines.push(rawLine);}
+continue;}
+if(/^```/.test(line)){closeOpenBlocks();inCode=true;codeLines=[];continue;}
+if(!line){closeOpenBlocks();continue;}
+if(/^---+$/.test(line)){closeOpenBlocks();blocks.push("<hr />");continue;}
+const headingMatch=line.match(/^(#{1,6})\s+(.*)$/);if(headingMatch){closeOpenBlocks();const level=headingMatch[1].length;blocks.push(`<h${level}>${renderInlineMarkdown(headingMatch[2])}</h${level}>`);continue;}
+const quoteMatch=line.match(/^>\s?(.*)$/);if(quoteMatch){closeOpenBlocks();blocks.push(`<blockquote><p>${renderInlineMarkdown(quoteMatch[1])}</p></blockquote>`);continue;}
+const ulMatch=line.match(/^[-*+]\s+(.*)$/);if(ulMatch){flushParagraph();if(inOl){blocks.push("</ol>");inOl=false;}
+if(!inUl){blocks.push("<ul>");inUl=true;}
+blocks.push(`<li>${renderInlineMarkdown(ulMatch[1])}</li>`);continue;}
+const olMatch=line.match(/^\d+\.\s+(.*)$/);if(olMatch){flushParagraph();if(inUl){blocks.push("</ul>");inUl=false;}
+if(!inOl){blocks.push("<ol>");inOl=true;}
+blocks.push(`<li>${renderInlineMarkdown(olMatch[1])}</li>`);continue;}
+paragraphLines.push(line);}
+if(inCode){blocks.push(`<pre><code>${escapeHtml(codeLines.join("\n"))}</code></pre>`);}
+closeOpenBlocks();return blocks.join("\n");}
+const ASSET_MANIFEST=readAssetManifest();function readAssetManifest(){const element=document.getElementById("asset-manifest");try{return(element&&JSON.parse(element.textContent).files)||{};}catch(err){return{};}}
+function assetUrl(path){return ASSET_MANIFEST[path]||path;}
+const SEARCH_INDEX_URL=assetUrl("assets/data/search-index.json");const SEARCH_DEBOUNCE_MS=120;let searchIndexPromise=null;function loadSearchIndex(){if(!searchIndexPromise){searchIndexPromise=fetchJson(SEARCH_INDEX_URL)
+.then((index)=>(index&&index.v===1&&Array.isArray(index.terms)?index:null))
+.catch(()=>null);}
+return searchIndexPromise;}
+function searchTokens(text){return String(text||"").toLowerCase().match(/[\p{L}\p{N}]+/gu)||[];}
+function firstTermAtLeast(terms,token){let lo=0;let hi=terms.length;while(lo<hi){const mid=(lo+hi)>>1;if(terms[mid]<token)lo=mid+1;else hi=mid;}
+return lo;}
+function queryIndex(index,query,kind){const tokens=searchTokens(query);if(!tokens.length)return null;let totals=null;tokens.forEach((token)=>{const scores=new Map();for(let t=firstTermAtLeast(index.terms,token);t<index.terms.length;t+=1){const term=index.terms[t];if(!term.startsWith(token))break;const postings=index.postings[t];for(let p=0;p<postings.length;p+=2){const doc=postings[p];if(index.docs[doc][0]===kind)scores.set(doc,(scores.get(doc)||0)+postings[p+1]);}}
+if(totals===null){totals=scores;return;}
+const both=new Map();totals.forEach((score,doc)=>{if(scores.has(doc))both.set(doc,score+scores.get(doc));});totals=both;});return[...totals.entries()].sort((a,b)=>b[1]-a[1]).map(([doc])=>index.docs[doc][1]);}
+function setupSearch(inputId,data,containerId,kind="generic"){const input=document.getElementById(inputId);if(!input)return;const normalize=(text)=>(text||"").toLowerCase();const byId=new Map();const reindex=()=>{byId.clear();data.forEach((item)=>byId.set(String(item.id||slugify(item.title||"")),item));};reindex();let index=null;let timer=0;const linearFilter=(q)=>
+data.filter((item)=>{const blob=[item.title,item.summary,(item.tags||[]).join(" "),item.category]
+.filter(Boolean)
+.join(" ")
+.toLowerCase();return blob.includes(q);});const run=()=>{const q=normalize(input.value.trim());if(!q){renderItems(containerId,data,kind);return;}
+const ranked=index?queryIndex(index,q,kind):null;const filtered=ranked?ranked.map((id)=>byId.get(id)).filter(Boolean):linearFilter(q);renderItems(containerId,filtered,kind);};loadSearchIndex().then((loaded)=>{index=loaded;if(index&&input.value.trim())run();});input.addEventListener("input",()=>{clearTimeout(timer);timer=setTimeout(run,SEARCH_DEBOUNCE_MS);});return()=>{reindex();run();};}
+function setYear(){document.querySelectorAll("#year").forEach((node)=>{node.textContent=new Date().getFullYear();});}
+function setupMobileNav(){const toggle=document.querySelector(".menu-toggle");const nav=document.getElementById("site-nav");if(!toggle||!nav)return;toggle.addEventListener("click",()=>{const isOpen=nav.classList.toggle("open");toggle.setAttribute("aria-expanded",String(isOpen));});}
+function bootHomePage(projectsData){if(document.getElementById("featured-projects")){const render=()=>renderItems("featured-projects",projectsData.slice(0,3),"project");render();watchEntries("project",projectsData,render);}
+return document.getElementById("recent-articles")!==null;}
+function renderRecentArticles(articlesData){if(document.getElementById("recent-articles")){const render=()=>renderItems("recent-articles",articlesData.slice(0,3),"article");render();watchEntries("article",articlesData,render);}}
+const DATA_FILES={article:{index:"assets/data/articles.index.json",full:"assets/data/articles.json",shards:"assets/data/articles/"},project:{index:"assets/data/projects.index.json",full:"assets/data/projects.json",shards:"assets/data/projects/"},quranic:{index:"assets/data/quranic_notes.index.json",full:"assets/data/quranic_notes.json",shards:"assets/data/quranic_notes/",},};function fallbackData(kind){if(kind==="project")return projects;if(kind==="quranic")return tafseerCollections;return articles;}
+function fetchJson(url){return fetch(url).then((response)=>{if(!response.ok)throw new Error(`Could not load ${url}`);return response.json();});}
+const listDataPromises={};function loadListData(kind){if(!listDataPromises[kind]){const files=DATA_FILES[kind];const built=ASSET_MANIFEST[files.index]||ASSET_MANIFEST[files.full];listDataPromises[kind]=(built?fetchJson(built):Promise.reject(new Error("not built")))
+.catch(()=>fetchJson(files.index))
+.catch(()=>fetchJson(files.full))
+.then((data)=>(Array.isArray(data)?data:fallbackData(kind)))
+.catch(()=>fallbackData(kind));}
+return listDataPromises[kind];}
+function loadArticlesData(){return loadListData("article");}
+function loadProjectsData(){return loadListData("project");}
+function loadQuranicData(){return loadListData("quranic");}
+async function loadEntry(kind,id){try{const entry=await fetchJson(`${DATA_FILES[kind].shards}${encodeURIComponent(id)}.json`);if(entry&&typeof entry==="object")return entry;}catch(err){}
+return findItemById(await loadListData(kind),id);}
+function findItemById(items,id){const target=String(id||"");return(items||[]).find((item)=>{const itemId=item.id||slugify(item.title||"");return itemId===target;});}
+const DETAIL_KINDS={article:{label:"Article",listPage:"articles.html",listName:"articles"},project:{label:"Project",listPage:"projects.html",listName:"projects"},quranic:{label:"Qur'anic Note",listPage:"quranic-notes.html",listName:"notes"},};function renderDetailView(kind,item){const detailRoot=document.getElementById("detail-view");if(!detailRoot)return;const meta=DETAIL_KINDS[kind]||DETAIL_KINDS.article;if(!item){detailRoot.innerHTML=`
+      <article class="content-card detail-card">
+        <h1>Content not found</h1>
+        <p class="lead slim">The requested ${kind} could not be found. Please return to the listing page.</p>
+        <p><a class="text-link" href="${meta.listPage}">Go back →</a></p>
+      </article>
+    `;return;}
+const text=item.content||item.details||item.summary||"";const renderedContent=markdownToHtml(text);const tags=(item.tags||[])
+.map((tag)=>`<span class="tag">${tag}</span>`)
+.join("");detailRoot.innerHTML=`
+    <article class="content-card detail-card">
+      ${item.image?`<div class="card-media detail-media">${pictureHtml(item,DETAIL_IMAGE_SIZES,item.imageAlt||item.title)}</div>`:""}
+      <p class="eyebrow">${meta.label}</p>
+      <h1>${item.title}</h1>
+      <p class="lead slim">${item.summary||""}</p>
+      <div class="tags">${tags}</div>
+      <section class="detail-content">${renderedContent}</section>
+      <div class="detail-actions">
+        <a class="text-link" href="${meta.listPage}">← Back to ${meta.listName}</a>
+        ${item.link&&item.link!=="#"?`<a class="text-link" target="_blank" rel="noopener noreferrer" href="${item.link}">Open external resource →</a>`:""}
+      </div>
+    </article>
+  `;}
+async function bootDetailPage(){const detailRoot=document.getElementById("detail-view");if(!detailRoot)return;if(detailRoot.dataset.prerendered==="true"){const match=window.location.pathname.match(/\/pages\/(\w+)\/([^/]+)\.html$/);if(match&&DETAIL_KINDS[match[1]]){const shown=[];const kind=match[1];watchEntries(kind,shown,()=>renderDetailView(kind,shown[0]),decodeURIComponent(match[2]));}
+return;}
+const params=new URLSearchParams(window.location.search);const type=params.get("type");const id=params.get("id");const kind=DETAIL_KINDS[type]?type:"article";const item=await loadEntry(kind,id);renderDetailView(kind,item);const shown=item?[item]:[];watchEntries(kind,shown,()=>renderDetailView(kind,shown[0]),String(id||""));}
+function bootProjectsPage(projectsData){if(!document.getElementById("projects-grid"))return;renderItems("projects-grid",projectsData,"project");const refresh=setupSearch("project-search",projectsData,"projects-grid","project");watchEntries("project",projectsData,refresh||(()=>renderItems("projects-grid",projectsData,"project")));}
+function bootArticlesPage(articlesData){renderItems("articles-grid",articlesData,"article");const refresh=setupSearch("article-search",articlesData,"articles-grid","article");watchEntries("article",articlesData,refresh||(()=>renderItems("articles-grid",articlesData,"article")));}
+function bootQuranicPage(quranicData){const render=()=>renderItems("tafseer-grid",quranicData,"generic");render();watchEntries("quranic",quranicData,render);}
+function isPrerendered(containerId){const container=document.getElementById(containerId);return!!container&&container.dataset.prerendered==="true";}
+function setupLazySearch(inputId,loadData,containerId,kind){const input=document.getElementById(inputId);if(!input)return;let refresh=null;const activate=async()=>{input.removeEventListener("focus",activate);input.removeEventListener("input",activate);const data=await loadData();refresh=refresh||setupSearch(inputId,data,containerId,kind);if(input.value)input.dispatchEvent(new Event("input"));};input.addEventListener("focus",activate);input.addEventListener("input",activate);if(document.getElementById(containerId)){watchEntries(kind,loadData,()=>(refresh?refresh():activate().then(()=>refresh())));}}
+const LIVE_HOSTS=new Set(["127.0.0.1","localhost"]);const liveViews=[];function watchEntries(kind,data,render,id=""){liveViews.push({kind,data,render,id});}
+function patchEntries(data,id,item){const at=data.findIndex((entry)=>String(entry.id||slugify(entry.title||""))===id);if(item&&at>=0)data[at]=item;else if(item)data.unshift(item);else if(at>=0)data.splice(at,1);}
+async function fetchLiveEntry(kind,id){const url=new URL(`api/get?${new URLSearchParams({kind,id})}`,document.baseURI);const response=await fetch(url,{cache:"no-cache"});if(!response.ok)return null;return(await response.json()).item||null;}
+function subscribeToChanges(){if(!LIVE_HOSTS.has(window.location.hostname)||typeof EventSource==="undefined")return;const source=new EventSource(new URL("api/events",document.baseURI));source.addEventListener("change",async(event)=>{const change=JSON.parse(event.data);const views=liveViews.filter((view)=>view.kind===change.kind&&(!view.id||view.id===change.id));if(!views.length)return;const item=change.action==="deleted"?null:await fetchLiveEntry(change.kind,change.id);for(const view of views){if(typeof view.data==="function")view.data=await view.data();patchEntries(view.data,change.id,item);await view.render();}});source.addEventListener("reset",()=>window.location.reload());}
+function registerServiceWorker(){if(!("serviceWorker"in navigator)||!window.isSecureContext)return;navigator.serviceWorker.register(new URL("sw.js",document.baseURI)).catch(()=>undefined);}
+document.addEventListener("DOMContentLoaded",async()=>{registerServiceWorker();subscribeToChanges();setYear();setupMobileNav();const has=(id)=>document.getElementById(id)!==null;let hasRecentArticleSection=false;if(has("featured-projects")||(has("projects-grid")&&!isPrerendered("projects-grid"))){const projectsData=await loadProjectsData();hasRecentArticleSection=bootHomePage(projectsData);bootProjectsPage(projectsData);}else{setupLazySearch("project-search",loadProjectsData,"projects-grid","project");}
+if(has("tafseer-grid")&&!isPrerendered("tafseer-grid")){bootQuranicPage(await loadQuranicData());}
+await bootDetailPage();const hasArticlesPage=has("articles-grid")&&!isPrerendered("articles-grid");if(hasRecentArticleSection||hasArticlesPage){const articlesData=await loadArticlesData();renderRecentArticles(articlesData);if(hasArticlesPage){bootArticlesPage(articlesData);}}else{setupLazySearch("article-search",loadArticlesData,"articles-grid","article");}});
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""Minified, content-hashed copies of the site's JS, CSS and data files, and the pages that load them.
+
+Every asset becomes ``assets/build/<name>.<hash>.<ext>``, so the static host
+can serve the whole directory as immutable; only the HTML pages (and the data
+shards, which keep their names) are revalidated. The pages' ``<script>`` and
+``<link>`` references are rewritten in place, whether they name the source
+file or an earlier build, and each page carries the data-file part of the
+manifest inline (``<script id="asset-manifest">``) so main.js can fetch
+``articles.<hash>.json`` without an extra round trip.
+
+Builds are incremental: ``assets/build/manifest.json`` records a hash of each
+source, and a file is only minified again when its source changed. The
+previous build of each file is kept, so a page cached just before a deploy
+still finds its assets. The service worker (``sw.js``, see service_worker.py)
+is regenerated with the pages, so it precaches exactly this build.
+
+The minifiers are deliberately conservative (stdlib only): JSON is re-encoded
+compactly; CSS loses comments and insignificant whitespace; JS loses comments
+and indentation but keeps line breaks wherever automatic semicolon insertion
+could depend on them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import service_worker
+from content_store import atomic_write_text
+
+OUT_DIR = "assets/build"
+MANIFEST = "manifest.json"
+HASH_CHARS = 10
+IMMUTABLE = "public, max-age=31536000, immutable"
+PAGES = ("index.html", "articles.html", "projects.html", "quranic-notes.html", "detail.html")
+CODE_ASSETS = ("assets/css/main.css", "assets/js/content.js", "assets/js/main.js")
+
+IDENT = re.compile(r"[\w$\\]")
+# A "/" after one of these starts a regular expression rather than a division.
+REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "instanceof", "yield", "await",
+}
+CSS_TOKENS = re.compile(r"""("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|/\*.*?\*/|\s+|[^"'/\s]+|/)""", re.S)
+CSS_TIGHT = set("{};,>")
+
+
+def minify_json(text: str) -> str:
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+
+
+def minify_css(text: str) -> str:
+    out: list[str] = []
+    pending_space = False
+    for token in CSS_TOKENS.findall(text):
+        if token.startswith("/*"):
+            pending_space = True
+            continue
+        if token.isspace():
+            pending_space = True
+            continue
+        if pending_space and out and out[-1][-1] not in CSS_TIGHT and token[0] not in CSS_TIGHT:
+            out.append(" ")
+        pending_space = False
+        out.append(token)
+    css = "".join(out)
+    # "a: b" -> "a:b" inside declarations only; a space before ":" is a selector combinator.
+    css = re.sub(r'(?<=[\w)"\'])\s*:\s+(?=[^{}]*[;}])', ":", css)
+    return css.replace(";}", "}")
+
+
+def minify_js(text: str) -> str:
+    out: list[str] = []
+    i, n = 0, len(text)
+    # One entry per open template literal: the brace depth of its current ${...}.
+    templates: list[int] = []
+    depth = 0
+
+    def last_significant() -> str:
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ""
+
+    def regex_allowed() -> bool:
+        prev = last_significant()
+        if not prev:
+            return True
+        if prev[-1] in REGEX_AFTER:
+            return True
+        word = re.search(r"[\w$]+$", prev)
+        return bool(word) and word.group() in REGEX_KEYWORDS
+
+    def template_body(start: int) -> int:
+        """Copy template text from ``start``; return the index after it (past ` or ${)."""
+        j = start
+        while j < n:
+            c = text[j]
+            if c == "\\":
+                j += 2
+                continue
+            if c == "`":
+                out.append(text[start : j + 1])
+                return j + 1
+            if c == "$" and text.startswith("${", j):
+                out.append(text[start : j + 2])
+                templates.append(depth)
+                return j + 2
+            j += 1
+        raise ValueError("unterminated template literal")
+
+    while i < n:
+        c = text[i]
+        if c in "\"'":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i : j + 1])
+            i = j + 1
+        elif c == "`":
+            out.append("`")
+            i = template_body(i + 1)
+        elif c == "{":
+            depth += 1
+            out.append(c)
+            i += 1
+        elif c == "}":
+            if templates and templates[-1] == depth:
+                templates.pop()
+                out.append("}")
+                i = template_body(i + 1)
+                continue
+            depth -= 1
+            out.append(c)
+            i += 1
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            if end < 0:
+                raise ValueError("unterminated comment")
+            out.append("\n" if "\n" in text[i:end] else " ")
+            i = end + 2
+        elif c == "/" and regex_allowed():
+            j, in_class = i + 1, False
+            while j < n and (in_class or text[j] != "/"):
+                if text[j] == "\\":
+                    j += 1
+                elif text[j] == "[":
+                    in_class = True
+                elif text[j] == "]":
+                    in_class = False
+                elif text[j] == "\n":
+                    raise ValueError("unterminated regular expression")
+                j += 1
+            j += 1
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            out.append(text[i:j])
+            i = j
+        elif c.isspace():
+            j = i
+            while j < n and text[j].isspace():
+                j += 1
+            out.append("\n" if "\n" in text[i:j] else " ")
+            i = j
+        else:
+            j = i + 1
+            while j < n and not (text[j].isspace() or text[j] in "\"'`{}/"):
+                j += 1
+            out.append(text[i:j])
+            i = j
+    return _squeeze(out)
+
+
+def _squeeze(chunks: list[str]) -> str:
+    """Drop the whitespace chunks nothing depends on: spaces between punctuation, newlines after ``{;,``."""
+    kept: list[str] = []
+    for index, chunk in enumerate(chunks):
+        if chunk not in (" ", "\n"):
+            kept.append(chunk)
+            continue
+        prev = kept[-1][-1] if kept and kept[-1] else ""
+        nxt = next((c[0] for c in chunks[index + 1 :] if c not in (" ", "\n") and c), "")
+        if not prev or not nxt:
+            continue
+        if chunk == " ":
+            # Keep "a b", "a + +b" and "a - -b"; everything else touches punctuation.
+            if (IDENT.match(prev) and IDENT.match(nxt)) or (prev in "+-" and nxt == prev):
+                kept.append(" ")
+            continue
+        if prev in "{;,([" or nxt in "}])":
+            continue
+        if kept[-1] in (" ", "\n"):
+            kept[-1] = "\n"
+        else:
+            kept.append("\n")
+    return "".join(kept)
+
+
+MINIFIERS = {".js": minify_js, ".css": minify_css, ".json": minify_json}
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def built_name(logical: str, minified: str) -> str:
+    path = Path(logical)
+    return f"{OUT_DIR}/{path.stem}.{_digest(minified)[:HASH_CHARS]}{path.suffix}"
+
+
+def is_fingerprinted(path: Path, root: Path) -> bool:
+    """True for a built file under ``assets/build`` (not the manifest, which changes in place)."""
+    try:
+        relative = path.resolve().relative_to(root.resolve() / OUT_DIR)
+    except ValueError:
+        return False
+    return re.fullmatch(rf"[^/]+\.[0-9a-f]{{{HASH_CHARS}}}\.\w+", relative.as_posix()) is not None
+
+
+def reference_pattern(logical: str) -> re.Pattern:
+    """``logical`` or any build of it, as a quoted attribute value."""
+    path = Path(logical)
+    built = rf"{re.escape(OUT_DIR)}/{re.escape(path.stem)}\.[0-9a-f]{{{HASH_CHARS}}}{re.escape(path.suffix)}"
+    return re.compile(rf'(?<=["\'])(?:{re.escape(logical)}|{built})(?=["\'])')
+
+
+def manifest_script(data_files: dict[str, str]) -> str:
+    payload = json.dumps({"files": data_files}, sort_keys=True, separators=(",", ":")).replace("</", "<\\/")
+    return f'<script id="asset-manifest" type="application/json">{payload}</script>'
+
+
+def rewrite_page(html: str, files: dict[str, str], data_files: dict[str, str]) -> str:
+    for logical, built in files.items():
+        html = reference_pattern(logical).sub(built, html)
+    block = manifest_script(data_files)
+    existing = re.compile(r'<script id="asset-manifest" type="application/json">.*?</script>', re.S)
+    if existing.search(html):
+        return existing.sub(lambda _: block, html, count=1)
+    # First build: the manifest must come before the scripts that read it.
+    match = re.search(r"^([ \t]*)<script\b", html, re.M)
+    if not match:
+        return html
+    return html[: match.start()] + match.group(1) + block + "\n" + html[match.start() :]
+
+
+def build(root: Path, data_files: list[Path], force: bool = False) -> tuple[dict, list[Path]]:
+    """Bring ``assets/build`` and the pages up to date; return (manifest, paths written or removed).
+
+    ``data_files`` are the JSON files main.js fetches by name (listings and the
+    search index); missing ones are skipped.
+    """
+    out_dir = root / OUT_DIR
+    manifest_path = out_dir / MANIFEST
+    try:
+        old = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        old = {}
+    old_files: dict[str, str] = old.get("files", {})
+    old_sources: dict[str, str] = old.get("sources", {})
+    files: dict[str, str] = {}
+    sources: dict[str, str] = {}
+    touched: list[Path] = []
+
+    # A tree may lack any of these (a bare content repo, a test fixture); only what exists is built.
+    logical_paths = [p for p in CODE_ASSETS if (root / p).exists()]
+    logical_paths += [p.relative_to(root).as_posix() for p in data_files if p.exists()]
+    for logical in logical_paths:
+        source = (root / logical).read_text(encoding="utf-8")
+        source_hash = _digest(source)
+        sources[logical] = source_hash
+        previous = old_files.get(logical)
+        if not force and previous and old_sources.get(logical) == source_hash and (root / previous).exists():
+            files[logical] = previous
+            continue
+        minified = MINIFIERS[Path(logical).suffix](source)
+        built = built_name(logical, minified)
+        files[logical] = built
+        if not (root / built).exists():
+            # Content-addressed, so never rewritten in place; no fsync needed for derived output.
+            atomic_write_text(root / built, minified, durable=False)
+            touched.append(root / built)
+
+    data_map = {logical: built for logical, built in files.items() if logical.endswith(".json")}
+    for page in PAGES:
+        path = root / page
+        if not path.exists():
+            continue
+        html = path.read_text(encoding="utf-8")
+        updated = rewrite_page(html, files, data_map)
+        if updated != html:
+            atomic_write_text(path, updated)
+            touched.append(path)
+
+    worker = root / service_worker.FILE_NAME
+    script = service_worker.render(root, PAGES, sorted(files.values()), HASH_CHARS)
+    if not worker.exists() or worker.read_text(encoding="utf-8") != script:
+        atomic_write_text(worker, script)
+        touched.append(worker)
+
+    # Keep this build and the one before it; anything older is unreachable from current pages.
+    previous = old.get("previous", {}) if files == old_files else {k: v for k, v in old_files.items() if v != files.get(k)}
+    keep = {MANIFEST, *(Path(p).name for p in files.values()), *(Path(p).name for p in previous.values())}
+    if out_dir.exists():
+        for stale in sorted(out_dir.iterdir()):
+            if stale.is_file() and stale.name not in keep:
+                stale.unlink()
+                touched.append(stale)
+    manifest = {"v": 1, "files": files, "sources": sources, "previous": previous}
+    if manifest != old:
+        atomic_write_text(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        touched.append(manifest_path)
+    return manifest, touched
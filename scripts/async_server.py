@@ -0,0 +1,227 @@
+"""asyncio front end for the editor: HTTP/1.1 keep-alive on an event loop, handlers in a bounded pool.
+
+The event loop owns the sockets. It reads each request head (and any small
+body) under a timeout, so an idle keep-alive connection or a client trickling
+its headers costs a coroutine instead of a thread, and it writes responses out
+at the client's pace. The request itself runs in a fixed-size thread pool
+through the same ``BaseHTTPRequestHandler`` subclass the threaded server uses,
+because handlers block on disk, git and image work; the handler sees ordinary
+``rfile``/``wfile`` objects bridged to the loop.
+
+Large or chunked bodies (uploads) are streamed to the handler rather than
+buffered, and a handler that writes a lot (a big static file, an event
+stream) waits for the client to drain once more than ``FLUSH_BYTES`` are in
+flight. A connection whose body was streamed is closed after the response,
+since the handler may not have read all of it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+
+HEAD_LIMIT = 64 * 1024
+HEAD_TIMEOUT = 10.0
+KEEPALIVE_TIMEOUT = 15.0
+BODY_TIMEOUT = 30.0
+SEND_TIMEOUT = 30.0
+BUFFER_BODY_BYTES = 1024 * 1024
+FLUSH_BYTES = 256 * 1024
+
+
+class _LoopReader:
+    """``rfile`` for a handler thread: the bytes the loop already read, then the socket."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, data: bytes, reader: asyncio.StreamReader | None, wfile):
+        self._loop = loop
+        self._data = data
+        self._pos = 0
+        self._reader = reader
+        self._wfile = wfile
+
+    def _fetch(self, coro) -> bytes:
+        # Anything the handler wrote so far (an interim "100 Continue") must reach the client first.
+        self._wfile.flush()
+        try:
+            return asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, BODY_TIMEOUT), self._loop).result()
+        except asyncio.TimeoutError:
+            raise ConnectionResetError("client stopped sending the request body") from None
+
+    def readline(self, limit: int = -1) -> bytes:
+        end = self._data.find(b"\n", self._pos)
+        if end >= 0 or self._reader is None:
+            stop = len(self._data) if end < 0 else end + 1
+            if limit >= 0:
+                stop = min(stop, self._pos + limit)
+            line, self._pos = self._data[self._pos : stop], stop
+            return line
+        line = self._data[self._pos :] + self._fetch(self._reader.readline())
+        self._pos = len(self._data)
+        return line if limit < 0 else line[:limit]
+
+    def read(self, n: int = -1) -> bytes:
+        out = self._data[self._pos : len(self._data) if n < 0 else self._pos + n]
+        self._pos += len(out)
+        if self._reader is None:
+            return out
+        if n < 0:
+            return out + self._fetch(self._reader.read())
+        while len(out) < n:
+            chunk = self._fetch(self._reader.read(n - len(out)))
+            if not chunk:
+                break
+            out += chunk
+        return out
+
+
+class _LoopWriter:
+    """``wfile`` for a handler thread: hands writes to the loop, waiting only when the client falls behind."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter):
+        self._loop = loop
+        self._writer = writer
+        self._buffer = bytearray()
+        self._in_flight = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= FLUSH_BYTES:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._writer.transport.is_closing():
+            raise BrokenPipeError("client disconnected")
+        chunk, self._buffer = bytes(self._buffer), bytearray()
+        self._loop.call_soon_threadsafe(self._writer.write, chunk)
+        self._in_flight += len(chunk)
+        if self._in_flight >= FLUSH_BYTES:
+            self._in_flight = 0
+            try:
+                asyncio.run_coroutine_threadsafe(self.drain(), self._loop).result()
+            except (asyncio.TimeoutError, ConnectionError) as exc:
+                raise ConnectionResetError(f"client stopped reading: {exc or 'timed out'}") from None
+
+    async def drain(self) -> None:
+        await asyncio.wait_for(self._writer.drain(), SEND_TIMEOUT)
+
+
+def bridged(handler_class: type[BaseHTTPRequestHandler]) -> type[BaseHTTPRequestHandler]:
+    """``handler_class`` speaking HTTP/1.1 over a (rfile, wfile) pair instead of a socket."""
+
+    class Bridged(handler_class):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            self.rfile, self.wfile = self.request
+
+        def handle(self):
+            self.close_connection = True
+            self.handle_one_request()
+
+        def finish(self):
+            self.wfile.flush()
+
+    Bridged.__name__ = f"Bridged{handler_class.__name__}"
+    return Bridged
+
+
+def _body_framing(head: bytes) -> tuple[int, bool]:
+    """(bytes to buffer before dispatch, whether the body must be streamed instead)."""
+    length, stream = 0, False
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            try:
+                length = int(value.strip())
+            except ValueError:
+                stream = True
+        elif name == b"transfer-encoding" or (name == b"expect" and value.strip().lower() == b"100-continue"):
+            stream = True
+    if length < 0 or length > BUFFER_BODY_BYTES:
+        stream = True
+    return (0 if stream else length), stream
+
+
+def _plain_response(status: HTTPStatus) -> bytes:
+    body = f"{status.value} {status.phrase}\n".encode("ascii")
+    return (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: text/plain\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    ).encode("ascii") + body
+
+
+class AsyncServer:
+    def __init__(self, handler_class: type[BaseHTTPRequestHandler], workers: int = 8, max_connections: int = 256):
+        self.handler_class = bridged(handler_class)
+        self.workers = workers
+        self.max_connections = max_connections
+        self.connections = 0
+        self.pool: ThreadPoolExecutor | None = None
+
+    def _run_handler(self, rfile: _LoopReader, wfile: _LoopWriter, peer) -> bool:
+        """Handle one request in a worker thread; True if the connection can be reused."""
+        try:
+            handler = self.handler_class((rfile, wfile), peer, self)
+        except (BrokenPipeError, ConnectionResetError):
+            return False
+        except Exception:  # noqa: BLE001
+            traceback.print_exc(file=sys.stderr)
+            return False
+        return not handler.close_connection
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        if self.connections >= self.max_connections:
+            writer.write(_plain_response(HTTPStatus.SERVICE_UNAVAILABLE))
+            writer.close()
+            return
+        self.connections += 1
+        peer = (writer.get_extra_info("peername") or ("", 0))[:2]
+        timeout = HEAD_TIMEOUT
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+                    length, stream = _body_framing(head)
+                    body = await asyncio.wait_for(reader.readexactly(length), BODY_TIMEOUT) if length else b""
+                except asyncio.LimitOverrunError:
+                    writer.write(_plain_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE))
+                    return
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    # Idle past the keep-alive timeout, too slow to send a request, or gone.
+                    return
+                wfile = _LoopWriter(loop, writer)
+                rfile = _LoopReader(loop, head + body, reader if stream else None, wfile)
+                keep_alive = await loop.run_in_executor(self.pool, self._run_handler, rfile, wfile, peer)
+                await wfile.drain()
+                if not keep_alive or stream:
+                    return
+                timeout = KEEPALIVE_TIMEOUT
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="editor-worker")
+        server = await asyncio.start_server(
+            self._connection, host, port, limit=HEAD_LIMIT, backlog=self.max_connections, reuse_address=True
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run(handler_class: type[BaseHTTPRequestHandler], host: str, port: int, workers: int, max_connections: int) -> None:
+    asyncio.run(AsyncServer(handler_class, workers, max_connections).serve(host, port))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Cold build versus warm rebuild of the pre-rendered pages on a synthetic corpus.
+
+Run:
+  python3 scripts/benchmarks/bench_build.py --entries 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import build_site  # noqa: E402
+import editor  # noqa: E402
+
+WORDS = "model data inference pipeline transformer latency deploy tafsir verse insight gradient token".split()
+
+
+def paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def body(rng: random.Random, paragraphs: int) -> str:
+    blocks = []
+    for i in range(paragraphs):
+        if i % 5 == 0:
+            blocks.append(f"## Section {i}")
+        if i % 7 == 3:
+            blocks.append("\n".join(f"- **{rng.choice(WORDS)}** {paragraph(rng, 6)}" for _ in range(4)))
+        blocks.append(paragraph(rng, 60))
+    return "\n\n".join(blocks)
+
+
+def make_site(entries: int, seed: int = 7) -> Path:
+    rng = random.Random(seed)
+    root = Path(tempfile.mkdtemp(prefix="editor-build-bench-"))
+    for page in ("detail.html", "articles.html", "projects.html", "quranic-notes.html"):
+        shutil.copy(editor.ROOT / page, root / page)
+    data = root / "assets" / "data"
+    data.mkdir(parents=True)
+    articles = [
+        {
+            "id": f"article-{i}",
+            "title": f"Article {i}",
+            "summary": paragraph(rng, 20),
+            "tags": rng.sample(WORDS, 3),
+            "category": "Technical",
+            "link": "#",
+            "image": "",
+            "imageAlt": "",
+            "content": body(rng, 12),
+        }
+        for i in range(entries)
+    ]
+    (data / "articles.json").write_text(json.dumps(articles), encoding="utf-8")
+    (data / "projects.json").write_text("[]", encoding="utf-8")
+    (data / "quranic_notes.json").write_text("[]", encoding="utf-8")
+    return root
+
+
+def timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    stats = fn()
+    print(f"{label:<28} {time.perf_counter() - start:>8.2f}s  {stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, default=10, help="entries changed before the last rebuild")
+    args = parser.parse_args()
+
+    editor.ROOT = make_site(args.entries)
+    print(f"{args.entries} articles in {editor.ROOT}")
+    timed("cold build", build_site.build)
+    timed("warm rebuild (no changes)", build_site.build)
+    for i in range(args.edits):
+        editor.persist_entry(
+            {"kind": "article", "originalId": f"article-{i}", "title": f"Article {i}", "about": "Edited", "body": "New"}
+        )
+    editor.STORE.flush()
+    timed(f"warm rebuild ({args.edits} edits)", build_site.build)
+    shutil.rmtree(editor.ROOT)
+
+
+if __name__ == "__main__":
+    main()
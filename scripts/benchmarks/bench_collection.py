@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Per-operation cost of the editor's entry collection versus the old list filters.
+
+Run:
+  python3 scripts/benchmarks/bench_collection.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_store import EntryCollection  # noqa: E402
+
+SIZES = (100, 1_000, 10_000, 100_000)
+OPS = 200
+
+
+def make_entries(n: int) -> list[dict]:
+    return [{"id": f"entry-{i}", "title": f"Entry {i}", "summary": "s", "content": "body"} for i in range(n)]
+
+
+def list_upsert(entries: list, item: dict, match_ids: set) -> list:
+    entries = [e for e in entries if str(e.get("id", "")) not in match_ids]
+    entries.insert(0, item)
+    return entries
+
+
+def list_delete(entries: list, entry_id: str) -> list:
+    return [e for e in entries if str(e.get("id", "")) != entry_id]
+
+
+def per_op_us(fn, ops: int = OPS) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def bench(n: int) -> dict[str, float]:
+    targets = [f"entry-{(i * 7919) % n}" for i in range(OPS)]
+    results = {}
+
+    entries = make_entries(n)
+
+    def old_upsert(i: int) -> None:
+        nonlocal entries
+        entries = list_upsert(entries, {"id": targets[i], "title": "t"}, {targets[i]})
+
+    results["list upsert"] = per_op_us(old_upsert)
+    entries = make_entries(n)
+    results["list delete"] = per_op_us(lambda i: list_delete(entries, targets[i]))
+
+    coll = EntryCollection(make_entries(n))
+    results["lookup"] = per_op_us(lambda i: coll.get(targets[i]))
+    results["upsert-front"] = per_op_us(lambda i: coll.upsert_front({"id": targets[i], "title": "t"}))
+    results["rename"] = per_op_us(
+        lambda i: coll.upsert_front({"id": f"{targets[i]}-renamed", "title": "t"}, replace_ids=[targets[i]])
+    )
+    results["delete"] = per_op_us(lambda i: coll.delete(f"{targets[i]}-renamed"))
+    return results
+
+
+def main() -> None:
+    rows = [(n, bench(n)) for n in SIZES]
+    columns = list(rows[0][1])
+    print(f"{'entries':>8} " + " ".join(f"{c:>13}" for c in columns) + "   (microseconds per op)")
+    for n, result in rows:
+        print(f"{n:>8} " + " ".join(f"{result[c]:>13.2f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
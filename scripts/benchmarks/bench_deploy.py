@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Per-deploy git subprocesses and wall time: `git add -A` versus staging only dirty paths.
+
+Each strategy gets its own throwaway repository (pushing to a local bare
+remote) whose working tree also holds many large untracked files, as a site
+with raw photos or build output lying around would. Every round saves one
+article through the editor and then deploys it.
+
+Run:
+  python3 scripts/benchmarks/bench_deploy.py --assets 400 --asset-kb 512 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import editor  # noqa: E402
+from deploy_queue import DeployJob  # noqa: E402
+
+_RealPopen = subprocess.Popen
+spawned = 0
+
+
+class CountingPopen(_RealPopen):
+    def __init__(self, *args, **kwargs):
+        global spawned
+        spawned += 1
+        super().__init__(*args, **kwargs)
+
+
+def git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def make_repo(assets: int, asset_kb: int) -> Path:
+    base = Path(tempfile.mkdtemp(prefix="editor-deploy-bench-"))
+    git(base, "init", "-q", "--bare", "remote.git")
+    site = base / "site"
+    data = site / "assets" / "data"
+    data.mkdir(parents=True)
+    for name in ("articles.json", "projects.json", "quranic_notes.json"):
+        (data / name).write_text("[]\n", encoding="utf-8")
+    git(site, "init", "-q", "-b", "main")
+    git(site, "config", "user.email", "bench@example.com")
+    git(site, "config", "user.name", "bench")
+    git(site, "add", "-A")
+    git(site, "commit", "-q", "-m", "init")
+    git(site, "remote", "add", "origin", str(base / "remote.git"))
+    git(site, "push", "-q", "origin", "main")
+    raw = site / "assets" / "raw"
+    raw.mkdir()
+    for i in range(assets):
+        (raw / f"photo-{i:05d}.bin").write_bytes(os.urandom(asset_kb * 1024))
+    return site
+
+
+def legacy_deploy(message: str) -> None:
+    """The pre-dirty-set pipeline: rev-parse, add -A, diff --cached, commit, push."""
+
+    def run_git(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], cwd=editor.ROOT, text=True, capture_output=True, check=False)
+
+    editor.STORE.flush()
+    run_git("rev-parse", "--is-inside-work-tree")
+    run_git("add", "-A")
+    if run_git("diff", "--cached", "--quiet").returncode == 0:
+        return
+    run_git("commit", "-m", message)
+    run_git("push", "origin", "main")
+
+
+def selective_deploy(message: str) -> None:
+    editor.run_deploy(DeployJob(message), lambda line: None)
+
+
+def bench(label: str, deploy, args) -> None:
+    global spawned
+    editor.ROOT = make_repo(args.assets, args.asset_kb)
+    editor.STORE.invalidate()
+    times, counts = [], []
+    for i in range(args.rounds):
+        editor.persist_entry({"kind": "article", "title": f"Post {i}", "about": "About", "body": f"Body {i}"})
+        spawned = 0
+        start = time.perf_counter()
+        deploy(f"Deploy {i}")
+        times.append(time.perf_counter() - start)
+        counts.append(spawned)
+    first, rest = times[0], times[1:] or times
+    print(
+        f"{label:<10} first {first * 1000:>9.1f} ms   then median {statistics.median(rest) * 1000:>8.1f} ms"
+        f"   git processes/deploy {statistics.median(counts):.0f}"
+    )
+    shutil.rmtree(editor.ROOT.parent)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=400, help="untracked large files in the working tree")
+    parser.add_argument("--asset-kb", type=int, default=512)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    subprocess.Popen = CountingPopen
+    print(f"{args.assets} untracked files of {args.asset_kb} KiB, {args.rounds} save+deploy rounds")
+    bench("add -A", legacy_deploy, args)
+    bench("selective", selective_deploy, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Storage growth of delta revision logs versus full snapshots over many edits.
+
+Simulates an author editing one long article: each edit rewrites, inserts or
+deletes a paragraph or two. Every revision is read back and checked against
+what was saved.
+
+Run:
+  python3 scripts/benchmarks/bench_history.py --edits 1000 --kb 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import revisions  # noqa: E402
+
+WORDS = "model data inference pipeline transformer latency deploy tafsir verse insight gradient token".split()
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+
+
+def edit(rng: random.Random, paragraphs: list[str]) -> None:
+    action = rng.random()
+    i = rng.randrange(len(paragraphs))
+    if action < 0.6:
+        paragraphs[i] = paragraph(rng)
+    elif action < 0.8:
+        paragraphs.insert(i, paragraph(rng))
+    elif len(paragraphs) > 10:
+        del paragraphs[i]
+    if rng.random() < 0.2:
+        j = rng.randrange(len(paragraphs))
+        paragraphs[j] = paragraphs[j] + " " + paragraph(rng)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edits", type=int, default=1000)
+    parser.add_argument("--kb", type=int, default=50, help="approximate article size")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    paragraphs: list[str] = []
+    while len("\n\n".join(paragraphs)) < args.kb * 1024:
+        paragraphs.append(paragraph(rng))
+
+    # Measure raw growth first; the retention policy is applied once at the end.
+    revisions.COMPACT_EVERY = args.edits + 2
+    root = Path(tempfile.mkdtemp(prefix="editor-history-bench-"))
+    log = root / "article.jsonl"
+    saved, snapshot_bytes = [], 0
+    start_time = time.time() - args.edits * 3600
+    append_seconds = 0.0
+    for n in range(args.edits + 1):
+        if n:
+            edit(rng, paragraphs)
+        entry = {"id": "long-read", "title": "A long read", "summary": "About", "tags": ["x"], "content": "\n\n".join(paragraphs)}
+        snapshot_bytes += len(json.dumps(entry, ensure_ascii=False))
+        t = time.perf_counter()
+        # An hour apart, so the squash window never folds these saves together.
+        revisions.record_revision(log, entry, now=start_time + n * 3600)
+        append_seconds += time.perf_counter() - t
+        saved.append(entry)
+
+    size = log.stat().st_size
+    print(f"{args.edits} edits to a {len(saved[0]['content']) // 1024} KiB article")
+    print(f"full snapshots   {snapshot_bytes / 1024:>10.1f} KiB")
+    print(f"delta log        {size / 1024:>10.1f} KiB  ({snapshot_bytes / size:.1f}x smaller)")
+    print(f"append           {append_seconds / (args.edits + 1) * 1000:>10.2f} ms/save")
+
+    t = time.perf_counter()
+    kept = revisions.list_revisions(log)
+    for summary in kept:
+        assert revisions.entry_at(log, summary["rev"]) == saved[summary["rev"] - 1], summary["rev"]
+    print(f"read back        {(time.perf_counter() - t) / len(kept) * 1000:>10.2f} ms/revision ({len(kept)} verified)")
+
+    before, after = revisions.compact(log, now=start_time + args.edits * 3600)
+    kept = revisions.list_revisions(log)
+    for summary in kept:
+        assert revisions.entry_at(log, summary["rev"]) == saved[summary["rev"] - 1], summary["rev"]
+    print(
+        f"after retention  {after / 1024:>10.1f} KiB  ({len(kept)} revisions kept: newest {revisions.KEEP}"
+        f" plus anything under {revisions.KEEP_DAYS:g} days old)"
+    )
+    shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env node
+// Per-keystroke cost of main.js's renderItems under a minimal DOM shim (no browser needed).
+//
+// Loads assets/js/main.js into a VM context with just the DOM main.js touches,
+// a fixed grid layout (COLUMNS cards per ROW_PX-high row) and an
+// IntersectionObserver that reports against a VIEWPORT_PX window. It types a
+// query into an articles grid one character at a time, then deletes it again,
+// timing renderItems three ways:
+// - as a browser runs it, windowed with lazy images;
+// - with no IntersectionObserver, which keeps and moves cards but renders all of them;
+// - as a full rebuild of every card, which is what renderItems did before.
+// Then it scrolls the unfiltered list from top to bottom and back.
+//
+// Run by scripts/benchmarks/bench_suite.py; standalone:
+//   node scripts/benchmarks/bench_render.js assets/data/articles.json --query transformer
+//
+// Prints one JSON object per case: {case, samples_ms, elements, max_cards}.
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+const { performance } = require("perf_hooks");
+
+const COLUMNS = 3;
+const ROW_PX = 420;
+const VIEWPORT_PX = 900;
+
+let created = 0;
+let scrollY = 0;
+const observers = new Set();
+
+class Node {
+  constructor() {
+    this.parentNode = null;
+    this.childNodes = [];
+  }
+
+  get firstChild() {
+    return this.childNodes[0] || null;
+  }
+
+  get lastChild() {
+    return this.childNodes[this.childNodes.length - 1] || null;
+  }
+
+  get nextSibling() {
+    if (!this.parentNode) return null;
+    const siblings = this.parentNode.childNodes;
+    return siblings[siblings.indexOf(this) + 1] || null;
+  }
+
+  get children() {
+    return this.childNodes.filter((node) => node instanceof Element);
+  }
+
+  insertBefore(node, ref) {
+    if (node.parentNode) node.parentNode.removeChild(node);
+    const at = ref ? this.childNodes.indexOf(ref) : this.childNodes.length;
+    this.childNodes.splice(at < 0 ? this.childNodes.length : at, 0, node);
+    node.parentNode = this;
+    return node;
+  }
+
+  appendChild(node) {
+    return this.insertBefore(node, null);
+  }
+
+  removeChild(node) {
+    this.childNodes.splice(this.childNodes.indexOf(node), 1);
+    node.parentNode = null;
+    return node;
+  }
+
+  get textContent() {
+    return this.childNodes.map((node) => node.textContent).join("");
+  }
+
+  set textContent(text) {
+    this.childNodes.forEach((node) => (node.parentNode = null));
+    this.childNodes = [];
+    if (text !== "") this.appendChild(new Text(String(text)));
+  }
+}
+
+class Text extends Node {
+  constructor(data) {
+    super();
+    this.data = data;
+  }
+
+  get textContent() {
+    return this.data;
+  }
+}
+
+class Element extends Node {
+  constructor(tagName) {
+    super();
+    created += 1;
+    this.tagName = tagName.toUpperCase();
+    this.dataset = {};
+    this.style = {};
+    this.attributes = {};
+    this.className = "";
+  }
+
+  setAttribute(name, value) {
+    this.attributes[name] = String(value);
+  }
+
+  set innerHTML(html) {
+    // renderItems' old empty state is the only markup this benchmark sets.
+    this.textContent = "";
+    if (html) this.appendChild(new Text(html));
+  }
+
+  querySelectorAll(tag) {
+    const out = [];
+    const walk = (node) =>
+      node.children.forEach((child) => {
+        if (child.tagName === tag.toUpperCase()) out.push(child);
+        walk(child);
+      });
+    walk(this);
+    return out;
+  }
+
+  get isConnected() {
+    let node = this;
+    while (node.parentNode) node = node.parentNode;
+    return node === document.body;
+  }
+
+  // The grid: the container's element children fill COLUMNS per row below its padding.
+  get offsetTop() {
+    const parent = this.parentNode;
+    if (!parent) return 0;
+    const padding = parseFloat(parent.style.paddingTop) || 0;
+    return padding + Math.floor(parent.children.indexOf(this) / COLUMNS) * ROW_PX;
+  }
+
+  getBoundingClientRect() {
+    let card = this;
+    while (card.parentNode && card.parentNode !== grid) card = card.parentNode;
+    if (!card.parentNode || !this.isConnected) return { top: 0, bottom: 0, height: 0, detached: true };
+    const top = card.offsetTop - scrollY;
+    return { top, bottom: top + ROW_PX, height: ROW_PX };
+  }
+}
+
+class IntersectionObserver {
+  constructor(callback, options = {}) {
+    this.callback = callback;
+    this.margin = parseFloat(options.rootMargin) || 0;
+    this.targets = new Map();
+    observers.add(this);
+  }
+
+  observe(target) {
+    this.targets.set(target, undefined);
+  }
+
+  unobserve(target) {
+    this.targets.delete(target);
+  }
+
+  disconnect() {
+    this.targets.clear();
+  }
+
+  // What a browser computes after layout: entries for new targets and changed ones.
+  takeEntries() {
+    const entries = [];
+    this.targets.forEach((was, target) => {
+      const rect = target.getBoundingClientRect();
+      const isIntersecting = !rect.detached && rect.bottom >= -this.margin && rect.top <= VIEWPORT_PX + this.margin;
+      if (was !== isIntersecting) entries.push({ target, isIntersecting });
+      this.targets.set(target, isIntersecting);
+    });
+    return entries;
+  }
+}
+
+function settle() {
+  // Deliver observer callbacks until the page stops changing, as frames would.
+  for (let round = 0; round < 1000; round += 1) {
+    let delivered = false;
+    observers.forEach((observer) => {
+      const entries = observer.takeEntries();
+      if (entries.length) {
+        delivered = true;
+        observer.callback(entries);
+      }
+    });
+    if (!delivered) return;
+  }
+  throw new Error("observers did not settle");
+}
+
+const document = {
+  body: new Element("body"),
+  documentElement: new Element("html"),
+  baseURI: "http://localhost/",
+  createElement: (tag) => new Element(tag),
+  getElementById: (id) => (id === grid.id ? grid : null),
+  querySelectorAll: () => [],
+  addEventListener: () => undefined,
+};
+const grid = document.body.appendChild(new Element("section"));
+grid.id = "articles-grid";
+grid.className = "card-grid";
+
+function loadMain(observer) {
+  const context = {
+    document,
+    window: { location: { hostname: "", pathname: "/articles.html", search: "" }, isSecureContext: false },
+    navigator: {},
+    IntersectionObserver: observer,
+    getComputedStyle: (element) => ({ paddingTop: element.style.paddingTop || "0px" }),
+    console,
+    setTimeout,
+    clearTimeout,
+    URL,
+    URLSearchParams,
+  };
+  vm.createContext(context);
+  const source = fs.readFileSync(path.join(__dirname, "..", "..", "assets", "js", "main.js"), "utf8");
+  vm.runInContext(source, context, { filename: "main.js" });
+  return context;
+}
+
+function rebuild(legacy, data) {
+  // renderItems before windowing: every card built again on every call.
+  if (!data.length) {
+    grid.innerHTML = "<p class='muted'>No items found.</p>";
+    return;
+  }
+  grid.innerHTML = "";
+  data.forEach((item) => grid.appendChild(legacy.createCard(item, "article")));
+}
+
+function filter(data, query) {
+  // setupSearch's scan when the search index is not loaded.
+  return data.filter((item) =>
+    [item.title, item.summary, (item.tags || []).join(" "), item.category]
+      .filter(Boolean)
+      .join(" ")
+      .toLowerCase()
+      .includes(query)
+  );
+}
+
+function measure(name, steps, run) {
+  const samples = [];
+  let elements = 0;
+  let maxCards = 0;
+  steps.forEach((step) => {
+    const before = created;
+    const start = performance.now();
+    run(step);
+    settle();
+    samples.push(performance.now() - start);
+    elements += created - before;
+    maxCards = Math.max(maxCards, grid.children.length);
+  });
+  return { case: name, samples_ms: samples, elements: Math.round(elements / steps.length), max_cards: maxCards };
+}
+
+function main() {
+  const args = process.argv.slice(2);
+  const file = args.find((arg) => !arg.startsWith("--"));
+  const queryAt = args.indexOf("--query");
+  const query = queryAt >= 0 ? args[queryAt + 1] : "transformer";
+  if (!file) throw new Error("usage: bench_render.js <entries.json> [--query text]");
+  const data = JSON.parse(fs.readFileSync(file, "utf8"));
+  const main = loadMain(IntersectionObserver);
+  // What main.js does without IntersectionObserver: every image eager, no window.
+  const legacy = loadMain(undefined);
+
+  // Type the query, then delete it again: each intermediate string is one keystroke.
+  const typed = Array.from(query, (_, i) => query.slice(0, i + 1));
+  const keystrokes = [...typed, ...typed.slice(0, -1).reverse(), ""];
+  const results = [];
+  const filtered = new Map(keystrokes.map((q) => [q, q ? filter(data, q) : data]));
+
+  main.renderItems("articles-grid", data, "article");
+  settle();
+  results.push(measure("keystroke (renderItems)", keystrokes, (q) => main.renderItems("articles-grid", filtered.get(q), "article")));
+  results.push(
+    measure("keystroke (no observer)", keystrokes, (q) => legacy.renderItems("articles-grid", filtered.get(q), "article"))
+  );
+  results.push(measure("keystroke (full rebuild)", keystrokes, (q) => rebuild(legacy, filtered.get(q))));
+
+  main.renderItems("articles-grid", [], "article");
+  main.renderItems("articles-grid", data, "article");
+  settle();
+  const rows = Math.ceil(data.length / COLUMNS);
+  const positions = [];
+  for (let y = 0; y <= rows * ROW_PX; y += VIEWPORT_PX) positions.push(y);
+  positions.push(...positions.slice(0, -1).reverse());
+  results.push(
+    measure("scroll (renderItems)", positions, (y) => {
+      scrollY = y;
+    })
+  );
+  results.forEach((result) => process.stdout.write(`${JSON.stringify(result)}\n`));
+}
+
+main();
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Load-test the threaded and asyncio editor servers: requests/sec and latency percentiles.
+
+Each mode runs as its own ``editor.py serve`` process on a free port against
+this checkout. A single asyncio client keeps --connections connections busy
+for --duration seconds per path, reusing a connection whenever the server
+allows it (the threaded server closes after every response, so its latencies
+include the reconnect). Latency is measured per request, first byte sent to
+last byte received.
+
+Run:
+  python3 scripts/benchmarks/bench_server.py --connections 32 --duration 5
+  python3 scripts/benchmarks/bench_server.py --path "/api/list?kind=project" --path /assets/js/main.js
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+MODES = ("threading", "asyncio")
+DEFAULT_PATHS = ("/api/list?kind=article", "/assets/css/main.css", "/assets/js/main.js")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, str(SCRIPTS / "editor.py"), "serve", "--server", mode, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise SystemExit(f"{mode} server did not start on port {port}")
+
+
+async def fetch(port: int, request: bytes, conn: list) -> None:
+    """One request over ``conn`` ([reader, writer] or empty), reconnecting as needed."""
+    if not conn:
+        conn[:] = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = conn
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {k.strip().lower(): v.strip().lower() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+    if not lines[0].startswith("HTTP/1.1 2") and not lines[0].startswith("HTTP/1.0 2"):
+        raise ValueError(lines[0])
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()
+    if lines[0].startswith("HTTP/1.0") or headers.get("connection") == "close" or "content-length" not in headers:
+        writer.close()
+        conn.clear()
+
+
+async def load(port: int, path: str, connections: int, duration: float) -> tuple[list[float], int]:
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept-Encoding: gzip\r\nConnection: keep-alive\r\n\r\n"
+    ).encode("ascii")
+    latencies: list[float] = []
+    errors = 0
+    stop = time.perf_counter() + duration
+
+    async def client() -> None:
+        nonlocal errors
+        conn: list = []
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                await fetch(port, request, conn)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                errors += 1
+                if conn:
+                    conn[1].close()
+                    conn.clear()
+                continue
+            latencies.append(time.perf_counter() - start)
+        if conn:
+            conn[1].close()
+
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return latencies, errors
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=32, help="concurrent client connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode and path")
+    parser.add_argument("--path", action="append", help=f"path to request (repeatable; default: {', '.join(DEFAULT_PATHS)})")
+    parser.add_argument("--mode", choices=MODES, action="append", help="limit to a server mode (repeatable)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'path':<28} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in args.mode or MODES:
+        port = free_port()
+        proc = start_server(mode, port)
+        try:
+            for path in args.path or DEFAULT_PATHS:
+                asyncio.run(load(port, path, 1, 0.5))  # warm caches and compressed bodies
+                latencies, errors = asyncio.run(load(port, path, args.connections, args.duration))
+                latencies.sort()
+                print(
+                    f"{mode:<10} {path:<28} {len(latencies) / args.duration:>9.0f}"
+                    f" {percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} {errors:>7}",
+                    flush=True,
+                )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""List, get, save, delete and search latency of the JSON and SQLite storage backends.
+
+For each corpus size every backend gets a fresh site holding that many
+articles: the monolithic JSON file, the sharded JSON layout, and the SQLite
+store (EDITOR_STORAGE=sqlite). Saves and deletes go through persist_entry and
+delete_entry and include getting the change onto disk (for JSON storage, the
+flush of the data file and search index the write-behind store would do a
+moment later).
+
+Run:
+  python3 scripts/benchmarks/bench_storage.py --sizes 1000,10000,100000 --ops 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import editor  # noqa: E402
+from content_store import STORE, atomic_write_text, dump_json  # noqa: E402
+
+WORDS = (
+    "model data inference pipeline transformer latency deploy tafsir verse insight gradient token "
+    "cluster kernel sensor driver embedded quantum vector index cache shard replica"
+).split()
+BACKENDS = ("json", "json-sharded", "sqlite")
+OPERATIONS = ("list", "get", "save", "delete", "search")
+
+
+def words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_site(n: int, body_bytes: int, seed: int) -> Path:
+    rng = random.Random(seed)
+    root = Path(tempfile.mkdtemp(prefix="editor-storage-bench-"))
+    data = root / "assets" / "data"
+    entries = []
+    for i in range(n):
+        entries.append(
+            {
+                "id": f"post-{i}",
+                "title": f"Post {i} {words(rng, 4)}",
+                "summary": words(rng, 20),
+                "tags": rng.sample(WORDS, 3),
+                "link": "#",
+                "image": "",
+                "imageAlt": "",
+                "category": "Technical",
+                "content": words(rng, body_bytes // 7),
+            }
+        )
+    atomic_write_text(data / "articles.json", dump_json(entries), durable=False)
+    for name in ("projects.json", "quranic_notes.json"):
+        atomic_write_text(data / name, "[]\n", durable=False)
+    return root
+
+
+def use(backend: str, root: Path) -> float:
+    """Point the editor at ``root`` with ``backend``; returns setup seconds."""
+    start = time.perf_counter()
+    STORE.invalidate()
+    editor.ROOT = root
+    editor.STORAGE = "sqlite" if backend == "sqlite" else "json"
+    editor._db = None
+    if backend == "json-sharded":
+        editor.migrate_layout("article", "sharded")
+    if backend == "sqlite":
+        editor.storage_db()
+    else:
+        editor.rebuild_search_index()
+    return time.perf_counter() - start
+
+
+def timed(fn, ops: int) -> float:
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench(backend: str, n: int, args) -> tuple[float, dict[str, float]]:
+    root = make_site(n, args.body_bytes, args.seed)
+    setup = use(backend, root)
+    rng = random.Random(args.seed + 1)
+    targets = rng.sample(range(n), min(n, args.ops * 2))
+    saves, deletes = targets[: args.ops], targets[args.ops :]
+    query = {"tags": [], "category": "", "q": "", "cursor": "", "limit": 50}
+
+    def save(i: int) -> None:
+        entry = editor.read_entry("article", f"post-{saves[i]}")
+        editor.persist_entry(
+            {
+                "kind": "article",
+                "originalId": entry["id"],
+                "title": entry["title"],
+                "about": entry["summary"],
+                "body": entry["content"] + " edited",
+                "tags": ", ".join(entry["tags"]),
+            }
+        )
+        STORE.flush()
+
+    def delete(i: int) -> None:
+        editor.delete_entry({"kind": "article", "id": f"post-{deletes[i % len(deletes)]}"})
+        STORE.flush()
+
+    results = {
+        "list": timed(lambda i: editor.list_entries("article", list(editor.DEFAULT_LIST_FIELDS), **query), args.ops),
+        "get": timed(lambda i: editor.get_entry("article", f"post-{targets[i]}"), args.ops),
+        "save": timed(save, args.ops),
+        "delete": timed(delete, min(args.ops, len(deletes))) if deletes else float("nan"),
+        # A title number narrows the hits the way a real query does; every article shares the vocabulary.
+        "search": timed(lambda i: editor.search_entries("article", f"post {targets[i]} {WORDS[i % len(WORDS)][:3]}"), args.ops),
+    }
+    STORE.invalidate()
+    editor._db = None
+    shutil.rmtree(root)
+    return setup, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated corpus sizes")
+    parser.add_argument("--ops", type=int, default=20, help="timed operations of each kind")
+    parser.add_argument("--body-bytes", type=int, default=800, help="approximate article body size")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="limit to a backend (repeatable)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'backend':<13} {'setup s':>8} " + " ".join(f"{op:>9}" for op in OPERATIONS))
+    print(f"{'':>8} {'':<13} {'':>8} " + " ".join(f"{'ms':>9}" for _ in OPERATIONS))
+    for n in (int(size) for size in args.sizes.split(",")):
+        for backend in args.backend or BACKENDS:
+            setup, results = bench(backend, n, args)
+            cells = " ".join(f"{results[op]:>9.2f}" for op in OPERATIONS)
+            print(f"{n:>8} {backend:<13} {setup:>8.1f} {cells}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
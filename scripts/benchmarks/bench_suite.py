@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Direct-call and loopback-HTTP latency of the editor's hot paths as the corpus grows, saved as JSON.
+
+For each --sizes value a fresh corpus (corpus.py) is generated with the given
+body size and inline-image density, and the editor is pointed at it. The
+"direct" cases call the functions the handlers use: ensure_json_array,
+list_entries (a page, and a search), get_entry, compose_body_from_additions
+(inline images as data URIs), save_image, and persist_entry plus the flush
+the write-behind store would do a moment later. The "http" cases send the
+same work through EditorHandler on an in-process loopback server, one
+connection per request as the threaded server handles them; saves there are
+timed to the response, as a user sees them. The "render" cases run
+bench_render.js under node (skipped when node is not installed). That script
+times main.js's renderItems against the corpus's article listing, per
+keystroke of a search and per scroll step, using a DOM shim instead of a
+browser.
+
+Each case runs --ops times or until --budget seconds have passed (at least
+three times). --out writes every case's p50/p95/mean and ops/s with the
+run's settings; --baseline compares against an earlier file and exits 1 if
+any case's p50 grew, or its throughput fell, by more than --threshold.
+
+Run:
+  python3 scripts/benchmarks/bench_suite.py --sizes 10,1000,100000 --out bench.json
+  python3 scripts/benchmarks/bench_suite.py --sizes 10,1000 --baseline bench.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+sys.path.insert(0, str(SCRIPTS / "benchmarks"))
+
+import corpus  # noqa: E402
+import editor  # noqa: E402
+from content_store import STORE  # noqa: E402
+
+BACKENDS = ("json", "json-sharded", "sqlite")
+# Differences below this are timer noise, whatever the ratio.
+NOISE_MS = 0.05
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "ops_per_s": round(len(ordered) / sum(ordered), 2) if sum(ordered) else float("inf"),
+    }
+
+
+def timed(fn, ops: int, budget: float) -> dict:
+    samples: list[float] = []
+    stop = time.perf_counter() + budget
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+        if len(samples) >= 3 and time.perf_counter() > stop:
+            break
+    return summarize(samples)
+
+
+def use(backend: str, root: Path) -> None:
+    STORE.invalidate()
+    editor.ROOT = root
+    editor.STORAGE = "sqlite" if backend == "sqlite" else "json"
+    editor._db = None
+    if backend == "sqlite":
+        editor.storage_db()
+    else:
+        editor.rebuild_search_index()
+
+
+def release(root: Path) -> None:
+    # A save over HTTP schedules an asset rebuild; it must not run against a deleted corpus.
+    with editor._asset_timer_lock:
+        if editor._asset_timer is not None:
+            editor._asset_timer.cancel()
+    STORE.flush()
+    STORE.invalidate()
+    editor._db = None
+    shutil.rmtree(root, ignore_errors=True)
+
+
+class QuietHandler(editor.EditorHandler):
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+class Loopback:
+    """EditorHandler on 127.0.0.1 with an ephemeral port, served from a thread."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), QuietHandler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def request(self, method: str, path: str, body: bytes | None = None, content_type: str = "") -> bytes:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            headers = {"Accept-Encoding": "gzip"}
+            if content_type:
+                headers["Content-Type"] = content_type
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            if response.status >= 400:
+                raise RuntimeError(f"{method} {path}: {response.status} {data[:200]!r}")
+            return data
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def save_payload(entry: dict, i: int) -> dict:
+    return {
+        "kind": "article",
+        "originalId": entry["id"],
+        "title": entry["title"],
+        "about": entry["summary"],
+        "body": f"{entry['content']}\n\nEdit {i}.",
+        "tags": ", ".join(entry["tags"]),
+        "category": entry.get("category", "Technical"),
+    }
+
+
+def bench(backend: str, n: int, args) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    root = Path(tempfile.mkdtemp(prefix="editor-bench-suite-")) / "site"
+    layout = "sharded" if backend == "json-sharded" else "monolithic"
+    corpus.build(root, n, args.body_bytes, args.image_density, args.image_bytes, args.image_pool, layout, args.seed)
+    use(backend, root)
+    setup = time.perf_counter() - start
+
+    rng = random.Random(args.seed + 1)
+    # The file listings are read from: articles.json, or the index of the sharded layout.
+    listing = editor.listing_file("article")
+    ids = [entry["id"] for entry in editor.ensure_json_array(listing)]
+    targets = [rng.choice(ids) for _ in range(args.ops)]
+    # Fresh images, so every save_image call writes; a re-sent image only costs the decode and a stat.
+    fresh = [corpus.data_uri(corpus.png_bytes(rng, args.image_bytes)) for _ in range(args.ops)]
+    uploads = [corpus.png_bytes(rng, args.image_bytes) for _ in range(args.ops)]
+    pool = [corpus.png_bytes(random.Random(args.seed + 2 + i), args.image_bytes) for i in range(args.image_pool)]
+    bodies = [corpus.additions(rng, args.body_bytes, args.image_density, pool) for _ in range(min(args.ops, 8))]
+    query = {"tags": [], "category": "", "q": "", "cursor": "", "limit": 50}
+    words = [f"{corpus.WORDS[i % len(corpus.WORDS)]} {corpus.WORDS[(i * 7) % len(corpus.WORDS)][:4]}" for i in range(args.ops)]
+
+    def persist(i: int) -> None:
+        editor.persist_entry(save_payload(editor.read_entry("article", targets[i]), i))
+        STORE.flush()
+
+    cases = {
+        "direct": {
+            "ensure_json_array": lambda i: editor.ensure_json_array(listing),
+            "list_entries": lambda i: editor.list_entries("article", list(editor.DEFAULT_LIST_FIELDS), **query),
+            "list_entries_search": lambda i: editor.list_entries(
+                "article", list(editor.DEFAULT_LIST_FIELDS), **{**query, "q": words[i]}
+            ),
+            "get_entry": lambda i: editor.get_entry("article", targets[i]),
+            "compose_body_from_additions": lambda i: editor.compose_body_from_additions("article", bodies[i % len(bodies)]),
+            "save_image": lambda i: editor.save_image("article", "bench.png", fresh[i]),
+            "persist_entry": persist,
+        },
+    }
+    if args.http:
+        server = Loopback()
+        cases["http"] = {
+            "GET /api/list": lambda i: server.request("GET", "/api/list?kind=article"),
+            "GET /api/list?q": lambda i: server.request("GET", f"/api/list?kind=article&q={words[i].replace(' ', '+')}"),
+            "GET /api/get": lambda i: server.request("GET", f"/api/get?kind=article&id={targets[i]}"),
+            "GET /assets/js/main.js": lambda i: server.request("GET", "/assets/js/main.js"),
+            "POST /api/upload": lambda i: server.request(
+                "POST", "/api/upload?kind=article&name=bench.png", uploads[i], "image/png"
+            ),
+            "POST /api/save": lambda i: server.request(
+                "POST",
+                "/api/save",
+                json.dumps(save_payload(editor.read_entry("article", targets[i]), i)).encode("utf-8"),
+                "application/json",
+            ),
+        }
+
+    results = []
+    try:
+        for mode, named in cases.items():
+            for case, fn in named.items():
+                fn(0)  # warm caches, as a running editor would have them
+                stats = timed(fn, args.ops, args.budget)
+                results.append({"backend": backend, "entries": n, "mode": mode, "case": case, **stats})
+        if args.render and shutil.which("node"):
+            STORE.flush()
+            for row in render_cases(editor.listing_file("article"), args.query):
+                results.append({"backend": backend, "entries": n, **row})
+    finally:
+        if args.http:
+            server.close()
+        release(root.parent)
+    return setup, results
+
+
+def render_cases(listing: Path, query: str) -> list[dict]:
+    """bench_render.js's cases for ``listing``, summarized like the others."""
+    out = subprocess.run(
+        ["node", str(SCRIPTS / "benchmarks" / "bench_render.js"), str(listing), "--query", query],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    rows = []
+    for line in out.splitlines():
+        case = json.loads(line)
+        stats = summarize([ms / 1000 for ms in case["samples_ms"]])
+        rows.append({"mode": "render", "case": case["case"], **stats, "elements": case["elements"], "max_cards": case["max_cards"]})
+    return rows
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def result_key(result: dict) -> tuple:
+    return result["backend"], result["entries"], result["mode"], result["case"]
+
+
+def compare(baseline: dict, results: list[dict], threshold: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, one line each; cases missing from either are skipped."""
+    before = {result_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\n{'backend':<13} {'entries':>8} {'mode':<7} {'case':<28} {'base p50':>9} {'p50':>9} {'change':>8}")
+    for result in results:
+        old = before.get(result_key(result))
+        if old is None:
+            continue
+        change = result["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        slower = change > threshold and result["p50_ms"] - old["p50_ms"] > NOISE_MS
+        fewer = result["ops_per_s"] < old["ops_per_s"] * (1 - threshold) and result["mean_ms"] - old["mean_ms"] > NOISE_MS
+        flag = "  REGRESSION" if slower or fewer else ""
+        print(
+            f"{result['backend']:<13} {result['entries']:>8} {result['mode']:<7} {result['case']:<28}"
+            f" {old['p50_ms']:>9.3f} {result['p50_ms']:>9.3f} {change:>+8.0%}{flag}"
+        )
+        if flag:
+            regressions.append(
+                f"{'/'.join(map(str, result_key(result)))}: p50 {old['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms,"
+                f" {old['ops_per_s']:.0f} -> {result['ops_per_s']:.0f} ops/s"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="comma-separated article counts (up to 100000)")
+    parser.add_argument("--ops", type=int, default=30, help="timed operations per case, at most")
+    parser.add_argument("--budget", type=float, default=3.0, help="seconds per case before stopping early")
+    parser.add_argument("--body-bytes", type=int, default=2000, help="approximate markdown body size")
+    parser.add_argument("--image-density", type=float, default=0.2, help="inline images per paragraph")
+    parser.add_argument("--image-bytes", type=int, default=50_000, help="approximate size of each image")
+    parser.add_argument("--image-pool", type=int, default=16, help="distinct images in the corpus")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="storage to run (repeatable; default json)")
+    parser.add_argument("--no-http", dest="http", action="store_false", help="skip the loopback HTTP cases")
+    parser.add_argument("--no-render", dest="render", action="store_false", help="skip the node renderItems cases")
+    parser.add_argument("--query", default="transformer", help="search typed one keystroke at a time in the render cases")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", type=Path, help="write the results here as JSON")
+    parser.add_argument("--baseline", type=Path, help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown with --baseline")
+    args = parser.parse_args()
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+
+    results: list[dict] = []
+    print(f"{'backend':<13} {'entries':>8} {'mode':<7} {'case':<28} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>9}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        for backend in args.backend or ("json",):
+            setup, rows = bench(backend, n, args)
+            print(f"{backend:<13} {n:>8} {'setup':<7} {'corpus + index':<28} {'':>4} {setup * 1000:>9.0f}", flush=True)
+            for row in rows:
+                print(
+                    f"{backend:<13} {n:>8} {row['mode']:<7} {row['case']:<28} {row['n']:>4}"
+                    f" {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['ops_per_s']:>9.1f}",
+                    flush=True,
+                )
+            results.extend(rows)
+
+    if args.out:
+        settings = {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()}
+        meta = {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": settings,
+        }
+        args.out.write_text(json.dumps({"v": 1, "meta": meta, "results": results}, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {len(results)} results to {args.out}")
+    if baseline is not None:
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
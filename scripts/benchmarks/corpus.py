@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Generate a deterministic synthetic site: entries, bodies with inline images, and the image files.
+
+The same arguments always produce byte-identical output, so benchmark runs on
+different machines or commits measure the same corpus. Articles get the
+requested count; projects and Qur'anic notes get a tenth each. Bodies are
+markdown of roughly --body-bytes, with headings, lists and, at
+--image-density images per paragraph, inline images drawn from a pool of
+--image-pool distinct PNGs of about --image-bytes each. The site's HTML pages
+and CSS/JS are copied in, so the result can be served by the editor.
+
+Run:
+  python3 scripts/benchmarks/corpus.py /tmp/corpus --entries 10000 --image-density 0.2
+  python3 scripts/benchmarks/corpus.py /tmp/corpus --entries 1000 --layout sharded
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+import shutil
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+SITE = SCRIPTS.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import editor  # noqa: E402
+from content_store import atomic_write_text, dump_json  # noqa: E402
+from image_store import store_bytes  # noqa: E402
+
+WORDS = (
+    "model data inference pipeline transformer latency deploy tafsir verse insight gradient token "
+    "cluster kernel sensor driver embedded quantum vector index cache shard replica"
+).split()
+CATEGORIES = ("Technical", "Research", "Notes")
+SITE_FILES = ("index.html", "articles.html", "projects.html", "quranic-notes.html", "detail.html")
+SITE_DIRS = ("assets/css", "assets/js", "icons")
+
+
+def png_bytes(rng: random.Random, approx_bytes: int) -> bytes:
+    """A valid RGB PNG of about ``approx_bytes`` (random pixels do not compress)."""
+    side = max(1, int((max(approx_bytes, 64) / 3) ** 0.5))
+    raw = b"".join(b"\0" + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def data_uri(png: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def paragraphs(rng: random.Random, body_bytes: int) -> list[str]:
+    """Markdown blocks adding up to about ``body_bytes``."""
+    blocks: list[str] = []
+    size = 0
+    while size < body_bytes:
+        i = len(blocks)
+        if i % 6 == 0:
+            block = f"## {sentence(rng, 3)[:-1]}"
+        elif i % 6 == 4:
+            block = "\n".join(f"- **{rng.choice(WORDS)}** {sentence(rng, 6)}" for _ in range(3))
+        else:
+            block = sentence(rng, 40)
+        blocks.append(block)
+        size += len(block) + 2
+    return blocks
+
+
+def additions(rng: random.Random, body_bytes: int, image_density: float, images: list[bytes]) -> list[dict]:
+    """The editor's save payload blocks for one body: paragraphs plus inline images as data URIs."""
+    out: list[dict] = []
+    for block in paragraphs(rng, body_bytes):
+        out.append({"type": "paragraph", "text": block})
+        if images and rng.random() < image_density:
+            out.append({"type": "image", "imageData": data_uri(rng.choice(images)), "imageName": "inline.png", "imageAlt": "figure"})
+    return out
+
+
+def entry(rng: random.Random, kind: str, i: int, body_bytes: int, image_density: float, image_paths: list[str]) -> dict:
+    title = f"{kind.capitalize()} {i} {rng.choice(WORDS)} {rng.choice(WORDS)}"
+    blocks = paragraphs(rng, body_bytes)
+    if image_paths:
+        for at in range(len(blocks), 0, -1):
+            if rng.random() < image_density:
+                blocks.insert(at, f"![figure]({rng.choice(image_paths)})")
+    item = {
+        "id": editor.slugify(title),
+        "title": title,
+        "summary": sentence(rng, 18),
+        "tags": rng.sample(WORDS, 3),
+        "link": "#",
+        "image": rng.choice(image_paths) if image_paths else "",
+        "imageAlt": "",
+        "category": rng.choice(CATEGORIES),
+    }
+    item["details" if kind == "project" else "content"] = "\n\n".join(blocks)
+    return item
+
+
+def build(
+    root: Path,
+    entries: int,
+    body_bytes: int = 2000,
+    image_density: float = 0.2,
+    image_bytes: int = 50_000,
+    image_pool: int = 16,
+    layout: str = "monolithic",
+    seed: int = 7,
+) -> dict:
+    """Write the corpus under ``root`` (which must not exist yet); returns what was written."""
+    rng = random.Random(seed)
+    root.mkdir(parents=True)
+    for name in SITE_FILES:
+        if (SITE / name).exists():
+            shutil.copy(SITE / name, root / name)
+    for name in SITE_DIRS:
+        if (SITE / name).is_dir():
+            shutil.copytree(SITE / name, root / name)
+    image_dir = root / "assets" / "images" / "articles"
+    images = [png_bytes(rng, image_bytes) for _ in range(image_pool if image_density > 0 else 0)]
+    image_paths = [f"assets/images/articles/{store_bytes(image_dir, png, '.png')[0]}" for png in images]
+    counts = {"article": entries, "project": max(1, entries // 10), "quranic": max(1, entries // 10)}
+    for kind, count in counts.items():
+        items = [entry(rng, kind, i, body_bytes, image_density, image_paths) for i in range(count)]
+        path = root / editor.data_file_for_kind(kind).relative_to(editor.ROOT)
+        atomic_write_text(path, dump_json(items), durable=False)
+    if layout == "sharded":
+        previous = editor.ROOT
+        editor.ROOT = root
+        try:
+            for kind in counts:
+                editor.migrate_layout(kind, "sharded")
+        finally:
+            editor.STORE.invalidate()
+            editor.ROOT = previous
+    return {"entries": counts, "images": len(images), "layout": layout}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", type=Path, help="directory to create")
+    parser.add_argument("--entries", type=int, default=1000, help="articles (projects and notes get a tenth each)")
+    parser.add_argument("--body-bytes", type=int, default=2000, help="approximate markdown body size")
+    parser.add_argument("--image-density", type=float, default=0.2, help="inline images per paragraph")
+    parser.add_argument("--image-bytes", type=int, default=50_000, help="approximate size of each image")
+    parser.add_argument("--image-pool", type=int, default=16, help="distinct images to draw from")
+    parser.add_argument("--layout", choices=["monolithic", "sharded"], default="monolithic")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if args.out.exists():
+        raise SystemExit(f"{args.out} already exists")
+    stats = build(
+        args.out, args.entries, args.body_bytes, args.image_density, args.image_bytes, args.image_pool, args.layout, args.seed
+    )
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
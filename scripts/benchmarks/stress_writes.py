@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Fire parallel saves and deletes at the editor's data layer and check nothing is lost.
+
+Each worker thread saves its own uniquely titled entries, deletes every third
+one again and records what it expects to survive. After all writers finish the
+data file on disk must contain exactly the union of those expectations.
+With --processes, several processes hammer the same files using the
+cross-process advisory lock (EDITOR_LOCK_FILES=1), the way a batch import would
+run alongside the editor.
+
+Run:
+  python3 scripts/benchmarks/stress_writes.py --threads 16 --saves 50
+  python3 scripts/benchmarks/stress_writes.py --processes 4 --threads 8 --saves 25
+  python3 scripts/benchmarks/stress_writes.py --layout sharded
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+KINDS = ("article", "project", "quranic")
+
+
+def run_worker(root: Path, tag: str, threads: int, saves: int) -> dict[str, list[str]]:
+    import editor
+
+    editor.ROOT = root
+
+    def work(thread_no: int) -> dict[str, set[str]]:
+        kept: dict[str, set[str]] = {kind: set() for kind in KINDS}
+        for i in range(saves):
+            kind = KINDS[(thread_no + i) % len(KINDS)]
+            title = f"{tag} t{thread_no} n{i}"
+            result = editor.persist_entry({"kind": kind, "title": title, "about": "stress", "body": f"body {i}"})
+            kept[kind].add(result["id"])
+            if i % 3 == 2:
+                editor.delete_entry({"kind": kind, "id": result["id"]})
+                kept[kind].discard(result["id"])
+        return kept
+
+    expected: dict[str, set[str]] = {kind: set() for kind in KINDS}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for kept in pool.map(work, range(threads)):
+            for kind in KINDS:
+                expected[kind] |= kept[kind]
+    editor.STORE.flush()
+    return {kind: sorted(ids) for kind, ids in expected.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--saves", type=int, default=50, help="saves per thread")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--layout", choices=["monolithic", "sharded"], default="monolithic")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(Path(args.root), args.worker, args.threads, args.saves)))
+        return 0
+
+    root = Path(tempfile.mkdtemp(prefix="editor-stress-"))
+    import editor
+
+    if args.layout == "sharded":
+        editor.ROOT = root
+        for kind in KINDS:
+            editor.migrate_layout(kind, "sharded")
+    start = time.perf_counter()
+    if args.processes == 1:
+        results = [run_worker(root, "p0", args.threads, args.saves)]
+    else:
+        env = {**os.environ, "EDITOR_LOCK_FILES": "1"}
+        procs = [
+            subprocess.Popen(
+                [sys.executable, __file__, "--worker", f"p{n}", "--root", str(root),
+                 "--threads", str(args.threads), "--saves", str(args.saves)],
+                stdout=subprocess.PIPE,
+                env=env,
+                text=True,
+            )
+            for n in range(args.processes)
+        ]
+        results = [json.loads(proc.communicate()[0]) for proc in procs]
+        if any(proc.returncode for proc in procs):
+            print("a worker process failed")
+            return 1
+    elapsed = time.perf_counter() - start
+
+    failed = False
+    total_ops = args.processes * args.threads * args.saves * 4 // 3
+    for kind in KINDS:
+        expected = set().union(*(set(r[kind]) for r in results))
+        editor.ROOT = root
+        on_disk = [e["id"] for e in json.loads(editor.listing_file(kind).read_text(encoding="utf-8"))]
+        if editor.is_sharded(kind):
+            shards = {p.stem for p in editor.shard_dir_for_kind(kind).glob("*.json")}
+            on_disk += sorted(shards.symmetric_difference(on_disk))
+        missing = expected - set(on_disk)
+        extra = set(on_disk) - expected
+        dupes = len(on_disk) - len(set(on_disk))
+        status = "ok" if not (missing or extra or dupes) else "FAIL"
+        failed |= status != "ok"
+        print(f"{kind:>8}: {len(on_disk):>6} entries  missing={len(missing)} unexpected={len(extra)} duplicates={dupes}  {status}")
+    print(f"{total_ops} operations in {elapsed:.2f}s ({total_ops / elapsed:.0f} ops/s), data in {root}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Pre-render detail and list pages so first paint needs no JSON or client-side markdown.
+
+Every entry becomes ``pages/<kind>/<id>.html``, built from detail.html as a
+template, and the listings (articles.html, projects.html, quranic-notes.html)
+get their cards rendered in place, so the pages visitors arrive at are the
+pre-rendered ones; both use the same markup as assets/js/main.js. A listing
+is still its own template: the cards rendered into it last time are dropped
+before rendering again. Builds are incremental: a manifest records a hash per
+page and only pages whose inputs changed are written again.
+
+Every editor deploy runs ``build`` (see run_deploy in editor.py). Run by hand,
+the search index (assets/data/search-index.json) is rebuilt as well, picking
+up any edits made outside the editor, and then the fingerprinted assets
+(scripts/asset_bundle.py), so the templates already point at them.
+
+Run:
+  python3 scripts/build_site.py            # incremental
+  python3 scripts/build_site.py --force    # rebuild everything
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import asset_bundle
+import editor
+from content_store import atomic_write_text
+from markdown_render import escape_html, markdown_to_html
+
+RENDERER_VERSION = 2
+OUT_DIR = "pages"
+CARD_IMAGE_SIZES = "(max-width: 720px) 100vw, 420px"
+DETAIL_IMAGE_SIZES = "(max-width: 960px) 100vw, 960px"
+DETAIL_KINDS = {
+    "article": ("Article", "articles.html", "articles"),
+    "project": ("Project", "projects.html", "projects"),
+    "quranic": ("Qur'anic Note", "quranic-notes.html", "notes"),
+}
+LISTINGS = {
+    "article": ("articles.html", "articles-grid"),
+    "project": ("projects.html", "projects-grid"),
+    "quranic": ("quranic-notes.html", "tafseer-grid"),
+}
+CARD_FIELDS = ("id", "title", "summary", "tags", "category", "link", "image", "imageAlt", "imageVariants")
+
+
+def out_root() -> Path:
+    return editor.ROOT / OUT_DIR
+
+
+def digest(*parts: object) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def entry_id(item: dict) -> str:
+    return str(item.get("id") or editor.slugify(str(item.get("title") or "item")))
+
+
+def variant_srcsets(item: dict) -> list[tuple[str, str]]:
+    by_type: dict[str, list[str]] = {}
+    for variant in item.get("imageVariants") or []:
+        if isinstance(variant, dict) and variant.get("src") and variant.get("width"):
+            by_type.setdefault(variant.get("type", ""), []).append(f"{variant['src']} {variant['width']}w")
+    return [(t, ", ".join(by_type[t])) for t in ("image/avif", "image/webp") if t in by_type]
+
+
+def picture_html(item: dict, sizes: str, alt: str, lazy: bool) -> str:
+    loading = ' loading="lazy"' if lazy else ""
+    img = f'<img src="{escape_html(item["image"])}" alt="{escape_html(alt)}"{loading} decoding="async" />'
+    sources = "".join(
+        f'<source type="{t}" srcset="{escape_html(srcset)}" sizes="{sizes}" />' for t, srcset in variant_srcsets(item)
+    )
+    return f"<picture>{sources}{img}</picture>" if sources else img
+
+
+def card_html(item: dict, kind: str) -> str:
+    """Static counterpart of ``createCard`` in main.js, linking to pre-rendered pages."""
+    title = str(item.get("title") or "")
+    link = f"{OUT_DIR}/{kind}/{entry_id(item)}.html"
+    parts = ['<article class="content-card">']
+    if item.get("image"):
+        media = picture_html(item, CARD_IMAGE_SIZES, item.get("imageAlt") or f"{title} cover image", lazy=True)
+        parts.append(
+            f'<a href="{escape_html(link)}" aria-label="Open details for {escape_html(title)}">'
+            f'<div class="card-media">{media}</div></a>'
+        )
+    parts.append(f'<h3><a class="title-link" href="{escape_html(link)}">{escape_html(title)}</a></h3>')
+    parts.append(f"<p>{escape_html(item.get('summary') or '')}</p>")
+    tags = "".join(f'<span class="tag">{escape_html(tag)}</span>' for tag in item.get("tags") or [])
+    parts.append(f'<div class="tags">{tags}</div>')
+    if kind == "article" and item.get("category"):
+        parts.append(f'<p class="muted">Category: {escape_html(item["category"])}</p>')
+    if item.get("link") and item["link"] != "#":
+        parts.append(
+            f'<a class="text-link" href="{escape_html(item["link"])}" target="_blank" '
+            f'rel="noopener noreferrer">External link →</a>'
+        )
+    cta = {"project": "View project details →", "quranic": "Read note →"}.get(kind, "Read article →")
+    parts.append(f'<a class="text-link" href="{escape_html(link)}">{cta}</a>')
+    parts.append("</article>")
+    return "".join(parts)
+
+
+def detail_html(item: dict, kind: str) -> str:
+    """Mirror of ``renderDetailView`` in main.js (same markup, same markdown output)."""
+    label, list_page, list_name = DETAIL_KINDS[kind]
+    rendered = markdown_to_html(item.get("content") or item.get("details") or item.get("summary") or "")
+    tags = "".join(f'<span class="tag">{tag}</span>' for tag in item.get("tags") or [])
+    media = ""
+    if item.get("image"):
+        picture = picture_html(item, DETAIL_IMAGE_SIZES, item.get("imageAlt") or item.get("title") or "", lazy=False)
+        media = f'<div class="card-media detail-media">{picture}</div>'
+    external = ""
+    if item.get("link") and item["link"] != "#":
+        external = (
+            f'<a class="text-link" target="_blank" rel="noopener noreferrer" href="{item["link"]}">'
+            "Open external resource →</a>"
+        )
+    return f"""
+    <article class="content-card detail-card">
+      {media}
+      <p class="eyebrow">{label}</p>
+      <h1>{item.get("title") or ""}</h1>
+      <p class="lead slim">{item.get("summary") or ""}</p>
+      <div class="tags">{tags}</div>
+      <section class="detail-content">{rendered}</section>
+      <div class="detail-actions">
+        <a class="text-link" href="{list_page}">← Back to {list_name}</a>
+        {external}
+      </div>
+    </article>
+  """
+
+
+class Template:
+    def __init__(self, source: Path, container_id: str, depth: int):
+        html = source.read_text(encoding="utf-8")
+        # A listing rendered in place by an earlier build: back to the bare page first.
+        html = html.replace(' data-prerendered="true"', "")
+        html = re.sub(rf'(<(\w+) id="{container_id}"[^>]*>).*?(</\2>)', r"\1\3", html, count=1, flags=re.S)
+        html = html.replace('<html lang="en">', '<html lang="en" data-prerendered="true">', 1)
+        if depth:
+            # Relative URLs (assets, nav, data fetches in main.js) keep resolving from the site root.
+            html = re.sub(r"(<meta charset=\"UTF-8\" />)", rf'\1\n    <base href="{"../" * depth}" />', html, count=1)
+        match = re.search(rf'(<(\w+) id="{container_id}"[^>]*)>(</\2>)', html)
+        if not match:
+            raise ValueError(f"{source.name} has no #{container_id} container")
+        self.head = html[: match.start()] + match.group(1) + ' data-prerendered="true">'
+        self.tail = html[match.start(3):]
+        self.fingerprint = digest(RENDERER_VERSION, depth, html)
+
+    def render(self, inner: str, title: str | None = None) -> str:
+        head = self.head
+        if title is not None:
+            head = re.sub(
+                r"<title>[^<]*?(\s+Yasir's Portfolio)</title>",
+                lambda m: f"<title>{escape_html(title)}{m[1]}</title>",
+                head,
+                count=1,
+            )
+        return head + inner + self.tail
+
+
+def build(force: bool = False) -> dict[str, int]:
+    root = out_root()
+    manifest_path = root / ".build-manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    detail_template = Template(editor.ROOT / "detail.html", "detail-view", depth=2)
+    pages: dict[str, str] = manifest.get("pages", {})
+    listings: dict[str, list[str]] = manifest.get("listings", {})
+    if force or manifest.get("detail_template") != detail_template.fingerprint:
+        # Keep the keys so pages of deleted entries are still cleaned up.
+        pages = dict.fromkeys(pages, "")
+        listings = {}
+        manifest = {"detail_template": detail_template.fingerprint}
+    seen: set[str] = set()
+    touched: list[Path] = [manifest_path]
+    stats = {"rendered": 0, "unchanged": 0, "removed": 0}
+
+    for kind in editor.KINDS:
+        entries = editor.load_entries(kind)
+        entries = [item for item in entries if editor.SAFE_ID.fullmatch(entry_id(item))]
+        for item in entries:
+            key = f"{kind}/{entry_id(item)}.html"
+            seen.add(key)
+            page_hash = digest(kind, item)
+            if pages.get(key) == page_hash and (root / key).exists():
+                stats["unchanged"] += 1
+                continue
+            html = detail_template.render(detail_html(item, kind), title=str(item.get("title") or ""))
+            # Pages are derived output; skip fsync, a crash just means rebuilding them.
+            atomic_write_text(root / key, html, durable=False)
+            touched.append(root / key)
+            pages[key] = page_hash
+            stats["rendered"] += 1
+
+        listing, container = LISTINGS[kind]
+        path = editor.ROOT / listing
+        if not path.exists():
+            continue
+        list_template = Template(path, container, depth=0)
+        cards = [{f: item[f] for f in CARD_FIELDS if f in item} for item in entries]
+        list_hash = digest(list_template.fingerprint, kind, cards)
+        # The listing is a site page kept in git, so a checkout can put the bare
+        # page back under an unchanged manifest: check the file as well.
+        if listings.get(listing) == [list_hash, digest(path.read_text(encoding="utf-8"))]:
+            stats["unchanged"] += 1
+            continue
+        inner = "".join(card_html(c, kind) for c in cards) or '<p class="muted">No items found.</p>'
+        html = list_template.render(inner)
+        atomic_write_text(path, html)
+        touched.append(path)
+        listings[listing] = [list_hash, digest(html)]
+        stats["rendered"] += 1
+
+    for key in sorted(set(pages) - seen):
+        (root / key).unlink(missing_ok=True)
+        touched.append(root / key)
+        del pages[key]
+        stats["removed"] += 1
+
+    manifest["pages"] = pages
+    manifest["listings"] = listings
+    atomic_write_text(manifest_path, json.dumps(manifest, indent=0, sort_keys=True) + "\n")
+    editor.mark_dirty(*touched)
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-render static detail and list pages.")
+    parser.add_argument("--force", action="store_true", help="ignore the build manifest and render every page")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    exported = editor.export_static_json()
+    if exported:
+        print(f"Exported {len(exported)} data file(s) from the SQLite store")
+    print(f"Indexed {editor.rebuild_search_index()} entries for search")
+    bundled = editor.build_asset_bundle(force=args.force)
+    print(f"Updated {len(bundled)} fingerprinted asset file(s) in {asset_bundle.OUT_DIR}/")
+    stats = build(force=args.force)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Rendered {stats['rendered']}, unchanged {stats['unchanged']}, removed {stats['removed']} "
+        f"page(s) in {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Reading and writing entries as markdown files with front matter, or as JSON lines.
+
+Front matter is the usual ``---`` block at the top of a markdown file. Only
+the part of YAML that content front matter actually uses is understood:
+``key: value`` pairs with plain, single- or double-quoted scalars, flow
+lists (``[a, b]``), block lists (``- item`` lines) and ``|``/``>`` block
+scalars. The writer emits JSON-style quoting for anything that is not a
+plain scalar, which every YAML reader accepts.
+
+Readers are generators yielding ``(location, record, error)`` one input at a
+time, so a large import never holds more than one source file in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Iterator
+
+FRONT_MATTER_KEY = re.compile(r"([A-Za-z_][\w-]*)\s*:(?:\s+(.*)|)$")
+PLAIN_SCALAR = re.compile(r"[\w./()+][\w ./()+,'-]*")
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def _scalar(value: str):
+    value = value.strip()
+    if value[:1] in {'"', "[", "{"}:
+        try:
+            return json.loads(value)
+        except ValueError:
+            if value[:1] != "[" or not value.endswith("]"):
+                raise ValueError(f"cannot parse value {value!r}") from None
+            return [_scalar(part) for part in value[1:-1].split(",") if part.strip()]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    value = value.split(" #", 1)[0].rstrip()
+    return "" if value in {"~", "null"} else value
+
+
+def parse_front_matter(text: str) -> tuple[dict, str]:
+    """Split a markdown document into (front matter, body)."""
+    text = text.lstrip("﻿")
+    lines = text.splitlines()
+    if not lines or lines[0].rstrip() != "---":
+        return {}, text.strip()
+    end = next((i for i in range(1, len(lines)) if lines[i].rstrip() in {"---", "..."}), None)
+    if end is None:
+        raise ValueError("front matter is not closed with ---")
+    meta: dict = {}
+    i = 1
+    while i < end:
+        line = lines[i]
+        i += 1
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        match = FRONT_MATTER_KEY.match(line)
+        if not match:
+            raise ValueError(f"line {i}: expected 'key: value'")
+        key, value = match[1], (match[2] or "").strip()
+        if value in {"|", "|-", "|+", ">", ">-", ">+"}:
+            block = []
+            while i < end and (not lines[i].strip() or lines[i][:1] in {" ", "\t"}):
+                block.append(lines[i])
+                i += 1
+            indent = min((len(b) - len(b.lstrip()) for b in block if b.strip()), default=0)
+            block = [b[indent:] for b in block]
+            meta[key] = (" " if value[0] == ">" else "\n").join(block).strip()
+        elif not value:
+            items = []
+            while i < end and lines[i].lstrip().startswith("- "):
+                items.append(_scalar(lines[i].lstrip()[2:]))
+                i += 1
+            meta[key] = items if items else ""
+        else:
+            meta[key] = _scalar(value)
+    return meta, "\n".join(lines[end + 1 :]).strip()
+
+
+def _format_value(value) -> str:
+    if isinstance(value, str) and PLAIN_SCALAR.fullmatch(value) and value == value.rstrip() and value not in {"null"}:
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def format_front_matter(meta: dict, body: str) -> str:
+    lines = ["---", *(f"{key}: {_format_value(value)}" for key, value in meta.items()), "---", "", body.strip(), ""]
+    return "\n".join(lines)
+
+
+def read_markdown(path: Path) -> Iterator[tuple[str, dict | None, str]]:
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.suffix.lower() in MARKDOWN_SUFFIXES)
+    for file in files:
+        try:
+            meta, body = parse_front_matter(file.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            yield str(file), None, str(exc)
+            continue
+        meta.setdefault("id", file.stem)
+        yield str(file), {**meta, "body": body}, ""
+
+
+def read_jsonl(path: Path | str) -> Iterator[tuple[str, dict | None, str]]:
+    handle = sys.stdin if str(path) == "-" else open(path, encoding="utf-8")
+    name = "<stdin>" if str(path) == "-" else str(path)
+    try:
+        for number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield f"{name}:{number}", None, f"invalid JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield f"{name}:{number}", None, "each line must be a JSON object"
+                continue
+            yield f"{name}:{number}", record, ""
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def guess_format(path: Path | str) -> str:
+    if str(path) == "-" or Path(path).suffix.lower() in JSONL_SUFFIXES:
+        return "jsonl"
+    return "markdown"
+
+
+def read_records(source: Path | str, fmt: str = "auto") -> Iterator[tuple[str, dict | None, str]]:
+    if fmt == "auto":
+        fmt = guess_format(source)
+    if fmt == "jsonl":
+        return read_jsonl(source)
+    path = Path(source)
+    if not path.exists():
+        raise ValueError(f"{source} does not exist")
+    return read_markdown(path)
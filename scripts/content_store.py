@@ -0,0 +1,394 @@
+"""In-memory cache for the editor's JSON data files with write-behind persistence.
+
+Each data file is parsed once and served from memory until its inode, mtime or
+size changes on disk. Mutations replace the cached document and are flushed by
+a single background writer that coalesces bursts of edits into one write per
+file, never waiting longer than ``max_delay`` seconds after the first edit.
+
+Every write goes to a temp file in the same directory, is fsynced and then
+renamed over the original, so a crash never leaves a truncated data file.
+Each file has its own lock for read-modify-write cycles; with
+``cross_process=True`` (``EDITOR_LOCK_FILES=1``) an advisory ``flock`` on
+``<file>.lock`` is held as well and mutations are written through
+immediately, so batch scripts can safely run alongside the editor.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only.
+    fcntl = None
+
+
+def stat_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# Returned as new data from a ``ContentStore.mutate`` callback to skip the write.
+UNCHANGED = object()
+
+
+def fsync_dir(path: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes, durable: bool = True) -> None:
+    """Replace ``path`` with ``data`` atomically; ``durable`` also fsyncs file and directory."""
+    with metrics.stage("disk_write"):
+        _atomic_write_bytes(path, data, durable)
+
+
+def _atomic_write_bytes(path: Path, data: bytes, durable: bool) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            if durable:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    if durable:
+        fsync_dir(path.parent)
+
+
+def atomic_write_text(path: Path, text: str, durable: bool = True) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"), durable)
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``<path>.lock`` (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class EntryCollection:
+    """Ordered entries with O(1) lookup, upsert-to-front, rename and delete by id.
+
+    Backed by an ``OrderedDict`` (a hash index into a doubly linked list), so
+    moving an entry to the front never copies or shifts the rest of the list.
+    Entries without an id, and later duplicates of an id, are kept in place
+    under private keys so round-tripping a file never drops data.
+    """
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self._items: OrderedDict[Any, dict] = OrderedDict()
+        self._extras: dict[str, list[tuple[str, int]]] = {}
+        self._serial = 0
+        for entry in entries:
+            self._append(entry)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._items.values())
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._items
+
+    def get(self, entry_id: str) -> dict | None:
+        return self._items.get(entry_id)
+
+    def is_front(self, entry_id: str) -> bool:
+        return next(iter(self._items), None) == entry_id
+
+    def to_list(self) -> list[dict]:
+        return list(self._items.values())
+
+    def upsert_front(self, item: dict, replace_ids: Iterable[str] = ()) -> None:
+        entry_id = str(item.get("id", ""))
+        for old_id in {entry_id, *replace_ids}:
+            if old_id:
+                self.delete(old_id)
+        key = entry_id or self._private_key("")
+        self._items[key] = item
+        self._items.move_to_end(key, last=False)
+
+    def replace(self, entry_id: str, item: dict) -> None:
+        """Swap the entry stored under ``entry_id`` without moving it."""
+        if entry_id not in self._items:
+            raise KeyError(entry_id)
+        self._items[entry_id] = item
+
+    def delete(self, entry_id: str) -> bool:
+        found = self._items.pop(entry_id, None) is not None
+        for key in self._extras.pop(entry_id, ()):
+            found = self._items.pop(key, None) is not None or found
+        return found
+
+    def _append(self, entry: dict) -> None:
+        entry_id = str(entry.get("id", "")) if isinstance(entry, dict) else ""
+        if entry_id and entry_id not in self._items:
+            self._items[entry_id] = entry
+            return
+        key = self._private_key(entry_id)
+        if entry_id:
+            self._extras.setdefault(entry_id, []).append(key)
+        self._items[key] = entry
+
+    def _private_key(self, entry_id: str) -> tuple[str, int]:
+        self._serial += 1
+        return (entry_id, self._serial)
+
+
+def dump_json(data: Any) -> str:
+    with metrics.stage("json_serialize"):
+        if hasattr(data, "to_json"):
+            # Documents with their own on-disk encoding (e.g. the search index).
+            return data.to_json()
+        if isinstance(data, EntryCollection):
+            data = data.to_list()
+        return json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+
+class _Document:
+    __slots__ = ("data", "loaded", "signature", "dirty_since", "deadline", "version", "lock", "write_lock")
+
+    def __init__(self):
+        self.data: Any = None
+        self.loaded = False
+        self.signature: tuple[int, int, int] | None = None
+        self.dirty_since: float | None = None
+        self.deadline = 0.0
+        self.version = 0
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+
+
+class _Encoded:
+    def __init__(self, text: str):
+        self.text = text
+
+    def to_json(self) -> str:
+        return self.text
+
+
+def _snapshot(data: Any) -> Any:
+    if hasattr(data, "to_json"):
+        return _Encoded(data.to_json())
+    return data.to_list() if isinstance(data, EntryCollection) else data
+
+
+class ContentStore:
+    def __init__(self, flush_delay: float = 0.25, max_delay: float = 2.0, cross_process: bool = False):
+        self.flush_delay = flush_delay
+        self.max_delay = max_delay
+        self.cross_process = cross_process
+        self._docs: dict[Path, _Document] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._writer: threading.Thread | None = None
+        atexit.register(self.flush)
+
+    def read(self, path: Path, loader: Callable[[Path], Any], fn: Callable[[Any], Any] | None = None) -> Any:
+        """Return ``fn(data)`` computed under the file's lock (or the live data if ``fn`` is None)."""
+        doc = self._doc(path)
+        with doc.lock:
+            self._refresh(path, doc, loader)
+            return fn(doc.data) if fn is not None else doc.data
+
+    def version(self, path: Path, loader: Callable[[Path], Any]) -> int:
+        doc = self._doc(path)
+        with doc.lock:
+            self._refresh(path, doc, loader)
+            return doc.version
+
+    def mutate(self, path: Path, loader: Callable[[Path], Any], fn: Callable[[Any], tuple[Any, Any]]) -> Any:
+        """Apply ``fn(data) -> (new_data, result)`` and schedule a flush of ``new_data``.
+
+        ``fn`` may mutate ``data`` in place and return it, or return ``UNCHANGED``
+        to leave the file untouched.
+        """
+        doc = self._doc(path)
+        if self.cross_process:
+            with doc.write_lock, doc.lock, file_lock(path):
+                self._refresh(path, doc, loader)
+                result, changed = self._apply(doc, fn)
+                if changed:
+                    self._commit(path, dump_json(doc.data), doc)
+                return result
+        with doc.lock:
+            self._refresh(path, doc, loader)
+            result, changed = self._apply(doc, fn)
+            if changed:
+                self._schedule(doc)
+            return result
+
+    def flush(self, path: Path | None = None) -> None:
+        with self._lock:
+            targets = [(path, self._docs.get(path))] if path is not None else list(self._docs.items())
+        for target, doc in targets:
+            if doc is not None:
+                self._flush_document(target, doc)
+
+    def remove(self, path: Path) -> None:
+        """Delete ``path`` on disk and drop any write still pending for it."""
+        doc = self._doc(path)
+        with doc.write_lock, doc.lock:
+            with self._lock:
+                doc.dirty_since = None
+            doc.loaded = False
+            doc.data = None
+            doc.version += 1
+            if self.cross_process:
+                with file_lock(path):
+                    path.unlink(missing_ok=True)
+            else:
+                path.unlink(missing_ok=True)
+
+    def invalidate(self, path: Path | None = None) -> None:
+        self.flush(path)
+        with self._lock:
+            if path is None:
+                self._docs.clear()
+            else:
+                self._docs.pop(path, None)
+
+    def _doc(self, path: Path) -> _Document:
+        with self._lock:
+            doc = self._docs.get(path)
+            if doc is None:
+                doc = self._docs[path] = _Document()
+            return doc
+
+    def _refresh(self, path: Path, doc: _Document, loader: Callable[[Path], Any]) -> None:
+        if doc.loaded and doc.dirty_since is not None:
+            return
+        signature = stat_signature(path)
+        if doc.loaded and signature is not None and signature == doc.signature:
+            return
+        doc.data = loader(path)
+        # The signature from before the load: if another process commits meanwhile,
+        # the next look sees a change and reloads instead of trusting stale data.
+        doc.signature = signature
+        if doc.loaded:
+            doc.version += 1
+        doc.loaded = True
+
+    def _apply(self, doc: _Document, fn: Callable[[Any], tuple[Any, Any]]) -> tuple[Any, bool]:
+        new_data, result = fn(doc.data)
+        if new_data is UNCHANGED:
+            return result, False
+        doc.data = new_data
+        doc.version += 1
+        return result, True
+
+    def _schedule(self, doc: _Document) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if doc.dirty_since is None:
+                doc.dirty_since = now
+            doc.deadline = min(now + self.flush_delay, doc.dirty_since + self.max_delay)
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name="content-store-writer", daemon=True)
+                self._writer.start()
+            self._wakeup.notify()
+
+    def _commit(self, path: Path, text: str, doc: _Document) -> None:
+        atomic_write_text(path, text)
+        with doc.lock:
+            doc.signature = stat_signature(path)
+
+    def _flush_document(self, path: Path, doc: _Document) -> None:
+        # write_lock keeps writes of one file in snapshot order; the entry lock is
+        # only held while taking the snapshot, so edits continue during the write.
+        with doc.write_lock:
+            with doc.lock:
+                if doc.dirty_since is None:
+                    return
+                snapshot = _snapshot(doc.data)
+                with self._lock:
+                    doc.dirty_since = None
+            try:
+                if self.cross_process:
+                    with file_lock(path):
+                        self._commit(path, dump_json(snapshot), doc)
+                else:
+                    self._commit(path, dump_json(snapshot), doc)
+            except OSError:
+                with doc.lock, self._lock:
+                    now = time.monotonic()
+                    doc.dirty_since = doc.dirty_since or now
+                    doc.deadline = now + self.max_delay
+                raise
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    pending = [
+                        (doc.deadline, str(path), path, doc)
+                        for path, doc in self._docs.items()
+                        if doc.dirty_since is not None
+                    ]
+                    if not pending:
+                        self._wakeup.wait()
+                        continue
+                    deadline, _, path, doc = min(pending, key=lambda row: row[:2])
+                    delay = deadline - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._wakeup.wait(delay)
+            try:
+                self._flush_document(path, doc)
+            except OSError as exc:
+                print(f"content store: could not write {path}: {exc}")
+
+
+STORE = ContentStore(
+    flush_delay=float(os.environ.get("EDITOR_FLUSH_DELAY", "0.25")),
+    max_delay=float(os.environ.get("EDITOR_FLUSH_MAX_DELAY", "2.0")),
+    cross_process=os.environ.get("EDITOR_LOCK_FILES", "") == "1",
+)
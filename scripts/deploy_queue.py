@@ -0,0 +1,132 @@
+"""Background deploy queue: one worker, coalesced requests, observable progress.
+
+``DeployQueue.submit`` returns immediately with a job. At most one job runs at
+a time and at most one waits behind it; requests that arrive while a job is
+still waiting (including during a short settle delay after the first click)
+join that job instead of queueing another commit. Progress lines are appended
+to the job's log, and ``wait`` lets any number of readers follow it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable
+
+FINISHED = ("succeeded", "failed")
+
+
+class DeployJob:
+    def __init__(self, message: str, stage_all: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.messages = [message]
+        self.stage_all = stage_all
+        self.state = "queued"
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.log: list[str] = []
+        self.result: dict | None = None
+        self.error = ""
+
+    @property
+    def message(self) -> str:
+        subject, *rest = self.messages
+        return "\n\n".join([subject, *rest]) if rest else subject
+
+    def to_dict(self, log_from: int = 0) -> dict:
+        return {
+            "id": self.id,
+            "state": self.state,
+            "message": self.message,
+            "requests": len(self.messages),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "log": self.log[log_from:],
+            "logLength": len(self.log),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class DeployQueue:
+    def __init__(self, run: Callable[[DeployJob, Callable[[str], None]], dict], settle: float = 1.0, keep: int = 20):
+        self.run = run
+        self.settle = settle
+        self.keep = keep
+        self._jobs: OrderedDict[str, DeployJob] = OrderedDict()
+        self._pending: DeployJob | None = None
+        self._changed = threading.Condition()
+        self._worker: threading.Thread | None = None
+
+    def submit(self, message: str, stage_all: bool = False) -> tuple[DeployJob, bool]:
+        """Queue a deploy; returns (job, whether it joined an already waiting job)."""
+        with self._changed:
+            if self._pending is not None:
+                if message not in self._pending.messages:
+                    self._pending.messages.append(message)
+                self._pending.stage_all |= stage_all
+                self._changed.notify_all()
+                return self._pending, True
+            job = self._pending = DeployJob(message, stage_all)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.keep:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.state not in FINISHED:
+                    break
+                self._jobs.popitem(last=False)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="deploy-queue", daemon=True)
+                self._worker.start()
+            self._changed.notify_all()
+            return job, False
+
+    def get(self, job_id: str | None = None) -> DeployJob | None:
+        with self._changed:
+            if job_id:
+                return self._jobs.get(job_id)
+            return next(reversed(self._jobs.values()), None)
+
+    def snapshot(self, job: DeployJob, log_from: int = 0) -> dict:
+        with self._changed:
+            return job.to_dict(log_from)
+
+    def wait(self, job: DeployJob, log_length: int, state: str, timeout: float) -> dict:
+        """Block until ``job`` has more log lines or a new state (or ``timeout``); return the news."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(job.log) > log_length or job.state != state, timeout)
+            return job.to_dict(log_length)
+
+    def _log(self, job: DeployJob, line: str) -> None:
+        with self._changed:
+            job.log.append(line)
+            self._changed.notify_all()
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._changed:
+                job = self._pending
+                if job is None:
+                    self._worker = None
+                    return
+            # Let back-to-back requests land in this job before it starts.
+            time.sleep(self.settle)
+            with self._changed:
+                self._pending = None
+                job.state = "running"
+                job.started = time.time()
+                self._changed.notify_all()
+            try:
+                result = self.run(job, lambda line: self._log(job, line))
+                state, error = "succeeded", ""
+            except Exception as exc:  # noqa: BLE001
+                result, state, error = None, "failed", str(exc)
+            with self._changed:
+                job.result = result
+                job.error = error
+                job.state = state
+                job.finished = time.time()
+                self._changed.notify_all()
@@ -0,0 +1,84 @@
+"""Paths the editor and its maintenance commands changed since the last deploy.
+
+Deploys stage exactly these paths instead of scanning the whole working tree
+with ``git add -A``. The set lives in ``.git/editor-dirty-paths`` (one
+repo-relative path per line) so it survives editor restarts and is shared
+with batch commands running in other processes; updates hold an advisory
+lock on that file.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from content_store import atomic_write_text, file_lock, stat_signature
+
+STATE_NAME = "editor-dirty-paths"
+
+
+class DirtyPaths:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Per repository root: paths known to be recorded already (and the state file's
+        # signature when we last saw it), so repeat saves of the same file cost one stat.
+        self._known: dict[Path, tuple[set[str], tuple | None]] = {}
+
+    @staticmethod
+    def state_file(root: Path) -> Path | None:
+        git_dir = root / ".git"
+        return git_dir / STATE_NAME if git_dir.is_dir() else None
+
+    @staticmethod
+    def _relative(root: Path, paths: Iterable[Path | str]) -> set[str]:
+        out = set()
+        resolved_root = root.resolve()
+        for path in paths:
+            path = Path(path)
+            absolute = (path if path.is_absolute() else root / path).resolve()
+            if absolute == resolved_root or resolved_root not in absolute.parents:
+                continue
+            out.add(absolute.relative_to(resolved_root).as_posix())
+        return out
+
+    @staticmethod
+    def _read(state: Path) -> set[str]:
+        try:
+            return {line for line in state.read_text(encoding="utf-8").splitlines() if line}
+        except FileNotFoundError:
+            return set()
+
+    @staticmethod
+    def _write(state: Path, paths: set[str]) -> None:
+        atomic_write_text(state, "".join(f"{p}\n" for p in sorted(paths)), durable=False)
+
+    def add(self, root: Path, paths: Iterable[Path | str]) -> None:
+        rel = self._relative(root, paths)
+        state = self.state_file(root)
+        with self._lock:
+            known, signature = self._known.get(root, (set(), None))
+            if state is None:
+                self._known[root] = (known | rel, None)
+                return
+            if rel <= known and signature == stat_signature(state):
+                return
+            with file_lock(state):
+                current = self._read(state)
+                if not rel <= current:
+                    self._write(state, current | rel)
+                self._known[root] = (current | rel, stat_signature(state))
+
+    def take(self, root: Path) -> list[str]:
+        """Remove and return every recorded path; ``restore`` them if the deploy fails."""
+        state = self.state_file(root)
+        with self._lock:
+            taken, _ = self._known.pop(root, (set(), None))
+            if state is not None:
+                with file_lock(state):
+                    taken = taken | self._read(state)
+                    self._write(state, set())
+            return sorted(taken)
+
+    def restore(self, root: Path, paths: Iterable[str]) -> None:
+        self.add(root, paths)
@@ -0,0 +1,251 @@
+"""Autosaved editor drafts, kept apart from the published data files.
+
+A draft is the editor form as a JSON document. The first save stores it
+whole; after that the editor sends only patches for the fields or content
+blocks that changed, and each accepted patch is appended to the draft's
+JSON-lines journal, so an autosave costs about as much as the edit itself.
+Once a journal has grown well past its last full snapshot it is rewritten
+as a single snapshot.
+
+Patches are a JSON Patch (RFC 6902) subset: ``add``, ``replace`` and
+``remove`` on JSON-pointer paths, plus ``splice`` for text edits inside a
+long string (``at`` and ``remove`` count UTF-16 code units, as the
+browser's string indices do). Every patch names the ``base`` version it was
+made against; a stale base raises ``DraftConflict``.
+
+Record keys: ``v`` version, ``t`` time, ``s`` full snapshot or ``p`` ops.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from content_store import atomic_write_text
+
+DRAFT_ID = re.compile(r"[0-9a-f]{12}")
+FIELDS = (
+    "kind",
+    "originalId",
+    "title",
+    "about",
+    "body",
+    "tags",
+    "category",
+    "link",
+    "imageAlt",
+    "imagePath",
+    "blocks",
+    "order",
+)
+# Rewrite the journal as one snapshot once patches outweigh the snapshot this many times.
+CHECKPOINT_RATIO = 4
+MAX_OPS = 500
+
+_lock = threading.Lock()
+# path -> (journal size, version, updated, document, bytes at the last snapshot)
+_heads: dict[Path, tuple[int, int, float, dict, int]] = {}
+
+
+class DraftConflict(ValueError):
+    def __init__(self, version: int):
+        super().__init__(f"Draft has changed (now at version {version})")
+        self.version = version
+
+
+def _encode(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _check_document(doc) -> dict:
+    if not isinstance(doc, dict):
+        raise ValueError("A draft must be a JSON object")
+    unknown = set(doc) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown draft field(s): {', '.join(sorted(unknown))}")
+    return doc
+
+
+def _pointer(path) -> list[str]:
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        raise ValueError(f"Invalid patch path: {path!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+
+
+def _child(container, key: str, path: str):
+    if isinstance(container, dict):
+        return key
+    if isinstance(container, list) and (key == "-" or key.isdigit()):
+        return len(container) if key == "-" else int(key)
+    raise ValueError(f"Patch path does not exist: {path}")
+
+
+def _splice(text: str, at: int, remove: int, insert: str) -> str:
+    if text.isascii():
+        return text[:at] + insert + text[at + remove :]
+    units = text.encode("utf-16-le", "surrogatepass")
+    units = units[: at * 2] + insert.encode("utf-16-le", "surrogatepass") + units[(at + remove) * 2 :]
+    return units.decode("utf-16-le", "surrogatepass")
+
+
+def apply_ops(doc: dict, ops: list) -> dict:
+    """Return ``doc`` with ``ops`` applied; ``doc`` itself is left untouched."""
+    if not isinstance(ops, list) or len(ops) > MAX_OPS:
+        raise ValueError(f"ops must be a list of at most {MAX_OPS} operations")
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if not isinstance(op, dict):
+            raise ValueError("Each patch operation must be an object")
+        kind, path = op.get("op"), op.get("path")
+        parts = _pointer(path)
+        if not parts:
+            if kind != "replace":
+                raise ValueError("Only replace may target the whole draft")
+            doc = _check_document(copy.deepcopy(op.get("value")))
+            continue
+        if parts[0] not in FIELDS:
+            raise ValueError(f"Unknown draft field: {parts[0]}")
+        parent = doc
+        for part in parts[:-1]:
+            key = _child(parent, part, path)
+            try:
+                parent = parent[key]
+            except (KeyError, IndexError):
+                raise ValueError(f"Patch path does not exist: {path}") from None
+        key = _child(parent, parts[-1], path)
+        exists = key in parent if isinstance(parent, dict) else key < len(parent)
+        if kind == "add":
+            if isinstance(parent, list):
+                if key > len(parent):
+                    raise ValueError(f"Patch path does not exist: {path}")
+                parent.insert(key, op.get("value"))
+            else:
+                parent[key] = op.get("value")
+        elif kind in {"replace", "remove", "splice"}:
+            if not exists:
+                raise ValueError(f"Patch path does not exist: {path}")
+            if kind == "replace":
+                parent[key] = op.get("value")
+            elif kind == "remove":
+                del parent[key]
+            else:
+                text, at, remove, insert = parent[key], op.get("at"), op.get("remove", 0), op.get("text", "")
+                if not isinstance(text, str) or not isinstance(insert, str):
+                    raise ValueError(f"splice needs a string at {path}")
+                if not isinstance(at, int) or not isinstance(remove, int) or at < 0 or remove < 0:
+                    raise ValueError("splice needs non-negative integer at/remove")
+                parent[key] = _splice(text, at, remove, insert)
+        else:
+            raise ValueError(f"Unsupported patch op: {kind!r}")
+    return doc
+
+
+def draft_file(directory: Path, draft_id: str) -> Path:
+    if not isinstance(draft_id, str) or not DRAFT_ID.fullmatch(draft_id):
+        raise ValueError("Invalid draft id")
+    return directory / f"{draft_id}.jsonl"
+
+
+def _head(path: Path) -> tuple[int, float, dict, int]:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        _heads.pop(path, None)
+        raise ValueError("Draft not found") from None
+    cached = _heads.get(path)
+    if cached is not None and cached[0] == size:
+        return cached[1:]
+    version, updated, doc, snapshot_size = 0, 0.0, {}, size
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "s" in record:
+                doc, snapshot_size = record["s"], len(line.encode("utf-8"))
+            else:
+                doc = apply_ops(doc, record["p"])
+            version, updated = record["v"], record["t"]
+    _heads[path] = (size, version, updated, doc, snapshot_size)
+    return version, updated, doc, snapshot_size
+
+
+def _write_snapshot(path: Path, version: int, updated: float, doc: dict) -> None:
+    line = _encode({"v": version, "t": updated, "s": doc})
+    atomic_write_text(path, line, durable=False)
+    _heads[path] = (path.stat().st_size, version, updated, doc, len(line.encode("utf-8")))
+
+
+def create(directory: Path, doc: dict, now: float | None = None) -> tuple[str, int]:
+    doc = _check_document(doc)
+    draft_id = uuid.uuid4().hex[:12]
+    directory.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        _write_snapshot(draft_file(directory, draft_id), 1, round(now or time.time(), 3), doc)
+    return draft_id, 1
+
+
+def load(directory: Path, draft_id: str) -> tuple[int, float, dict]:
+    path = draft_file(directory, draft_id)
+    with _lock:
+        version, updated, doc, _ = _head(path)
+    return version, updated, doc
+
+
+def patch(directory: Path, draft_id: str, base: int, ops: list, now: float | None = None) -> int:
+    """Apply ``ops`` made against version ``base``; return the new version."""
+    path = draft_file(directory, draft_id)
+    with _lock:
+        version, _updated, doc, snapshot_size = _head(path)
+        if base != version:
+            raise DraftConflict(version)
+        if not ops:
+            return version
+        doc = apply_ops(doc, ops)
+        version, updated = version + 1, round(now or time.time(), 3)
+        size = path.stat().st_size
+        line = _encode({"v": version, "t": updated, "p": ops})
+        if size + len(line) > snapshot_size * (CHECKPOINT_RATIO + 1):
+            _write_snapshot(path, version, updated, doc)
+        else:
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+            _heads[path] = (path.stat().st_size, version, updated, doc, snapshot_size)
+    return version
+
+
+def discard(directory: Path, draft_id: str) -> bool:
+    path = draft_file(directory, draft_id)
+    with _lock:
+        _heads.pop(path, None)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def list_drafts(directory: Path) -> list[dict]:
+    """Summaries of every draft, most recently updated first."""
+    out = []
+    for path in directory.glob("*.jsonl"):
+        try:
+            version, updated, doc = load(directory, path.stem)
+        except (ValueError, OSError):
+            continue
+        out.append(
+            {
+                "id": path.stem,
+                "version": version,
+                "updated": updated,
+                "kind": doc.get("kind", ""),
+                "originalId": doc.get("originalId", ""),
+                "title": doc.get("title", ""),
+            }
+        )
+    return sorted(out, key=lambda draft: draft["updated"], reverse=True)
@@ -3,6 +3,26 @@
 
 Run:
   python3 scripts/editor.py
+  python3 scripts/editor.py serve --server asyncio   # keep-alive, bounded worker pool
+  python3 scripts/editor.py serve --access-log - --profile .editor-profiles
+
+Metrics (Prometheus text format; EDITOR_METRICS=0 turns them off):
+  http://127.0.0.1:8787/metrics
+
+Maintenance:
+  python3 scripts/editor.py gc-images --dry-run
+  python3 scripts/editor.py images
+  python3 scripts/editor.py migrate --layout sharded
+  python3 scripts/editor.py search-index
+  python3 scripts/editor.py history-compact
+  python3 scripts/editor.py export-json      # with EDITOR_STORAGE=sqlite
+  python3 scripts/editor.py assets [--force] # minified, fingerprinted assets/build/
+
+Bulk content:
+  python3 scripts/editor.py import posts/ --kind article
+  python3 scripts/editor.py import backlog.jsonl --on-existing skip
+  python3 scripts/editor.py export export/
+  python3 scripts/editor.py export - --kind project > projects.jsonl
 
 Open:
   http://127.0.0.1:8787/editor
@@ -10,19 +30,96 @@ Open:
 
 from __future__ import annotations
 
+import argparse
 import base64
+import contextlib
+import email.utils
+import functools
+import hashlib
 import json
 import mimetypes
+import os
 import re
+import shutil
 import subprocess
+import sys
+import threading
+import time
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+import asset_bundle
+import async_server
+import bulk_io
+import change_feed
+from content_store import (
+    STORE,
+    UNCHANGED,
+    EntryCollection,
+    atomic_write_text,
+    dump_json,
+    fsync_dir,
+    fsync_file,
+    stat_signature,
+)
+from deploy_queue import FINISHED, DeployJob, DeployQueue
+from dirty_paths import DirtyPaths
+import drafts
+import http_cache
+import image_variants
+import markdown_render
+import metrics
+import revisions
+from image_store import adopt_temp, garbage_collect, reference_counts, store_bytes
+from search_index import SearchIndex
+from sqlite_store import SqliteStore
+from uploads import BodyTooLarge, iter_body_chunks, read_body, stream_to_temp
+
 ROOT = Path(__file__).resolve().parent.parent
 HOST = "127.0.0.1"
 PORT = 8787
+# asyncio server only: threads running handlers, and open connections before new ones get a 503.
+WORKERS = int(os.environ.get("EDITOR_WORKERS", "8"))
+MAX_CONNECTIONS = int(os.environ.get("EDITOR_MAX_CONNECTIONS", "256"))
+# /api/events streams each hold a handler thread (with --server asyncio, one of WORKERS) until they
+# end after EVENT_STREAM_SECONDS; EventSource reconnects and resumes from Last-Event-ID.
+MAX_EVENT_STREAMS = int(os.environ.get("EDITOR_MAX_EVENT_STREAMS", "4"))
+EVENT_STREAM_SECONDS = 300.0
+# Seconds after the last save before the fingerprinted bundle is rebuilt (deploys always rebuild first).
+ASSET_BUILD_DELAY = float(os.environ.get("EDITOR_ASSET_BUILD_DELAY", "2.0"))
+KINDS = ("article", "project", "quranic")
+BODY_FIELDS = ("content", "details")
+SAFE_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]*")
+MAX_UPLOAD_BYTES = int(float(os.environ.get("EDITOR_MAX_UPLOAD_MB", "25")) * 1024 * 1024)
+# JSON payloads may still carry legacy base64 data URLs, which inflate by a third.
+MAX_JSON_BYTES = MAX_UPLOAD_BYTES * 3 // 2
+DEPLOY_REMOTE = os.environ.get("EDITOR_DEPLOY_REMOTE", "origin")
+DEPLOY_BRANCH = os.environ.get("EDITOR_DEPLOY_BRANCH", "main")
+# Intermediate "Counting objects:  40% (4/10)" lines; the final ", done." line is kept.
+GIT_PROGRESS = re.compile(r"^[A-Za-z][\w ]*:\s+\d+% \(\d+/\d+\)(, [\d.]+ \w+/?\w* \| [\d.]+ \w+/s)?$")
+LIST_FIELDS = ("id", "title", "summary", "tags", "category", "link", "image", "imageAlt", "body")
+DEFAULT_LIST_FIELDS = LIST_FIELDS[:-1]
+DEFAULT_PAGE_SIZE = 50
+# Record keys that describe an import rather than the entry (entry_from_record maps or recomputes them).
+IMPORT_ONLY_KEYS = {"kind", "body", "about", "imagePath", "imageVariants", "originalId", *BODY_FIELDS}
+SUMMARY_CHARS = 200
+MAX_PAGE_SIZE = 500
+DIRTY = DirtyPaths()
+PREVIEWS = markdown_render.RenderCache()
+# "json" keeps entries in the assets/data files; "sqlite" in a local database that
+# export_static_json() turns back into those files (see sqlite_store.py).
+STORAGE = os.environ.get("EDITOR_STORAGE", "json").strip().lower()
+# Serialises re-indexing so an older read of an entry never overwrites a newer one.
+_search_lock = threading.Lock()
+_db: SqliteStore | None = None
+_db_lock = threading.Lock()
+
+
+def mark_dirty(*paths: Path | str) -> None:
+    """Record paths for the next deploy to stage (see dirty_paths.py)."""
+    DIRTY.add(ROOT, paths)
 
 
 def slugify(text: str) -> str:
@@ -44,49 +141,921 @@ def data_file_for_kind(kind: str) -> Path:
 
 def ensure_json_array(path: Path) -> list:
     if not path.exists():
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text("[]\n", encoding="utf-8")
+        # Not created here: this runs on reads, outside the store's file lock, and an
+        # empty file written now could replace another process's first commit. The
+        # first mutation writes the file under that lock.
         return []
-    data = json.loads(path.read_text(encoding="utf-8") or "[]")
+    with metrics.stage("json_parse"):
+        data = json.loads(path.read_text(encoding="utf-8") or "[]")
     if not isinstance(data, list):
         raise ValueError(f"{path} must contain JSON array")
     return data
 
 
+def index_file_for_kind(kind: str) -> Path:
+    path = data_file_for_kind(kind)
+    return path.with_name(f"{path.stem}.index.json")
+
+
+def shard_dir_for_kind(kind: str) -> Path:
+    path = data_file_for_kind(kind)
+    return path.with_name(path.stem)
+
+
+def shard_file(kind: str, entry_id: str) -> Path:
+    if not SAFE_ID.fullmatch(entry_id):
+        raise ValueError(f"Entry id {entry_id!r} cannot be used as a file name")
+    return shard_dir_for_kind(kind) / f"{entry_id}.json"
+
+
+def is_sharded(kind: str) -> bool:
+    """Sharded layout: a compact ``<name>.index.json`` plus one ``<name>/<id>.json`` per entry."""
+    return index_file_for_kind(kind).exists()
+
+
+def listing_file(kind: str) -> Path:
+    return index_file_for_kind(kind) if is_sharded(kind) else data_file_for_kind(kind)
+
+
+def load_json_object(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    with metrics.stage("json_parse"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain JSON object")
+    return data
+
+
+def index_record(item: dict) -> dict:
+    return {key: value for key, value in item.items() if key not in BODY_FIELDS}
+
+
+def image_dir() -> Path:
+    return ROOT / "assets" / "images" / "articles"
+
+
+def image_extension(image_name: str, mime: str) -> str:
+    return mimetypes.guess_extension(mime) or Path(image_name).suffix.lower() or ".png"
+
+
 def save_image(kind: str, image_name: str, image_data: str) -> str:
     header, encoded = image_data.split(",", 1)
     mime = header.split(";")[0].replace("data:", "").strip()
-    ext = mimetypes.guess_extension(mime) or ".png"
-    safe_name = slugify(Path(image_name).stem) or f"{kind}-thumbnail"
-    file_name = f"{safe_name}{ext}"
-
-    target_dir = ROOT / "assets" / "images" / "articles"
-    target_dir.mkdir(parents=True, exist_ok=True)
-    (target_dir / file_name).write_bytes(base64.b64decode(encoded))
+    with metrics.stage("image_decode"):
+        data = base64.b64decode(encoded)
+    file_name, _ = store_bytes(image_dir(), data, image_extension(image_name, mime))
+    mark_dirty(image_dir() / file_name)
     return f"assets/images/articles/{file_name}"
 
 
-def list_entries(kind: str) -> list[dict]:
-    entries = ensure_json_array(data_file_for_kind(kind))
+def save_uploaded_image(kind: str, image_name: str, mime: str, chunks) -> dict:
+    if not mime.startswith("image/"):
+        raise ValueError("Only image uploads are supported")
+    with metrics.stage("upload_receive"):
+        tmp_path, digest, size = stream_to_temp(chunks, image_dir())
+    file_name, written = adopt_temp(tmp_path, digest, image_extension(image_name, mime))
+    mark_dirty(image_dir() / file_name)
+    return {
+        "ok": True,
+        "path": f"assets/images/articles/{file_name}",
+        "sha256": digest,
+        "size": size,
+        "deduplicated": not written,
+    }
+
+
+def record_image_variants(kind: str, entry_id: str, image_path: str, variants: list[dict]) -> None:
+    def record(entry: dict) -> dict | None:
+        if entry.get("image") != image_path or entry.get("imageVariants", []) == variants:
+            return None
+        return {**entry, "imageVariants": variants}
+
+    mark_dirty(*(variant["src"] for variant in variants))
+    update_entry(kind, entry_id, record)
+
+
+def schedule_image_variants(kind: str, entry_id: str, image_path: str) -> None:
+    """Queue variants for an entry that is already saved; whether any are needed is decided in the pool."""
+    if image_variants.source_path(ROOT, image_path) is None or not image_variants.available():
+        return
+    image_variants.submit(
+        ROOT, image_path, lambda variants: record_image_variants(kind, entry_id, image_path, variants)
+    )
+
+
+def build_all_image_variants(force: bool) -> int:
+    if not image_variants.available():
+        raise SystemExit("Pillow is not installed; run: pip install Pillow")
+    processed = 0
+    for kind in KINDS:
+        images = {(str(e.get("id", "")), str(e.get("image", ""))) for e in load_entries(kind) if e.get("image")}
+        for entry_id, image_path in sorted(images):
+            if force:
+                for variant in image_variants.fresh_variants(ROOT, image_path):
+                    (ROOT / variant["src"]).unlink()
+            record_image_variants(kind, entry_id, image_path, image_variants.build_variants(ROOT, image_path))
+            processed += 1
+    STORE.flush()
+    return processed
+
+
+def draft_image_entries():
+    """Entry-shaped views of the autosaved drafts, so the images they use count as referenced."""
+    for summary in drafts.list_drafts(drafts_dir()):
+        try:
+            doc = drafts.load(drafts_dir(), summary["id"])[2]
+        except (ValueError, OSError):
+            continue
+        payload = draft_payload(doc)
+        inline = [f"![]({block['imagePath']})" for block in payload["additions"] if block.get("imagePath")]
+        yield {"image": payload["imagePath"], "content": "\n\n".join([str(payload["body"] or ""), *inline])}
+
+
+def image_reference_counts():
+    # Revisions in .editor-history can be reverted to and drafts published, so
+    # the images they use stay referenced until those are compacted or discarded.
+    entries = [entry for kind in KINDS for entry in load_entries(kind)]
+    for path in sorted(history_dir().glob("*/*.jsonl")):
+        entries.extend(revisions.all_entries(path))
+    entries.extend(draft_image_entries())
+    pages = [*ROOT.glob("*.html"), *(ROOT / "assets" / "js").glob("*.js"), *(ROOT / "assets" / "css").glob("*.css")]
+    return reference_counts(entries, pages)
+
+
+def collect_garbage_images(min_age_hours: float, dry_run: bool) -> list[Path]:
+    removed = garbage_collect(ROOT, image_dir(), image_reference_counts(), min_age_hours * 3600, dry_run)
+    if not dry_run:
+        mark_dirty(*removed)
+    return removed
+
+
+def db_path() -> Path:
+    return ROOT / ".editor-data" / "content.sqlite3"
+
+
+def storage_db() -> SqliteStore | None:
+    """The SQLite store when ``EDITOR_STORAGE=sqlite``, else None (the JSON files are the store).
+
+    A kind the database has not seen yet is loaded from its JSON files first.
+    """
+    global _db
+    if STORAGE != "sqlite":
+        return None
+    with _db_lock:
+        if _db is None or _db.path != db_path():
+            db = SqliteStore(db_path())
+            for kind in KINDS:
+                if not db.has_kind(kind):
+                    db.seed(kind, json_entries(kind))
+            _db = db
+        return _db
+
+
+def load_collection(path: Path) -> EntryCollection:
+    return EntryCollection(ensure_json_array(path))
+
+
+def load_index(kind: str) -> list[dict]:
+    """Entries in listing order; without bodies when the kind uses the sharded layout or SQLite."""
+    db = storage_db()
+    if db is not None:
+        return db.index(kind)
+    return STORE.read(listing_file(kind), load_collection, EntryCollection.to_list)
+
+
+def read_entry(kind: str, entry_id: str) -> dict | None:
+    db = storage_db()
+    if db is not None:
+        return db.get(kind, entry_id)
+    if not is_sharded(kind):
+        return STORE.read(data_file_for_kind(kind), load_collection, lambda entries: entries.get(entry_id))
+    try:
+        return STORE.read(shard_file(kind, entry_id), load_json_object)
+    except ValueError:
+        return None
+
+
+def load_entries(kind: str) -> list[dict]:
+    """Full entries, bodies included, in listing order."""
+    db = storage_db()
+    if db is not None:
+        return db.entries(kind)
+    return json_entries(kind)
+
+
+def json_entries(kind: str) -> list[dict]:
+    """``load_entries`` from the JSON files, whichever storage is selected."""
+    if not is_sharded(kind):
+        return STORE.read(data_file_for_kind(kind), load_collection, EntryCollection.to_list)
     out = []
-    for item in entries:
-        out.append(
-            {
-                "id": item.get("id", ""),
-                "title": item.get("title", ""),
-                "summary": item.get("summary", ""),
-                "body": item.get("content", item.get("details", item.get("summary", ""))),
-                "tags": ", ".join(item.get("tags", [])),
-                "category": item.get("category", ""),
-                "link": item.get("link", "#"),
-                "image": item.get("image", ""),
-                "imageAlt": item.get("imageAlt", ""),
-            }
-        )
+    for record in STORE.read(index_file_for_kind(kind), load_collection, EntryCollection.to_list):
+        entry_id = str(record.get("id", ""))
+        entry = STORE.read(shard_file(kind, entry_id), load_json_object) if SAFE_ID.fullmatch(entry_id) else None
+        out.append(entry if entry is not None else record)
     return out
 
 
-def compose_body_from_additions(kind: str, additions: list[dict]) -> str:
+def search_index_file() -> Path:
+    return ROOT / "assets" / "data" / "search-index.json"
+
+
+_asset_lock = threading.Lock()
+_asset_timer: threading.Timer | None = None
+_asset_timer_lock = threading.Lock()
+
+
+def build_asset_bundle(force: bool = False) -> list[Path]:
+    """Re-minify and re-fingerprint whatever changed since the last build; returns the paths touched."""
+    data_files = [listing_file(kind) for kind in KINDS] + [search_index_file()]
+    with _asset_lock:
+        _, touched = asset_bundle.build(ROOT, data_files, force=force)
+    if touched:
+        mark_dirty(*touched)
+    return touched
+
+
+def schedule_asset_bundle() -> None:
+    """Rebuild the bundle once saves go quiet, so the pages the editor serves show them."""
+    global _asset_timer
+    with _asset_timer_lock:
+        if _asset_timer is not None:
+            _asset_timer.cancel()
+        _asset_timer = threading.Timer(ASSET_BUILD_DELAY, _rebuild_asset_bundle)
+        _asset_timer.daemon = True
+        _asset_timer.start()
+
+
+def _rebuild_asset_bundle() -> None:
+    try:
+        # The pages must name the data files as written, not as the write-behind store holds them.
+        STORE.flush()
+        build_asset_bundle()
+    except Exception as exc:  # noqa: BLE001
+        print(f"Asset build failed: {exc}", file=sys.stderr)
+
+
+def build_search_index() -> SearchIndex:
+    return SearchIndex.build((kind, item) for kind in KINDS for item in load_entries(kind))
+
+
+def load_search_index(path: Path) -> SearchIndex:
+    try:
+        return SearchIndex.from_json(json.loads(path.read_text(encoding="utf-8")))
+    except (FileNotFoundError, ValueError, KeyError, IndexError, TypeError):
+        return build_search_index()
+
+
+def reindex_entry(kind: str, entry_id: str, old_ids: list[str] | tuple[str, ...] = ()) -> None:
+    """Bring one entry's postings in line with what is stored now (removing it if it is gone).
+
+    Must not be called while holding a data file's lock: loading the index may read every entry.
+    """
+    with _search_lock:
+        item = read_entry(kind, entry_id)
+
+        def apply(index: SearchIndex) -> tuple[SearchIndex, bool]:
+            # A freshly built index (no file yet) already reflects the entry but still needs writing.
+            changed = not search_index_file().exists()
+            for old in old_ids:
+                changed = index.remove(kind, old) or changed
+            if item is None:
+                changed = index.remove(kind, entry_id) or changed
+            else:
+                changed = index.update(kind, item) or changed
+            return (index if changed else UNCHANGED), changed
+
+        if STORE.mutate(search_index_file(), load_search_index, apply):
+            mark_dirty(search_index_file())
+
+
+def rebuild_search_index() -> int:
+    with _search_lock:
+        index = build_search_index()
+        STORE.mutate(search_index_file(), lambda _: SearchIndex(), lambda _: (index, None))
+    mark_dirty(search_index_file())
+    STORE.flush(search_index_file())
+    return len(index.docs)
+
+
+def write_entry(kind: str, item: dict, replace_ids: list[str]) -> bool:
+    """Upsert ``item`` at the front of its kind, in either layout; False if nothing changed."""
+    entry_id = item["id"]
+    replace_ids = [old for old in replace_ids if old and old != entry_id]
+    db = storage_db()
+    if db is not None:
+        changed = db.upsert_front(kind, item, replace_ids)
+        if changed:
+            publish_change(kind, entry_id, *replace_ids)
+        return changed
+    sharded = is_sharded(kind)
+    record = index_record(item) if sharded else item
+
+    def upsert(entries: EntryCollection) -> tuple[EntryCollection, bool]:
+        renamed = any(old in entries for old in replace_ids)
+        stored = read_entry(kind, entry_id) if sharded else entries.get(entry_id)
+        if not renamed and entries.is_front(entry_id) and entries.get(entry_id) == record and stored == item:
+            return UNCHANGED, False
+        if sharded:
+            STORE.mutate(shard_file(kind, entry_id), load_json_object, lambda _: (item, None))
+            mark_dirty(shard_file(kind, entry_id))
+            for old in replace_ids:
+                if old in entries and SAFE_ID.fullmatch(old):
+                    STORE.remove(shard_file(kind, old))
+                    mark_dirty(shard_file(kind, old))
+        entries.upsert_front(record, replace_ids=replace_ids)
+        mark_dirty(listing_file(kind))
+        return entries, True
+
+    changed = STORE.mutate(listing_file(kind), load_collection, upsert)
+    if changed:
+        reindex_entry(kind, entry_id, replace_ids)
+        publish_change(kind, entry_id, *replace_ids)
+    return changed
+
+
+def update_entry(kind: str, entry_id: str, fn) -> None:
+    """Replace an entry in place with ``fn(entry)``; ``fn`` returns None to leave it alone."""
+    db = storage_db()
+    if db is not None:
+        if db.update(kind, entry_id, fn):
+            publish_change(kind, entry_id)
+        return
+    sharded = is_sharded(kind)
+
+    def update(entries: EntryCollection) -> tuple[EntryCollection, bool]:
+        current = read_entry(kind, entry_id) if sharded else entries.get(entry_id)
+        if current is None or entry_id not in entries:
+            return UNCHANGED, False
+        new = fn(current)
+        if new is None or new == current:
+            return UNCHANGED, False
+        if sharded:
+            STORE.mutate(shard_file(kind, entry_id), load_json_object, lambda _: (new, None))
+            mark_dirty(shard_file(kind, entry_id))
+        entries.replace(entry_id, index_record(new) if sharded else new)
+        mark_dirty(listing_file(kind))
+        return entries, True
+
+    if STORE.mutate(listing_file(kind), load_collection, update):
+        reindex_entry(kind, entry_id)
+        publish_change(kind, entry_id)
+
+
+def remove_entry(kind: str, entry_id: str) -> bool:
+    db = storage_db()
+    if db is not None:
+        removed = db.delete(kind, entry_id)
+        if removed:
+            publish_change(kind, entry_id)
+        return removed
+    sharded = is_sharded(kind)
+
+    def remove(entries: EntryCollection) -> tuple[EntryCollection, bool]:
+        if not entries.delete(entry_id):
+            return UNCHANGED, False
+        if sharded and SAFE_ID.fullmatch(entry_id):
+            STORE.remove(shard_file(kind, entry_id))
+            mark_dirty(shard_file(kind, entry_id))
+        mark_dirty(listing_file(kind))
+        return entries, True
+
+    removed = STORE.mutate(listing_file(kind), load_collection, remove)
+    if removed:
+        reindex_entry(kind, entry_id)
+        publish_change(kind, entry_id)
+    return removed
+
+
+CHANGES = change_feed.ChangeFeed()
+_version_caches = {kind: change_feed.VersionCache() for kind in KINDS}
+
+
+def entry_change_version(kind: str, entry_id: str, entry: dict | None) -> str | None:
+    if entry is None:
+        return None
+    db = storage_db()
+    return str(db.entry_version(kind, entry_id)) if db is not None else change_feed.entry_version(entry)
+
+
+def publish_change(kind: str, *entry_ids: str) -> None:
+    """Tell /api/events subscribers where ``entry_ids`` stand now (saved, or gone)."""
+    for entry_id in entry_ids:
+        CHANGES.publish(kind, entry_id, entry_change_version(kind, entry_id, read_entry(kind, entry_id)))
+
+
+def change_signature(kind: str) -> object:
+    """Cheap to compute and moves whenever the kind's entries might have: the watcher's poll."""
+    db = storage_db()
+    if db is not None:
+        return ("sqlite", db.version(kind))
+    if not is_sharded(kind):
+        return ("json", STORE.version(data_file_for_kind(kind), load_collection))
+    # Shards are replaced by rename, which touches their directory.
+    return ("sharded", STORE.version(index_file_for_kind(kind), load_collection), stat_signature(shard_dir_for_kind(kind)))
+
+
+def change_versions(kind: str) -> dict[str, str]:
+    db = storage_db()
+    if db is not None:
+        return {entry_id: str(version) for entry_id, version in db.entry_versions(kind).items()}
+    return _version_caches[kind].versions(json_entries(kind))
+
+
+WATCHER = change_feed.Watcher(CHANGES, KINDS, change_signature, change_versions)
+
+
+def migrate_layout(kind: str, layout: str) -> int:
+    """Convert one kind between the monolithic and sharded layouts; returns entries moved."""
+    if layout not in {"sharded", "monolithic"}:
+        raise ValueError("layout must be sharded or monolithic")
+    if is_sharded(kind) == (layout == "sharded"):
+        return 0
+    # With SQLite storage the JSON files are an export; bring them up to date before converting them.
+    export_static_json()
+    STORE.flush()
+    entries = load_entries(kind)
+    data_file, index_file = data_file_for_kind(kind), index_file_for_kind(kind)
+    mark_dirty(data_file, index_file, shard_dir_for_kind(kind))
+    if layout == "monolithic":
+        atomic_write_text(data_file, dump_json(entries))
+        index_file.unlink()
+        for entry in entries:
+            entry_id = str(entry.get("id", ""))
+            if SAFE_ID.fullmatch(entry_id):
+                shard_file(kind, entry_id).unlink(missing_ok=True)
+        with contextlib.suppress(OSError):
+            shard_dir_for_kind(kind).rmdir()
+        STORE.invalidate()
+        return len(entries)
+
+    seen: set[str] = set()
+    records = []
+    for entry in entries:
+        entry_id = str(entry.get("id", ""))
+        if not SAFE_ID.fullmatch(entry_id):
+            entry_id = slugify(entry_id or str(entry.get("title", ""))) or f"{kind}-entry"
+        base, n = entry_id, 2
+        while entry_id in seen:
+            entry_id, n = f"{base}-{n}", n + 1
+        seen.add(entry_id)
+        entry = {**entry, "id": entry_id}
+        atomic_write_text(shard_file(kind, entry_id), dump_json(entry))
+        records.append(index_record(entry))
+    atomic_write_text(index_file, dump_json(records))
+    data_file.unlink(missing_ok=True)
+    STORE.invalidate()
+    return len(records)
+
+
+def export_static_json() -> list[Path]:
+    """Write the SQLite store's changes since the last export to the JSON files main.js reads.
+
+    Each kind keeps the layout its files have on disk: a sharded kind rewrites
+    its index plus only the shards that changed. A no-op with JSON storage.
+    """
+    db = storage_db()
+    if db is None:
+        return []
+    written: list[Path] = []
+    for kind in KINDS:
+        pending = db.pending_export(kind)
+        if pending is None:
+            continue
+        version, changed, deleted = pending
+        if is_sharded(kind):
+            for item in changed:
+                path = shard_file(kind, item["id"])
+                STORE.invalidate(path)
+                atomic_write_text(path, dump_json(item))
+                written.append(path)
+            for entry_id in deleted:
+                if SAFE_ID.fullmatch(entry_id):
+                    path = shard_file(kind, entry_id)
+                    STORE.invalidate(path)
+                    path.unlink(missing_ok=True)
+                    written.append(path)
+            path, data = index_file_for_kind(kind), db.index(kind)
+        else:
+            path, data = data_file_for_kind(kind), db.entries(kind)
+        STORE.invalidate(path)
+        atomic_write_text(path, dump_json(data))
+        written.append(path)
+        db.mark_exported(kind, version)
+    if written:
+        mark_dirty(*written)
+        rebuild_search_index()
+        written.append(search_index_file())
+    return written
+
+
+def entry_from_record(kind: str, record: dict) -> dict:
+    """Validate one imported record and build its entry.
+
+    Accepts the stored shape (``summary``, ``content``/``details``, tag lists)
+    as well as the editor's (``about``, ``body``, comma-separated tags); other
+    keys, such as a ``date`` from front matter, are kept as they are.
+    """
+
+    def text(*keys: str, default: str = "") -> str:
+        for key in keys:
+            value = record.get(key)
+            if value is None or value == "":
+                continue
+            if not isinstance(value, (str, int, float)):
+                raise ValueError(f"{key} must be a string")
+            return str(value).strip()
+        return default
+
+    title = text("title")
+    body = text(*BODY_FIELDS, "body")
+    if not title or not body:
+        raise ValueError("title and a body are required")
+    tags = record.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    if not isinstance(tags, list):
+        raise ValueError("tags must be a list or a comma-separated string")
+    item = make_item(
+        kind,
+        import_id(kind, title, text("id")),
+        title,
+        text("summary", "about") or derive_summary(body),
+        body,
+        [str(tag).strip() for tag in tags if str(tag).strip()],
+        text("link", default="#"),
+        text("image", "imagePath"),
+        text("imageAlt"),
+        text("category", default="Technical"),
+    )
+    extras = {key: value for key, value in record.items() if key not in item and key not in IMPORT_ONLY_KEYS}
+    return {**item, **extras}
+
+
+def import_id(kind: str, title: str, record_id: str = "") -> str:
+    """The id the editor gives ``title`` on save (see persist_entry), so a later save keeps it.
+
+    Titles with no ASCII letters (e.g. Arabic) slug to nothing; they keep a
+    valid id from the record, or get one derived from the title.
+    """
+    return slugify(title) or (record_id if SAFE_ID.fullmatch(record_id) else "") or (
+        f"{kind}-{hashlib.sha1(title.encode()).hexdigest()[:10]}"
+    )
+
+
+def derive_summary(body: str) -> str:
+    """First paragraph of ``body`` as plain text, cut to ``SUMMARY_CHARS``."""
+    for block in re.split(r"\n\s*\n", body):
+        text = re.sub(r"!\[[^\]]*\]\([^)]*\)|[#>*_`]", "", block)
+        text = " ".join(text.split())
+        if text:
+            return text if len(text) <= SUMMARY_CHARS else text[:SUMMARY_CHARS].rsplit(" ", 1)[0] + "…"
+    return ""
+
+
+def write_batch(kind: str, items: list[dict], dry_run: bool = False) -> tuple[int, int, int]:
+    """Add or update ``items`` with a single write of the kind's listing; returns (added, updated, unchanged).
+
+    New entries go to the front in input order; existing ones are updated where they stand.
+    """
+    db = storage_db()
+    if db is not None:
+        return db.save_many(kind, items, dry_run)
+    sharded = is_sharded(kind)
+
+    def apply(entries: EntryCollection) -> tuple[EntryCollection, tuple[int, int, int]]:
+        added, updated, unchanged = [], [], 0
+        for item in items:
+            if item["id"] not in entries:
+                added.append(item)
+            elif (read_entry(kind, item["id"]) if sharded else entries.get(item["id"])) == item:
+                unchanged += 1
+            else:
+                updated.append(item)
+        counts = (len(added), len(updated), unchanged)
+        if dry_run or not (added or updated):
+            return UNCHANGED, counts
+        for item in updated:
+            entries.replace(item["id"], index_record(item) if sharded else item)
+        for item in reversed(added):
+            entries.upsert_front(index_record(item) if sharded else item)
+        if sharded:
+            shards = [shard_file(kind, item["id"]) for item in (*added, *updated)]
+            for path, item in zip(shards, (*added, *updated)):
+                STORE.invalidate(path)
+                atomic_write_text(path, dump_json(item), durable=False)
+            # Made durable after the batch, before the listing names them: each shard, then their
+            # directory once, instead of the file and directory fsync per shard of a durable write.
+            for path in shards:
+                fsync_file(path)
+            if shards:
+                fsync_dir(shard_dir_for_kind(kind))
+            mark_dirty(*shards)
+        mark_dirty(listing_file(kind))
+        return entries, counts
+
+    counts = STORE.mutate(listing_file(kind), load_collection, apply)
+    STORE.flush(listing_file(kind))
+    return counts
+
+
+def reindex_entries(kind: str, items: list[dict]) -> None:
+    """``reindex_entry`` for a batch: one load and one write of the search index."""
+    with _search_lock:
+
+        def apply(index: SearchIndex) -> tuple[SearchIndex, bool]:
+            changed = not search_index_file().exists()
+            for item in items:
+                changed = index.update(kind, item) or changed
+            return (index if changed else UNCHANGED), changed
+
+        if STORE.mutate(search_index_file(), load_search_index, apply):
+            mark_dirty(search_index_file())
+    STORE.flush(search_index_file())
+
+
+def import_entries(
+    records,
+    default_kind: str = "article",
+    on_existing: str = "update",
+    dry_run: bool = False,
+    strict: bool = False,
+    progress=None,
+) -> dict:
+    """Validate a stream of ``(location, record, error)`` (see bulk_io.py), then write each kind once.
+
+    Ids come from titles, as the editor derives them, and a record matches an
+    existing entry with the same id or the same title slug. A title repeated
+    within the input gets " (2)", " (3)"... appended, which gives it a
+    ``-2``, ``-3``... id that a later editor save keeps; a match is updated
+    (under the existing entry's id), skipped or renamed the same way as
+    ``on_existing`` says. Added and updated entries get a history revision
+    (after a baseline of what an update replaces) and their image variants
+    queued, as an editor save does.
+    With ``strict``, nothing is written if any record is invalid.
+    """
+    if on_existing not in {"update", "skip", "rename"}:
+        raise ValueError("on_existing must be update, skip or rename")
+    stats = {"read": 0, "invalid": 0, "skipped": 0, "renamed": 0, "kinds": {}, "errors": []}
+    batches: dict[str, dict[str, dict]] = {}
+    # Per kind: every existing id, and every existing title slug, to the entry's id.
+    existing: dict[str, dict[str, str]] = {}
+    started = time.perf_counter()
+    for location, record, error in records:
+        stats["read"] += 1
+        if progress is not None:
+            progress(stats["read"], time.perf_counter() - started)
+        try:
+            if error:
+                raise ValueError(error)
+            kind = str(record.get("kind") or default_kind).strip().lower()
+            if kind not in KINDS:
+                raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+            item = entry_from_record(kind, record)
+        except ValueError as exc:
+            stats["invalid"] += 1
+            stats["errors"].append(f"{location}: {exc}")
+            continue
+        if kind not in existing:
+            taken: dict[str, str] = {}
+            for row in load_index(kind):
+                row_id = str(row.get("id", ""))
+                taken[row_id] = row_id
+                taken.setdefault(slugify(str(row.get("title", ""))) or row_id, row_id)
+            existing[kind] = taken
+        batch = batches.setdefault(kind, {})
+        taken = existing[kind]
+        match = taken.get(item["id"])
+        if match is not None and on_existing == "skip":
+            stats["skipped"] += 1
+            continue
+        if match is not None and on_existing == "update":
+            item["id"] = match
+        if item["id"] in batch or (match is not None and on_existing == "rename"):
+            # Renaming the id alone would not stick: the editor derives it from the title again.
+            base, n = item["title"], 2
+            while True:
+                title = f"{base} ({n})"
+                entry_id = import_id(kind, title)
+                if entry_id not in batch and entry_id not in taken:
+                    break
+                n += 1
+            item["title"], item["id"] = title, entry_id
+            stats["renamed"] += 1
+        batch[item["id"]] = item
+    stats["read_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    dry_run = dry_run or (strict and stats["invalid"] > 0)
+    stats["variants"] = 0
+    for kind, batch in batches.items():
+        items = list(batch.values())
+        changed: list[dict] = []
+        if not dry_run:
+            # History as persist_entry keeps it: what an update replaces as a baseline, then the import.
+            previous = {item["id"]: read_entry(kind, item["id"]) for item in items}
+            changed = [item for item in items if previous[item["id"]] != item]
+            for item in changed:
+                history = history_file(kind, item["id"])
+                if history is not None and not history.exists() and previous[item["id"]] is not None:
+                    revisions.record_revision(history, previous[item["id"]], note="baseline")
+        added, updated, unchanged = write_batch(kind, items, dry_run)
+        stats["kinds"][kind] = {"added": added, "updated": updated, "unchanged": unchanged}
+        if not dry_run and (added or updated) and storage_db() is None:
+            reindex_entries(kind, items)
+        for item in changed:
+            history = history_file(kind, item["id"])
+            if history is not None:
+                revisions.record_revision(history, item, note="import")
+            image_path = str(item.get("image", "") or "")
+            if image_variants.source_path(ROOT, image_path) is not None:
+                schedule_image_variants(kind, item["id"], image_path)
+                stats["variants"] += 1
+    stats["write_seconds"] = time.perf_counter() - started
+    stats["written"] = not dry_run
+    return stats
+
+
+def export_entries(out: str, kinds: list[str] | tuple[str, ...] = KINDS, fmt: str = "auto") -> int:
+    """Write entries as JSON lines (``out`` a file, or ``-`` for stdout) or as ``<out>/<kind>/<id>.md``."""
+    fmt = bulk_io.guess_format(out) if fmt == "auto" else fmt
+    count = 0
+    if fmt == "jsonl":
+        with contextlib.ExitStack() as stack:
+            handle = sys.stdout if out == "-" else stack.enter_context(open(out, "w", encoding="utf-8"))
+            for kind in kinds:
+                for entry in load_entries(kind):
+                    handle.write(json.dumps({"kind": kind, **entry}, ensure_ascii=False) + "\n")
+                    count += 1
+        return count
+    for kind in kinds:
+        for entry in load_entries(kind):
+            entry_id = str(entry.get("id", ""))
+            if not SAFE_ID.fullmatch(entry_id):
+                entry_id = slugify(entry_id or str(entry.get("title", ""))) or f"{kind}-{count + 1}"
+            field = next((f for f in BODY_FIELDS if f in entry), BODY_FIELDS[0])
+            meta = {"kind": kind, **{key: value for key, value in entry.items() if key not in BODY_FIELDS}}
+            text = bulk_io.format_front_matter(meta, str(entry.get(field, "") or ""))
+            atomic_write_text(Path(out) / kind / f"{entry_id}.md", text, durable=False)
+            count += 1
+    return count
+
+
+def editor_row(item: dict, with_body: bool = True) -> dict:
+    row = {
+        "id": item.get("id", ""),
+        "title": item.get("title", ""),
+        "summary": item.get("summary", ""),
+        "tags": ", ".join(item.get("tags", [])),
+        "category": item.get("category", ""),
+        "link": item.get("link", "#"),
+        "image": item.get("image", ""),
+        "imageAlt": item.get("imageAlt", ""),
+    }
+    if with_body:
+        row["body"] = item.get("content", item.get("details", item.get("summary", "")))
+    return row
+
+
+def parse_list_query(query: str) -> dict:
+    """Normalised ``/api/list`` parameters; raises ValueError on anything invalid."""
+    qs = parse_qs(query)
+
+    def first(name: str, default: str = "") -> str:
+        return (qs.get(name, [default])[0] or default).strip()
+
+    kind = first("kind", "article").lower()
+    data_file_for_kind(kind)
+    fields = [f.strip() for f in first("fields").split(",") if f.strip()] or list(DEFAULT_LIST_FIELDS)
+    unknown = sorted(set(fields) - set(LIST_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    if "id" not in fields:
+        fields.insert(0, "id")
+    try:
+        limit = int(first("limit", str(DEFAULT_PAGE_SIZE)))
+    except ValueError:
+        raise ValueError("limit must be an integer") from None
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    tags = sorted({t.strip().lower() for raw in qs.get("tag", []) for t in raw.split(",") if t.strip()})
+    return {
+        "kind": kind,
+        "fields": fields,
+        "limit": limit,
+        "cursor": first("cursor"),
+        "tags": tags,
+        "category": first("category").lower(),
+        "q": first("q"),
+    }
+
+
+def encode_cursor(offset: int, last_id: str) -> str:
+    raw = json.dumps([offset, last_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def cursor_start(records: list[dict], cursor: str) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset, last_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, last_id = int(offset), str(last_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    # Resume after the last entry the client saw, even if entries were saved or deleted meanwhile.
+    if 0 < offset <= len(records) and records[offset - 1].get("id") == last_id:
+        return offset
+    for position, record in enumerate(records):
+        if record.get("id") == last_id:
+            return position + 1
+    return max(0, min(offset, len(records)))
+
+
+def search_entries(kind: str, query: str) -> list[str]:
+    """Ids of ``kind`` entries matching ``query``, best match first."""
+    with metrics.stage("search"):
+        db = storage_db()
+        if db is not None:
+            return db.search(kind, query)
+        hits = STORE.read(search_index_file(), load_search_index, lambda index: index.search(query, kind))
+        return [entry_id for _, entry_id, _ in hits]
+
+
+def select_entries(
+    kind: str, tags: list[str] = (), category: str = "", q: str = "", cursor: str = "", limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[dict], int, str | None]:
+    """Listing records (no bodies) for one page: (page, total matches, next cursor)."""
+    records = load_index(kind)
+    if q:
+        by_id = {str(record.get("id", "")): record for record in records}
+        records = [by_id[entry_id] for entry_id in search_entries(kind, q) if entry_id in by_id]
+    if tags:
+        wanted = set(tags)
+        records = [r for r in records if wanted <= {str(t).lower() for t in r.get("tags") or []}]
+    if category:
+        records = [r for r in records if str(r.get("category", "")).lower() == category]
+    start = cursor_start(records, cursor)
+    page = records[start : start + limit]
+    end = start + len(page)
+    next_cursor = encode_cursor(end, str(page[-1].get("id", ""))) if page and end < len(records) else None
+    return page, len(records), next_cursor
+
+
+def list_entries(kind: str, fields: list[str] = DEFAULT_LIST_FIELDS, **query) -> dict:
+    """One page of editor rows, filtered and projected; bodies are only read when ``fields`` asks."""
+    page, total, next_cursor = select_entries(kind, **query)
+    items = []
+    for record in page:
+        row = editor_row(record, with_body=False)
+        item = {field: row[field] for field in fields if field != "body"}
+        if "body" in fields:
+            # Listing records carry bodies only in the monolithic layout.
+            full = record if any(f in record for f in BODY_FIELDS) else (read_entry(kind, row["id"]) or record)
+            item["body"] = editor_row(full)["body"]
+        items.append(item)
+    return {"items": items, "total": total, "nextCursor": next_cursor}
+
+
+def get_entry(kind: str, entry_id: str) -> dict:
+    if kind not in KINDS or not entry_id:
+        raise ValueError("kind and id are required")
+    item = read_entry(kind, entry_id)
+    if item is None:
+        raise ValueError("Entry not found")
+    return editor_row(item)
+
+
+def list_etag(params: dict) -> str:
+    db = storage_db()
+    if db is not None:
+        # One version per kind covers listing order, bodies and search alike.
+        return http_cache.version_etag("list", str(db.path), db.version(params["kind"]), params)
+    path = listing_file(params["kind"])
+    versions = [str(path), STORE.version(path, load_collection)]
+    if params["q"]:
+        versions.append(STORE.version(search_index_file(), load_search_index))
+    if "body" in params["fields"] and is_sharded(params["kind"]):
+        # Bodies live in the shards, so the page's shard versions are part of the response too.
+        query = {key: value for key, value in params.items() if key not in ("kind", "fields")}
+        for record in select_entries(params["kind"], **query)[0]:
+            entry_id = str(record.get("id", ""))
+            if SAFE_ID.fullmatch(entry_id):
+                versions.append(STORE.version(shard_file(params["kind"], entry_id), load_json_object))
+    return http_cache.version_etag("list", versions, params)
+
+
+def entry_etag(kind: str, entry_id: str) -> str:
+    db = storage_db()
+    if db is not None:
+        return http_cache.version_etag("get", str(db.path), kind, entry_id, db.entry_version(kind, entry_id))
+    path, loader = data_file_for_kind(kind), load_collection
+    if is_sharded(kind) and SAFE_ID.fullmatch(entry_id):
+        path, loader = shard_file(kind, entry_id), load_json_object
+    return http_cache.version_etag("get", str(path), entry_id, STORE.version(path, loader))
+
+
+def compose_body_from_additions(kind: str, additions: list[dict], save_images: bool = True) -> str:
     blocks: list[str] = []
     for raw in additions:
         if not isinstance(raw, dict):
@@ -102,16 +1071,49 @@ def compose_body_from_additions(kind: str, additions: list[dict]) -> str:
             image_data = str(raw.get("imageData", "")).strip()
             image_name = str(raw.get("imageName", "inline-image")).strip() or "inline-image"
             image_alt = str(raw.get("imageAlt", "")).strip()
-            if image_data:
+            if image_data and save_images:
                 image_path = save_image(kind, image_name, image_data)
             if image_path:
                 blocks.append(f"![{image_alt}]({image_path})")
     return "\n\n".join(blocks).strip()
 
 
+def make_item(
+    kind: str,
+    entry_id: str,
+    title: str,
+    summary: str,
+    body: str,
+    tags: list[str],
+    link: str = "#",
+    image: str = "",
+    image_alt: str = "",
+    category: str = "Technical",
+) -> dict:
+    """An entry in the shape the site reads, with any up-to-date image variants attached."""
+    item = {
+        "id": entry_id,
+        "title": title,
+        "summary": summary,
+        "tags": tags,
+        "link": link,
+        "image": image,
+        "imageAlt": image_alt,
+    }
+    variants = image_variants.fresh_variants(ROOT, image)
+    if variants:
+        item["imageVariants"] = variants
+    if kind == "article":
+        item["category"] = category
+        item["content"] = body
+    else:
+        item["details"] = body
+    return item
+
+
 def persist_entry(payload: dict) -> dict:
     kind = str(payload.get("kind", "article")).strip().lower()
-    if kind not in {"article", "project", "quranic"}:
+    if kind not in KINDS:
         raise ValueError("Invalid kind")
 
     title = str(payload.get("title", "")).strip()
@@ -137,92 +1139,299 @@ def persist_entry(payload: dict) -> dict:
     if image_data:
         image_path = save_image(kind, image_name, image_data)
 
-    item = {
-        "id": entry_id,
-        "title": title,
-        "summary": about,
-        "tags": tags,
-        "link": link,
-        "image": image_path,
-        "imageAlt": image_alt,
-    }
-    if kind == "article":
-        item["category"] = category
-        item["content"] = body
-    else:
-        item["details"] = body
+    item = make_item(kind, entry_id, title, about, body, tags, link, image_path, image_alt, category)
+
+    history = history_file(kind, entry_id)
+    if history is not None and original_id and original_id != entry_id:
+        old_history = history_file(kind, original_id)
+        if old_history is not None:
+            revisions.rename(old_history, history)
+    if history is not None and not history.exists():
+        # First save since history was kept: record what is being replaced as the baseline.
+        previous = read_entry(kind, original_id or entry_id)
+        if previous is not None:
+            revisions.record_revision(history, previous, note="baseline")
+    write_entry(kind, item, [original_id])
+    if history is not None:
+        revisions.record_revision(history, item)
+    schedule_image_variants(kind, entry_id, image_path)
+
+    file_path = listing_file(kind)
+    return {"ok": True, "kind": kind, "id": entry_id, "title": title, "file": str(file_path.relative_to(ROOT))}
 
-    file_path = data_file_for_kind(kind)
-    entries = ensure_json_array(file_path)
-    match_ids = {entry_id}
-    if original_id:
-        match_ids.add(original_id)
-    entries = [e for e in entries if str(e.get("id", "")) not in match_ids]
-    entries.insert(0, item)
-    file_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
-    return {"ok": True, "kind": kind, "id": entry_id, "title": title, "file": str(file_path.relative_to(ROOT))}
+def preview_markdown(payload: dict) -> dict:
+    """Render what the form would save, as the site's detail view would show it."""
+    kind = str(payload.get("kind", "article")).strip().lower()
+    if kind not in KINDS:
+        raise ValueError("Invalid kind")
+    body = str(payload.get("body", "")).strip()
+    additions = payload.get("additions", [])
+    if isinstance(additions, list) and additions:
+        body = compose_body_from_additions(kind, additions, save_images=False)
+    with metrics.stage("markdown_render"):
+        html, rendered = PREVIEWS.render(body)
+    return {"ok": True, "html": html, "rendered": rendered}
 
 
 def delete_entry(payload: dict) -> dict:
     kind = str(payload.get("kind", "")).strip().lower()
     entry_id = str(payload.get("id", "")).strip()
-    if kind not in {"article", "project", "quranic"} or not entry_id:
+    if kind not in KINDS or not entry_id:
         raise ValueError("kind and id are required")
 
-    file_path = data_file_for_kind(kind)
-    entries = ensure_json_array(file_path)
-    before = len(entries)
-    entries = [e for e in entries if str(e.get("id", "")) != entry_id]
-    if len(entries) == before:
+    history = history_file(kind, entry_id)
+    if history is not None and not history.exists():
+        previous = read_entry(kind, entry_id)
+        if previous is not None:
+            revisions.record_revision(history, previous, note="baseline")
+    if not remove_entry(kind, entry_id):
         raise ValueError("Entry not found")
-    file_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if history is not None:
+        revisions.record_deleted(history)
+    file_path = listing_file(kind)
     return {"ok": True, "kind": kind, "id": entry_id, "file": str(file_path.relative_to(ROOT))}
 
 
-def deploy_to_main(payload: dict) -> dict:
-    commit_message = str(payload.get("message", "")).strip() or "Update portfolio content from local editor"
+def history_dir() -> Path:
+    return ROOT / ".editor-history"
+
+
+def history_file(kind: str, entry_id: str) -> Path | None:
+    if kind not in KINDS or not SAFE_ID.fullmatch(entry_id):
+        return None
+    return history_dir() / kind / f"{entry_id}.jsonl"
 
-    def run_git(*args: str) -> subprocess.CompletedProcess:
+
+def entry_history(kind: str, entry_id: str, rev: str = "") -> dict:
+    history = history_file(kind, entry_id)
+    if history is None:
+        raise ValueError("kind and a valid id are required")
+    if not rev:
+        return {"ok": True, "kind": kind, "id": entry_id, "revisions": revisions.list_revisions(history)}
+    try:
+        entry = revisions.entry_at(history, int(rev))
+    except ValueError:
+        raise ValueError("rev must be an integer") from None
+    if entry is None:
+        raise ValueError("Revision not found")
+    return {"ok": True, "kind": kind, "id": entry_id, "rev": int(rev), "item": editor_row(entry)}
+
+
+def revert_entry(payload: dict) -> dict:
+    """Make revision ``rev`` the current version (restoring the entry if it was deleted)."""
+    kind = str(payload.get("kind", "")).strip().lower()
+    entry_id = str(payload.get("id", "")).strip()
+    history = history_file(kind, entry_id)
+    if history is None:
+        raise ValueError("kind and a valid id are required")
+    try:
+        rev = int(payload.get("rev"))
+    except (TypeError, ValueError):
+        raise ValueError("rev must be an integer") from None
+    entry = revisions.entry_at(history, rev)
+    if entry is None:
+        raise ValueError("Revision not found")
+    item = {**entry, "id": entry_id}
+    write_entry(kind, item, [])
+    new_rev = revisions.record_revision(history, item, note=f"revert to {rev}")
+    return {"ok": True, "kind": kind, "id": entry_id, "rev": new_rev, "title": item.get("title", "")}
+
+
+def drafts_dir() -> Path:
+    return ROOT / ".editor-drafts"
+
+
+def draft_payload(doc: dict) -> dict:
+    """Turn a draft document into the payload ``persist_entry`` takes."""
+    blocks = doc.get("blocks") or {}
+    order = doc.get("order") or list(blocks)
+    additions = [
+        {key: value for key, value in blocks[key].items() if key != "imageData"}
+        for key in order
+        if isinstance(blocks.get(key), dict)
+    ]
+    fields = ("kind", "originalId", "title", "about", "body", "tags", "category", "link", "imageAlt", "imagePath")
+    return {**{field: doc.get(field, "") for field in fields}, "additions": additions}
+
+
+def find_drafts(query: str) -> dict:
+    qs = parse_qs(query)
+    draft_id = (qs.get("id", [""])[0] or "").strip()
+    if draft_id:
+        version, updated, doc = drafts.load(drafts_dir(), draft_id)
+        return {"ok": True, "id": draft_id, "version": version, "updated": updated, "draft": doc}
+    found = drafts.list_drafts(drafts_dir())
+    if "kind" in qs:
+        found = [d for d in found if d["kind"] == qs["kind"][0].strip().lower()]
+    if "originalId" in qs:
+        found = [d for d in found if d["originalId"] == qs["originalId"][0].strip()]
+    return {"ok": True, "drafts": found}
+
+
+def save_draft(payload: dict) -> dict:
+    """Create, patch, publish or discard a draft (see drafts.py for the patch format)."""
+    directory = drafts_dir()
+    draft_id = str(payload.get("id", "")).strip()
+    if not draft_id:
+        draft_id, version = drafts.create(directory, payload.get("draft"))
+        return {"ok": True, "id": draft_id, "version": version}
+    if payload.get("discard"):
+        return {"ok": True, "id": draft_id, "discarded": drafts.discard(directory, draft_id)}
+    base = payload.get("base")
+    if "ops" in payload:
+        if not isinstance(base, int):
+            raise ValueError("base must be the draft version the ops were made against")
+        version = drafts.patch(directory, draft_id, base, payload["ops"])
+    else:
+        version = drafts.load(directory, draft_id)[0]
+        if base is not None and base != version:
+            raise drafts.DraftConflict(version)
+    if not payload.get("publish"):
+        return {"ok": True, "id": draft_id, "version": version}
+    result = persist_entry(draft_payload(drafts.load(directory, draft_id)[2]))
+    drafts.discard(directory, draft_id)
+    return {**result, "draft": draft_id, "published": True}
+
+
+def compact_history() -> tuple[int, int, int]:
+    """Apply the retention policy to every log; returns (logs, bytes before, bytes after)."""
+    logs, before, after = 0, 0, 0
+    for path in sorted(history_dir().glob("*/*.jsonl")):
+        b, a = revisions.compact(path)
+        logs, before, after = logs + 1, before + b, after + a
+    return logs, before, after
+
+
+def run_git_streamed(args: list[str], log) -> tuple[int, str]:
+    """Run git, passing each output line (progress included) to ``log``; return (exit code, output)."""
+    with metrics.stage("git"):
+        return _run_git_streamed(args, log)
+
+
+def _run_git_streamed(args: list[str], log) -> tuple[int, str]:
+    proc = subprocess.Popen(
+        ["git", *args],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    lines = []
+    for line in proc.stdout:
+        line = line.rstrip()
+        if not line or GIT_PROGRESS.match(line):
+            continue
+        lines.append(line)
+        log(line)
+    return proc.wait(), "\n".join(lines)
+
+
+def run_git(*args: str, stdin: str | None = None) -> subprocess.CompletedProcess:
+    # Literal pathspecs: file names are never read as globs or pathspec magic.
+    with metrics.stage("git"):
         return subprocess.run(
-            ["git", *args],
+            ["git", "--literal-pathspecs", *args],
             cwd=ROOT,
+            input=stdin,
             text=True,
             capture_output=True,
             check=False,
         )
 
-    check_repo = run_git("rev-parse", "--is-inside-work-tree")
-    if check_repo.returncode != 0:
-        raise ValueError("Current directory is not a git repository")
 
-    add = run_git("add", "-A")
-    if add.returncode != 0:
-        raise ValueError(add.stderr.strip() or "git add failed")
-
-    diff = run_git("diff", "--cached", "--quiet")
-    if diff.returncode == 0:
-        return {
-            "ok": True,
-            "message": "No staged changes to deploy.",
-            "details": "Working tree has no new changes.",
-        }
-
-    commit = run_git("commit", "-m", commit_message)
-    if commit.returncode != 0:
-        raise ValueError(commit.stderr.strip() or commit.stdout.strip() or "git commit failed")
-
-    push = run_git("push", "origin", "main")
-    if push.returncode != 0:
-        raise ValueError(push.stderr.strip() or push.stdout.strip() or "git push failed")
+def stage_paths(paths: list[str], log) -> None:
+    """Stage additions, edits and deletions of ``paths`` in one git call (two if some are gone)."""
+    present = [p for p in paths if (ROOT / p).exists()]
+    gone = [p for p in paths if p not in present]
+    if present:
+        log(f"$ git add -A ({len(present)} path(s))")
+        add = run_git("add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul", stdin="\0".join(present))
+        if add.returncode != 0:
+            raise ValueError(add.stderr.strip() or "git add failed")
+    if gone:
+        log(f"$ git rm --cached ({len(gone)} path(s))")
+        rm = run_git(
+            "rm", "-r", "-q", "--cached", "--ignore-unmatch", "--pathspec-from-file=-", "--pathspec-file-nul",
+            stdin="\0".join(gone),
+        )
+        if rm.returncode != 0:
+            raise ValueError(rm.stderr.strip() or "git rm failed")
+
+
+def run_deploy(job: DeployJob, log) -> dict:
+    if storage_db() is not None:
+        log("Exporting JSON from the SQLite store")
+        export_static_json()
+    log("Flushing pending saves")
+    STORE.flush()
+    # Imported here: build_site imports this module.
+    import build_site
+
+    log("Pre-rendering pages")
+    stats = build_site.build()
+    log(f"Rendered {stats['rendered']}, unchanged {stats['unchanged']}, removed {stats['removed']} page(s)")
+    log("Building fingerprinted assets")
+    if any(path.suffix == ".html" for path in build_asset_bundle()):
+        # The pages now load a new build of the assets; render again from them (incremental).
+        build_site.build()
+    nothing = {"ok": True, "message": "No staged changes to deploy.", "details": "Working tree has no new changes."}
+    paths = None if job.stage_all else DIRTY.take(ROOT)
+    try:
+        if paths is None:
+            log("$ git add -A")
+            add = run_git("add", "-A")
+            if add.returncode != 0:
+                raise ValueError(add.stderr.strip() or "git add failed")
+        elif paths:
+            stage_paths(paths, log)
+        else:
+            log("Nothing changed since the last deploy")
+            return nothing
+
+        log("$ git commit")
+        code, commit_output = run_git_streamed(["commit", "-m", job.message], log)
+        if code != 0:
+            # Only ask why when the commit failed; the common path stays at add + commit + push.
+            if run_git("diff", "--cached", "--quiet").returncode == 0:
+                log("Nothing to commit")
+                return nothing
+            raise ValueError(commit_output or "git commit failed")
+    except Exception:
+        if paths:
+            DIRTY.restore(ROOT, paths)
+        raise
+
+    log(f"$ git push {DEPLOY_REMOTE} {DEPLOY_BRANCH}")
+    code, push_output = run_git_streamed(["push", "--progress", DEPLOY_REMOTE, DEPLOY_BRANCH], log)
+    if code != 0:
+        raise ValueError(push_output or "git push failed")
 
     return {
         "ok": True,
-        "message": "Deployed successfully to origin/main",
-        "details": (commit.stdout.strip() + "\n" + push.stdout.strip()).strip(),
+        "message": f"Deployed successfully to {DEPLOY_REMOTE}/{DEPLOY_BRANCH}",
+        "details": (commit_output + "\n" + push_output).strip(),
     }
 
 
+DEPLOYS = DeployQueue(run_deploy, settle=float(os.environ.get("EDITOR_DEPLOY_SETTLE", "1.0")))
+
+
+def deploy_to_main(payload: dict) -> dict:
+    """Queue a deploy and return at once; progress is at ``/api/deploy/status?id=<job>``."""
+    commit_message = str(payload.get("message", "")).strip() or "Update portfolio content from local editor"
+    # "all": stage the whole working tree (e.g. files edited by hand), not just what the editor wrote.
+    job, coalesced = DEPLOYS.submit(commit_message, stage_all=bool(payload.get("all")))
+    return {"ok": True, "jobId": job.id, "coalesced": coalesced, "job": DEPLOYS.snapshot(job)}
+
+
+@functools.lru_cache(maxsize=1)
+def editor_page_response() -> tuple[bytes, str]:
+    html = editor_page().encode("utf-8")
+    return html, http_cache.content_etag(html)
+
+
 def editor_page() -> str:
     return r"""<!doctype html>
 <html lang="en">
@@ -264,7 +1473,14 @@ def editor_page() -> str:
     .thumb-preview { margin-top:10px; width:100%; max-height:180px; object-fit:cover; border-radius:8px; display:none; }
     .status { margin-top:12px; font:500 0.88rem Inter, system-ui, sans-serif; }
     .ok { color:#1a8917; } .err { color:#c62828; }
-    .items { display:grid; gap:10px; max-height:72vh; overflow:auto; }
+    .draft-status { color:var(--muted); font:500 0.78rem Inter, system-ui, sans-serif; }
+    .preview { display:none; margin-top:22px; padding-top:14px; border-top:1px solid var(--line); font:400 1.08rem/1.8 Charter, "Times New Roman", serif; }
+    .preview.open { display:block; }
+    .preview img { max-width:100%; border-radius:8px; }
+    .preview pre { overflow-x:auto; background:#f6f6f6; border-radius:8px; padding:10px 12px; }
+    .preview blockquote { margin:0.8rem 0; padding:0.1rem 0.9rem; border-left:3px solid var(--line); color:#4f4f4f; }
+    .items { display:grid; gap:10px; max-height:72vh; overflow:auto; margin-top:10px; }
+    .items-more { margin-top:10px; width:100%; display:none; }
     .item { border:1px solid var(--line); border-radius:8px; padding:10px; }
     .item b { display:block; font:600 0.9rem Inter, system-ui, sans-serif; margin-bottom:4px; }
     .item p { margin:0; color:var(--muted); font:400 0.82rem/1.4 Inter, system-ui, sans-serif; }
@@ -284,7 +1500,9 @@ def editor_page() -> str:
           <option value="project">Project</option>
           <option value="quranic">Quranic Note</option>
         </select>
+        <span id="draftStatus" class="draft-status" aria-live="polite"></span>
         <button id="newBtn" class="action-btn" type="button">New</button>
+        <button id="previewBtn" class="action-btn" type="button" aria-pressed="false">Preview</button>
         <button id="saveBtn" class="save-btn" type="button">Save</button>
         <button id="deployBtn" class="deploy-btn" type="button">Deploy</button>
       </div>
@@ -332,11 +1550,14 @@ def editor_page() -> str:
       <p style="margin-top:8px;color:#6b6b6b;font:400 0.78rem/1.45 Inter,system-ui,sans-serif;">
         Add multiple paragraphs and images in order. Images render in detail view using markdown syntax.
       </p>
+      <div id="preview" class="preview" aria-live="polite"></div>
     </section>
 
     <aside class="card">
       <h3>Saved items</h3>
+      <input id="itemSearch" type="text" placeholder="Search saved items" aria-label="search saved items" />
       <div id="items" class="items"></div>
+      <button id="moreItems" class="mini-btn items-more" type="button">Load more</button>
     </aside>
   </main>
 
@@ -350,6 +1571,20 @@ def editor_page() -> str:
       statusNode.textContent = msg;
     }
 
+    async function uploadImage(file) {
+      setStatus(`Uploading ${file.name}...`);
+      const kind = byId("kind").value;
+      const response = await fetch(`/api/upload?kind=${encodeURIComponent(kind)}&name=${encodeURIComponent(file.name)}`, {
+        method: "POST",
+        headers: { "Content-Type": file.type || "application/octet-stream" },
+        body: file,
+      });
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || "Upload failed");
+      setStatus(`Uploaded ${file.name}`, "ok");
+      return data.path;
+    }
+
     function createAddition(type, data = {}) {
       const addition = {
         id: state.nextAdditionId++,
@@ -399,6 +1634,7 @@ def editor_page() -> str:
         removeBtn.addEventListener("click", () => {
           state.additions = state.additions.filter((x) => x.id !== block.id);
           renderAdditions();
+          scheduleDraft();
         });
         head.appendChild(title);
         head.appendChild(removeBtn);
@@ -453,16 +1689,15 @@ def editor_page() -> str:
             block.imageData = "";
             block.imageName = "";
             if (!file) return;
-            block.imageName = file.name;
-            const dataUrl = await new Promise((resolve, reject) => {
-              const reader = new FileReader();
-              reader.onload = () => resolve(String(reader.result || ""));
-              reader.onerror = reject;
-              reader.readAsDataURL(file);
-            });
-            block.imageData = dataUrl;
-            preview.src = dataUrl;
-            preview.style.display = "block";
+            try {
+              block.imagePath = await uploadImage(file);
+              pathInput.value = block.imagePath;
+              scheduleDraft();
+              preview.src = URL.createObjectURL(file);
+              preview.style.display = "block";
+            } catch (err) {
+              setStatus(err.message || String(err), "err");
+            }
           });
 
           card.appendChild(altLabel);
@@ -476,6 +1711,35 @@ def editor_page() -> str:
 
         container.appendChild(card);
       });
+      schedulePreview();
+    }
+
+    // Preview renders the form server-side with the site's markdown renderer; unchanged
+    // paragraphs come from its cache, so only the edited ones are re-rendered.
+    const PREVIEW_DEBOUNCE_MS = 300;
+    const previewState = { open: false, timer: 0, request: 0 };
+
+    async function refreshPreview() {
+      const request = ++previewState.request;
+      // Unsaved inline images would only bloat the request; the preview skips them.
+      const additions = collectAdditionsPayload().map(({ imageData, ...block }) => block);
+      const response = await fetch("/api/preview", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ kind: byId("kind").value, body: byId("body").value, additions }),
+      });
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || "Preview failed");
+      if (request !== previewState.request || !previewState.open) return;
+      byId("preview").innerHTML = data.html || "<p style='color:#6b6b6b'>Nothing to preview yet.</p>";
+    }
+
+    function schedulePreview() {
+      if (!previewState.open) return;
+      clearTimeout(previewState.timer);
+      previewState.timer = setTimeout(() => {
+        refreshPreview().catch((err) => setStatus(err.message || String(err), "err"));
+      }, PREVIEW_DEBOUNCE_MS);
     }
 
     function collectAdditionsPayload() {
@@ -499,6 +1763,7 @@ def editor_page() -> str:
     }
 
     function clearForm() {
+      resetDraft();
       state.originalId = "";
       state.imageData = "";
       state.imageName = "";
@@ -520,6 +1785,7 @@ def editor_page() -> str:
     }
 
     function fillForm(item) {
+      resetDraft();
       state.originalId = item.id || "";
       state.imageData = "";
       state.imageName = "";
@@ -544,38 +1810,323 @@ def editor_page() -> str:
       setStatus(`Editing: ${item.title}`);
     }
 
-    async function loadList() {
+    // Autosave: after a pause in typing, send only what changed since the last
+    // accepted draft (see scripts/drafts.py). Edits inside long strings go as splices.
+    const DRAFT_DEBOUNCE_MS = 800;
+    const DRAFT_SPLICE_MIN = 200;
+    const DRAFT_FIELDS = ["kind", "originalId", "title", "about", "body", "tags", "category", "link", "imageAlt", "imagePath"];
+    const BLOCK_FIELDS = ["type", "text", "imagePath", "imageAlt"];
+    let draft = newDraft();
+
+    function newDraft() {
+      return { id: "", version: 0, sent: null, timer: 0, queue: Promise.resolve() };
+    }
+
+    function draftSnapshot() {
+      const doc = {
+        kind: byId("kind").value,
+        originalId: state.originalId,
+        title: byId("title").value,
+        about: byId("about").value,
+        body: byId("body").value,
+        tags: byId("tags").value,
+        category: byId("category").value,
+        link: byId("link").value,
+        imageAlt: byId("imageAlt").value,
+        imagePath: byId("imagePath").value,
+        blocks: {},
+        order: state.additions.map((block) => String(block.id)),
+      };
+      state.additions.forEach((block) => {
+        doc.blocks[block.id] = Object.fromEntries(BLOCK_FIELDS.map((key) => [key, block[key] || ""]));
+      });
+      return doc;
+    }
+
+    function pointer(...parts) {
+      return parts.map((part) => `/${String(part).replace(/~/g, "~0").replace(/\//g, "~1")}`).join("");
+    }
+
+    function textOp(path, before, after) {
+      if (after.length < DRAFT_SPLICE_MIN || typeof before !== "string") return { op: "replace", path, value: after };
+      const limit = Math.min(before.length, after.length);
+      let start = 0;
+      while (start < limit && before.charCodeAt(start) === after.charCodeAt(start)) start++;
+      let end = 0;
+      while (end < limit - start && before.charCodeAt(before.length - 1 - end) === after.charCodeAt(after.length - 1 - end)) end++;
+      return { op: "splice", path, at: start, remove: before.length - start - end, text: after.slice(start, after.length - end) };
+    }
+
+    function draftOps(before, after) {
+      const ops = [];
+      DRAFT_FIELDS.forEach((key) => {
+        if (before[key] !== after[key]) ops.push(textOp(pointer(key), before[key], after[key]));
+      });
+      Object.keys(before.blocks).forEach((id) => {
+        if (!(id in after.blocks)) ops.push({ op: "remove", path: pointer("blocks", id) });
+      });
+      Object.entries(after.blocks).forEach(([id, block]) => {
+        const old = before.blocks[id];
+        if (!old) {
+          ops.push({ op: "add", path: pointer("blocks", id), value: block });
+          return;
+        }
+        BLOCK_FIELDS.forEach((key) => {
+          if (old[key] !== block[key]) ops.push(textOp(pointer("blocks", id, key), old[key], block[key]));
+        });
+      });
+      if (before.order.join(",") !== after.order.join(",")) ops.push({ op: "replace", path: "/order", value: after.order });
+      return ops;
+    }
+
+    async function postDraft(body) {
+      const response = await fetch("/api/draft", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(body),
+      });
+      return { response, data: await response.json() };
+    }
+
+    async function sendDraft(target, doc) {
+      if (!target.id) {
+        const { response, data } = await postDraft({ draft: doc });
+        if (!response.ok) throw new Error(data.error || "Draft save failed");
+        Object.assign(target, { id: data.id, version: data.version, sent: doc });
+      } else {
+        const ops = draftOps(target.sent, doc);
+        if (!ops.length) return;
+        let { response, data } = await postDraft({ id: target.id, base: target.version, ops });
+        if (response.status === 409) {
+          // The draft moved on elsewhere (another tab); this form wins and is sent whole.
+          ({ response, data } = await postDraft({ id: target.id, base: data.version, ops: [{ op: "replace", path: "", value: doc }] }));
+        }
+        if (!response.ok) throw new Error(data.error || "Draft save failed");
+        Object.assign(target, { version: data.version, sent: doc });
+      }
+      if (target === draft) byId("draftStatus").textContent = `Draft saved ${new Date().toLocaleTimeString()}`;
+    }
+
+    function flushDraft(target = draft) {
+      // Snapshot the form now; send once earlier saves of the same draft have finished.
+      clearTimeout(target.timer);
+      target.timer = 0;
+      const doc = draftSnapshot();
+      target.queue = target.queue.then(() => sendDraft(target, doc));
+      return target.queue;
+    }
+
+    function scheduleDraft() {
+      clearTimeout(draft.timer);
+      byId("draftStatus").textContent = "Unsaved changes";
+      draft.timer = setTimeout(() => {
+        flushDraft().catch((err) => {
+          byId("draftStatus").textContent = `Draft not saved: ${err.message || err}`;
+        });
+      }, DRAFT_DEBOUNCE_MS);
+    }
+
+    function resetDraft() {
+      // Pending edits still reach the draft they belong to before the form changes.
+      if (draft.timer) flushDraft().catch(() => {});
+      draft = newDraft();
+      byId("draftStatus").textContent = "";
+    }
+
+    function restoreDraft(id, version, doc) {
+      fillForm({
+        id: doc.originalId,
+        title: doc.title,
+        summary: doc.about,
+        body: doc.body,
+        tags: doc.tags,
+        category: doc.category,
+        link: doc.link,
+        imageAlt: doc.imageAlt,
+        image: doc.imagePath,
+      });
+      const blocks = doc.blocks || {};
+      state.additions = (doc.order || [])
+        .filter((key) => blocks[key])
+        .map((key) => createAddition(blocks[key].type, { ...blocks[key], id: Number(key) }));
+      state.nextAdditionId = Math.max(0, ...state.additions.map((block) => block.id)) + 1;
+      renderAdditions();
+      Object.assign(draft, { id, version, sent: doc });
+      setStatus(`Restored draft: ${doc.title || "Untitled"}`);
+    }
+
+    async function offerDraft(kind, originalId) {
+      const listing = await fetch(`/api/draft?${new URLSearchParams({ kind, originalId })}`).then((r) => r.json());
+      const latest = listing.drafts && listing.drafts[0];
+      if (!latest) return;
+      const when = new Date(latest.updated * 1000).toLocaleString();
+      if (!confirm(`Restore the unsaved draft of "${latest.title || "Untitled"}" from ${when}?`)) {
+        await postDraft({ id: latest.id, discard: true });
+        return;
+      }
+      const data = await fetch(`/api/draft?id=${encodeURIComponent(latest.id)}`).then((r) => r.json());
+      if (data.ok) restoreDraft(data.id, data.version, data.draft);
+    }
+
+    document.querySelector("main.shell").addEventListener("input", (e) => {
+      if (e.target.id === "itemSearch" || e.target.type === "file") return;
+      scheduleDraft();
+      schedulePreview();
+    });
+
+    const LIST_PAGE_SIZE = 50;
+    const listState = { cursor: null, query: "", request: 0, timer: 0 };
+
+    async function loadList(append = false) {
+      // The sidebar only needs titles and summaries; bodies come from /api/get on edit.
       const kind = byId("kind").value;
-      const response = await fetch(`/api/list?kind=${encodeURIComponent(kind)}`);
+      const request = ++listState.request;
+      const params = new URLSearchParams({ kind, fields: "id,title,summary", limit: String(LIST_PAGE_SIZE) });
+      if (listState.query) params.set("q", listState.query);
+      if (append && listState.cursor) params.set("cursor", listState.cursor);
+      const response = await fetch(`/api/list?${params}`);
       const data = await response.json();
       if (!response.ok) throw new Error(data.error || "Could not load items");
+      if (request !== listState.request) return;
+      listState.cursor = data.nextCursor;
+      byId("moreItems").style.display = data.nextCursor ? "block" : "none";
       const root = byId("items");
-      root.innerHTML = "";
-      if (!data.items.length) {
-        root.innerHTML = "<p style='margin:0;color:#6b6b6b;font:400 .86rem Inter,sans-serif'>No items yet.</p>";
+      if (!append) {
+        root.innerHTML = "";
+        listCards.clear();
+      }
+      if (!append && !data.items.length) {
+        const empty = listState.query ? "No matching items." : "No items yet.";
+        root.innerHTML = `<p style='margin:0;color:#6b6b6b;font:400 .86rem Inter,sans-serif'>${empty}</p>`;
         return;
       }
 
       data.items.forEach((item) => {
-        const card = document.createElement("div");
-        card.className = "item";
-        card.innerHTML = `
-          <b>${item.title || "Untitled"}</b>
-          <p>${(item.summary || "").slice(0, 110)}</p>
-          <div class="item-actions">
-            <button class="mini-btn" type="button" data-action="edit">Edit</button>
-            <button class="mini-btn mini-danger" type="button" data-action="delete">Delete</button>
-          </div>
-        `;
-        card.querySelector('[data-action="edit"]').addEventListener("click", () => fillForm(item));
-        card.querySelector('[data-action="delete"]').addEventListener("click", async () => {
-          if (!confirm(`Delete ${item.title}?`)) return;
-          await deleteItem(item.id);
-        });
+        const card = itemCard(item);
+        listCards.set(item.id, card);
         root.appendChild(card);
       });
     }
 
+    function itemCard(item) {
+      const card = document.createElement("div");
+      card.className = "item";
+      card.innerHTML = `
+        <b>${item.title || "Untitled"}</b>
+        <p>${(item.summary || "").slice(0, 110)}</p>
+        <div class="item-actions">
+          <button class="mini-btn" type="button" data-action="edit">Edit</button>
+          <button class="mini-btn" type="button" data-action="history">History</button>
+          <button class="mini-btn mini-danger" type="button" data-action="delete">Delete</button>
+        </div>
+      `;
+      card.querySelector('[data-action="edit"]').addEventListener("click", () => {
+        editItem(item).catch((err) => setStatus(err.message || String(err), "err"));
+      });
+      card.querySelector('[data-action="history"]').addEventListener("click", () => {
+        showHistory(item).catch((err) => setStatus(err.message || String(err), "err"));
+      });
+      card.querySelector('[data-action="delete"]').addEventListener("click", async () => {
+        if (!confirm(`Delete ${item.title}?`)) return;
+        await deleteItem(item.id);
+      });
+      return card;
+    }
+
+    // Saves here, in other tabs and hand edits of the data files all arrive as change events
+    // (/api/events); the list patches the one card instead of reloading.
+    const listCards = new Map();
+    const changes = new EventSource("/api/events");
+    changes.addEventListener("change", (e) => {
+      patchList(JSON.parse(e.data)).catch((err) => setStatus(err.message || String(err), "err"));
+    });
+    changes.addEventListener("reset", () => {
+      loadList().catch((err) => setStatus(err.message || String(err), "err"));
+    });
+
+    async function patchList(change) {
+      if (change.kind !== byId("kind").value) return;
+      const current = listCards.get(change.id);
+      if (change.action === "deleted") {
+        if (current) current.remove();
+        listCards.delete(change.id);
+        return;
+      }
+      // Search results only change when the search does; a new entry is not ours to add.
+      if (!current && listState.query) return;
+      const response = await fetch(`/api/get?${new URLSearchParams({ kind: change.kind, id: change.id })}`);
+      const data = await response.json();
+      if (!response.ok || !data.item) return;
+      const card = itemCard(data.item);
+      if (current) {
+        current.replaceWith(card);
+      } else {
+        // New entries go first, as saves do in the list the server returns.
+        if (!listCards.size) byId("items").innerHTML = "";
+        byId("items").prepend(card);
+      }
+      listCards.set(change.id, card);
+    }
+
+    async function refreshList() {
+      // Without the change feed (too many streams open, say), fall back to reloading.
+      if (changes.readyState !== EventSource.OPEN) await loadList();
+    }
+
+    byId("moreItems").addEventListener("click", () => {
+      loadList(true).catch((err) => setStatus(err.message || String(err), "err"));
+    });
+
+    byId("itemSearch").addEventListener("input", (e) => {
+      clearTimeout(listState.timer);
+      listState.timer = setTimeout(() => {
+        listState.query = e.target.value.trim();
+        loadList().catch((err) => setStatus(err.message || String(err), "err"));
+      }, 150);
+    });
+
+    async function editItem(item) {
+      if (item.body !== undefined) {
+        fillForm(item);
+        await offerDraft(byId("kind").value, item.id);
+        return;
+      }
+      // The list carries no bodies, so fetch this one entry.
+      const kind = byId("kind").value;
+      const response = await fetch(`/api/get?kind=${encodeURIComponent(kind)}&id=${encodeURIComponent(item.id)}`);
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || "Could not load item");
+      fillForm(data.item);
+      await offerDraft(kind, item.id);
+    }
+
+    async function showHistory(item) {
+      const kind = byId("kind").value;
+      const response = await fetch(`/api/history?kind=${encodeURIComponent(kind)}&id=${encodeURIComponent(item.id)}`);
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || "Could not load history");
+      if (!data.revisions.length) {
+        setStatus(`No saved revisions of ${item.title} yet.`);
+        return;
+      }
+      const lines = data.revisions.slice(0, 20).map((r) => {
+        const when = new Date(r.time * 1000).toLocaleString();
+        const label = r.deleted ? "(deleted)" : r.title;
+        return `#${r.rev}  ${when}  ${label}${r.note ? ` [${r.note}]` : ""}`;
+      });
+      const choice = prompt(`Revert "${item.title}" to which revision?\n\n${lines.join("\n")}`, "");
+      if (!choice) return;
+      const revert = await fetch("/api/revert", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ kind, id: item.id, rev: Number(choice.replace("#", "")) }),
+      });
+      const result = await revert.json();
+      if (!revert.ok) throw new Error(result.error || "Revert failed");
+      setStatus(`Reverted ${result.title} to revision ${choice}`, "ok");
+      await refreshList();
+    }
+
     async function deleteItem(id) {
       const payload = { kind: byId("kind").value, id };
       const response = await fetch("/api/delete", {
@@ -587,7 +2138,7 @@ def editor_page() -> str:
       if (!response.ok) throw new Error(data.error || "Delete failed");
       setStatus(`Deleted ${id}`, "ok");
       if (state.originalId === id) clearForm();
-      await loadList();
+      await refreshList();
     }
 
     byId("thumb").addEventListener("change", async (e) => {
@@ -595,17 +2146,14 @@ def editor_page() -> str:
       state.imageData = "";
       state.imageName = "";
       if (!file) return;
-      state.imageName = file.name;
-      const dataUrl = await new Promise((resolve, reject) => {
-        const reader = new FileReader();
-        reader.onload = () => resolve(String(reader.result || ""));
-        reader.onerror = reject;
-        reader.readAsDataURL(file);
-      });
-      state.imageData = dataUrl;
-      const preview = byId("thumbPreview");
-      preview.src = dataUrl;
-      preview.style.display = "block";
+      try {
+        byId("imagePath").value = await uploadImage(file);
+        const preview = byId("thumbPreview");
+        preview.src = URL.createObjectURL(file);
+        preview.style.display = "block";
+      } catch (err) {
+        setStatus(err.message || String(err), "err");
+      }
     });
 
     byId("newBtn").addEventListener("click", () => {
@@ -613,9 +2161,17 @@ def editor_page() -> str:
       setStatus("New draft");
     });
 
+    byId("previewBtn").addEventListener("click", () => {
+      previewState.open = !previewState.open;
+      byId("previewBtn").setAttribute("aria-pressed", String(previewState.open));
+      byId("preview").classList.toggle("open", previewState.open);
+      if (previewState.open) refreshPreview().catch((err) => setStatus(err.message || String(err), "err"));
+    });
+
     byId("kind").addEventListener("change", async () => {
       clearForm();
       await loadList();
+      await offerDraft(byId("kind").value, "");
     });
 
     byId("addBlockBtn").addEventListener("click", () => {
@@ -626,6 +2182,7 @@ def editor_page() -> str:
         state.additions.push(createAddition("paragraph"));
       }
       renderAdditions();
+      scheduleDraft();
     });
 
     byId("saveBtn").addEventListener("click", async () => {
@@ -635,34 +2192,18 @@ def editor_page() -> str:
         if (!additions.length) {
           throw new Error("Please add at least one paragraph or image block.");
         }
-        const payload = {
-          kind: byId("kind").value,
-          originalId: state.originalId,
-          title: byId("title").value,
-          about: byId("about").value,
-          body: byId("body").value,
-          additions,
-          tags: byId("tags").value,
-          category: byId("category").value,
-          link: byId("link").value,
-          imageAlt: byId("imageAlt").value,
-          imagePath: byId("imagePath").value,
-          imageData: state.imageData,
-          imageName: state.imageName,
-        };
-        const response = await fetch("/api/save", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        const data = await response.json();
+        // Saving publishes the draft: bring it up to date, then the server runs persist_entry on it.
+        const saving = draft;
+        await flushDraft(saving);
+        const { response, data } = await postDraft({ id: saving.id, base: saving.version, publish: true });
         if (!response.ok) throw new Error(data.error || "Save failed");
+        resetDraft();
         state.originalId = data.id;
         state.imageData = "";
         state.imageName = "";
         byId("thumb").value = "";
         setStatus(`Saved ${data.kind}: ${data.title}`, "ok");
-        await loadList();
+        await refreshList();
       } catch (err) {
         setStatus(err.message || String(err), "err");
       }
@@ -681,81 +2222,540 @@ def editor_page() -> str:
         });
         const data = await response.json();
         if (!response.ok) throw new Error(data.error || "Deploy failed");
-        setStatus(data.message || "Deployed", "ok");
+        followDeploy(data.jobId);
       } catch (err) {
         setStatus(err.message || String(err), "err");
       }
     });
 
+    function followDeploy(jobId) {
+      // The deploy runs in the background; progress arrives as server-sent events.
+      const events = new EventSource(`/api/deploy/status?id=${encodeURIComponent(jobId)}`);
+      events.onmessage = (e) => {
+        const job = JSON.parse(e.data);
+        const line = job.log[job.log.length - 1];
+        if (line) setStatus(`Deploying (${job.state})... ${line}`);
+      };
+      events.addEventListener("done", (e) => {
+        events.close();
+        const job = JSON.parse(e.data);
+        if (job.state === "succeeded") setStatus((job.result && job.result.message) || "Deployed", "ok");
+        else setStatus(job.error || "Deploy failed", "err");
+      });
+    }
+
     renderAdditions();
-    loadList().catch((err) => setStatus(err.message || String(err), "err"));
+    loadList()
+      .then(() => offerDraft(byId("kind").value, ""))
+      .catch((err) => setStatus(err.message || String(err), "err"));
   </script>
 </body>
 </html>
 """
 
 
+# Route labels for metrics; any other path is a static file (or a 404).
+ROUTES = (
+    "/editor",
+    "/metrics",
+    "/api/get",
+    "/api/list",
+    "/api/history",
+    "/api/draft",
+    "/api/deploy/status",
+    "/api/events",
+    "/api/upload",
+    "/api/save",
+    "/api/delete",
+    "/api/deploy",
+    "/api/revert",
+    "/api/preview",
+)
+
+# Event streams stay open for minutes; profiling one would serialize every other request behind it.
+STREAMING_ROUTES = frozenset({"/api/events", "/api/deploy/status"})
+
+
+def route_label(path: str) -> str:
+    if path in {"/", "/editor", "/editor/"}:
+        return "/editor"
+    if path in ROUTES:
+        return path
+    return "/api/other" if path.startswith("/api/") else "static"
+
+
 class EditorHandler(SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
+        self._request_metrics: metrics.Request | None = None
         super().__init__(*args, directory=str(ROOT), **kwargs)
 
+    def _observed(self, handle):
+        if not metrics.active():
+            handle()
+            return
+        path = urlparse(self.path).path
+        req = metrics.Request(route_label(path), self.command, self.path, self.client_address[0])
+        length = self.headers.get("Content-Length", "")
+        if length.isdigit():
+            req.bytes_in = int(length)
+        self._request_metrics = req
+        try:
+            metrics.run_request(req, handle, profile=path not in STREAMING_ROUTES)
+        finally:
+            self._request_metrics = None
+
+    def send_response(self, code, message=None):
+        if self._request_metrics is not None:
+            self._request_metrics.status = int(code)
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if self._request_metrics is not None and keyword.lower() == "content-length":
+            self._request_metrics.bytes_out += int(value)
+        super().send_header(keyword, value)
+
+    def log_request(self, code="-", size="-"):
+        # The JSON access log replaces the default stderr line.
+        if not metrics.access_logging():
+            super().log_request(code, size)
+
     def _json(self, status: HTTPStatus, payload: dict):
-        body = json.dumps(payload).encode("utf-8")
+        body = self._dump_json(payload)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _not_modified(self, etag: str, cache_control: str = "no-cache"):
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _send_body(
+        self,
+        content_type: str,
+        etag: str,
+        body: bytes,
+        encoding: str | None,
+        last_modified: str = "",
+        cache_control: str = "no-cache",
+    ):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if last_modified:
+            self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _cached(self, content_type: str, etag: str, render):
+        """Answer a GET whose body ``render()`` is fully identified by ``etag``."""
+        encoding = http_cache.negotiate(self.headers.get("Accept-Encoding"))
+        etag = http_cache.representation_etag(etag, encoding)
+        if http_cache.etag_matches(self.headers.get("If-None-Match"), etag):
+            self._not_modified(etag)
+            return
+        body = http_cache.BODIES.get_or_create(etag, lambda: http_cache.encode(render(), encoding))
+        self._send_body(content_type, etag, body, encoding)
+
+    def _cached_json(self, etag: str, payload_fn):
+        try:
+            self._cached("application/json; charset=utf-8", etag, lambda: self._dump_json({"ok": True, **payload_fn()}))
+        except Exception as exc:  # noqa: BLE001
+            self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
+
+    @staticmethod
+    def _dump_json(payload: dict) -> bytes:
+        with metrics.stage("json_serialize"):
+            return json.dumps(payload).encode("utf-8")
+
+    def _static(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            # Directories (index.html, redirects) and 404s keep the stock behaviour.
+            return super().do_GET()
+        st = path.stat()
+        # Fingerprinted builds never change under their name; everything else revalidates.
+        cache_control = asset_bundle.IMMUTABLE if asset_bundle.is_fingerprinted(path, ROOT) else "no-cache"
+        content_type = self.guess_type(str(path))
+        encoding = None
+        if st.st_size >= http_cache.MIN_COMPRESS_BYTES and http_cache.is_compressible(content_type):
+            encoding = http_cache.negotiate(self.headers.get("Accept-Encoding"))
+        etag = http_cache.representation_etag(http_cache.file_etag(st), encoding)
+        last_modified = self.date_time_string(st.st_mtime)
+        if_none_match = self.headers.get("If-None-Match")
+        if http_cache.etag_matches(if_none_match, etag):
+            self._not_modified(etag, cache_control)
+            return
+        if not if_none_match and self.headers.get("If-Modified-Since"):
+            with contextlib.suppress(TypeError, ValueError, IndexError, OverflowError):
+                since = email.utils.parsedate_to_datetime(self.headers["If-Modified-Since"])
+                if int(st.st_mtime) <= since.timestamp():
+                    self._not_modified(etag, cache_control)
+                    return
+        if encoding:
+            key = (str(path), http_cache.file_etag(st), encoding)
+            body = http_cache.BODIES.get_or_create(
+                key, lambda: http_cache.encode(path.read_bytes(), encoding, thorough=True)
+            )
+            self._send_body(content_type, etag, body, encoding, last_modified, cache_control)
+            return
+        with path.open("rb") as handle:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(st.st_size))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            shutil.copyfileobj(handle, self.wfile)
+
     def do_GET(self):
+        self._observed(self._get)
+
+    def do_POST(self):
+        self._observed(self._post)
+
+    def _get(self):
         route = urlparse(self.path)
         if route.path in {"/", "/editor", "/editor/"}:
-            html = editor_page().encode("utf-8")
+            html, etag = editor_page_response()
+            self._cached("text/html; charset=utf-8", etag, lambda: html)
+            return
+        if route.path == "/metrics":
+            body = metrics.REGISTRY.render().encode("utf-8")
             self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(html)))
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
             self.end_headers()
-            self.wfile.write(html)
+            self.wfile.write(body)
+            return
+        if route.path == "/api/get":
+            qs = parse_qs(route.query)
+            kind = (qs.get("kind", ["article"])[0] or "article").strip().lower()
+            entry_id = (qs.get("id", [""])[0] or "").strip()
+            try:
+                etag = entry_etag(kind, entry_id)
+            except Exception as exc:  # noqa: BLE001
+                self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
+                return
+            self._cached_json(etag, lambda: {"item": get_entry(kind, entry_id)})
             return
         if route.path == "/api/list":
             try:
-                qs = parse_qs(route.query)
-                kind = (qs.get("kind", ["article"])[0] or "article").strip().lower()
-                self._json(HTTPStatus.OK, {"ok": True, "items": list_entries(kind)})
+                params = parse_list_query(route.query)
+                etag = list_etag(params)
             except Exception as exc:  # noqa: BLE001
                 self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
+                return
+            self._cached_json(etag, lambda: list_entries(**params))
             return
-        return super().do_GET()
-
-    def do_POST(self):
-        route = urlparse(self.path).path
-        if route not in {"/api/save", "/api/delete", "/api/deploy"}:
+        if route.path == "/api/history":
+            qs = parse_qs(route.query)
+            kind = (qs.get("kind", ["article"])[0] or "article").strip().lower()
+            entry_id = (qs.get("id", [""])[0] or "").strip()
+            rev = (qs.get("rev", [""])[0] or "").strip()
+            try:
+                self._json(HTTPStatus.OK, entry_history(kind, entry_id, rev))
+            except Exception as exc:  # noqa: BLE001
+                self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
+            return
+        if route.path == "/api/draft":
+            try:
+                self._json(HTTPStatus.OK, find_drafts(route.query))
+            except Exception as exc:  # noqa: BLE001
+                self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
+            return
+        if route.path == "/api/deploy/status":
+            self._deploy_status(route.query)
+            return
+        if route.path == "/api/events":
+            self._events(route.query)
+            return
+        return self._static()
+
+    def _events(self, query: str):
+        """Server-sent change events: ``id: <seq>``, ``event: change``, ``data: {kind, id, version, action, source}``."""
+        last = self.headers.get("Last-Event-ID") or (parse_qs(query).get("since", [""])[0] or "")
+        if not CHANGES.subscribe(MAX_EVENT_STREAMS):
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            self.send_header("Retry-After", "30")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            WATCHER.ensure_running()
+            after = int(last) if last.isdigit() else CHANGES.latest()
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.close_connection = True
+            deadline = time.monotonic() + EVENT_STREAM_SECONDS
+            with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                self.wfile.write(b"retry: 2000\n\n")
+                self.wfile.flush()
+                while time.monotonic() < deadline:
+                    events, lost = CHANGES.wait(after, timeout=15.0)
+                    if lost:
+                        # Too far behind to replay: the client reloads what it shows.
+                        self.wfile.write(b"event: reset\ndata: {}\n\n")
+                    chunks = [f"id: {e['seq']}\nevent: change\ndata: {json.dumps(e)}\n\n" for e in events]
+                    # A comment after a quiet timeout doubles as a keep-alive.
+                    self.wfile.write(("".join(chunks) or ": keep-alive\n\n").encode("utf-8"))
+                    self.wfile.flush()
+                    if events:
+                        after = events[-1]["seq"]
+                    elif lost:
+                        after = CHANGES.latest()
+        finally:
+            CHANGES.unsubscribe()
+
+    def _deploy_status(self, query: str):
+        qs = parse_qs(query)
+        job = DEPLOYS.get((qs.get("id", [""])[0] or "").strip() or None)
+        if job is None:
+            self._json(HTTPStatus.NOT_FOUND, {"ok": False, "error": "No such deploy job"})
+            return
+        if "text/event-stream" not in self.headers.get("Accept", ""):
+            self._json(HTTPStatus.OK, {"ok": True, "job": DEPLOYS.snapshot(job)})
+            return
+        # Server-sent events: one message per batch of progress, a final "done" event, then close.
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.close_connection = True
+        update = DEPLOYS.snapshot(job)
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            while True:
+                finished = update["state"] in FINISHED
+                event = "event: done\n" if finished else ""
+                self.wfile.write(f"{event}data: {json.dumps(update)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if finished:
+                    return
+                # An empty update after the timeout doubles as a keep-alive.
+                update = DEPLOYS.wait(job, update["logLength"], update["state"], timeout=15.0)
+
+    def _post(self):
+        route = urlparse(self.path)
+        if route.path == "/api/upload":
+            self._upload(route.query)
+            return
+        if route.path not in {"/api/save", "/api/delete", "/api/deploy", "/api/revert", "/api/draft", "/api/preview"}:
             self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
             return
         try:
-            size = int(self.headers.get("Content-Length", "0"))
-            payload = json.loads((self.rfile.read(size) or b"{}").decode("utf-8"))
-            if route == "/api/save":
+            payload = json.loads(read_body(self.rfile, self.headers, MAX_JSON_BYTES) or b"{}")
+            if route.path == "/api/save":
                 self._json(HTTPStatus.OK, persist_entry(payload))
-            elif route == "/api/deploy":
-                self._json(HTTPStatus.OK, deploy_to_main(payload))
+                schedule_asset_bundle()
+            elif route.path == "/api/deploy":
+                self._json(HTTPStatus.ACCEPTED, deploy_to_main(payload))
+            elif route.path == "/api/revert":
+                self._json(HTTPStatus.OK, revert_entry(payload))
+                schedule_asset_bundle()
+            elif route.path == "/api/draft":
+                result = save_draft(payload)
+                self._json(HTTPStatus.OK, result)
+                if result.get("published"):
+                    schedule_asset_bundle()
+            elif route.path == "/api/preview":
+                self._json(HTTPStatus.OK, preview_markdown(payload))
             else:
                 self._json(HTTPStatus.OK, delete_entry(payload))
+                schedule_asset_bundle()
+        except BodyTooLarge as exc:
+            self.close_connection = True
+            self._json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"ok": False, "error": str(exc)})
+        except drafts.DraftConflict as exc:
+            self._json(HTTPStatus.CONFLICT, {"ok": False, "error": str(exc), "version": exc.version})
         except Exception as exc:  # noqa: BLE001
             self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
 
+    def _upload(self, query: str):
+        qs = parse_qs(query)
+        kind = (qs.get("kind", ["article"])[0] or "article").strip().lower()
+        image_name = (qs.get("name", ["upload"])[0] or "upload").strip()
+        mime = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        try:
+            chunks = iter_body_chunks(self.rfile, self.headers, MAX_UPLOAD_BYTES)
+            self._json(HTTPStatus.OK, save_uploaded_image(kind, image_name, mime, chunks))
+        except BodyTooLarge as exc:
+            self.close_connection = True
+            self._json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"ok": False, "error": str(exc)})
+        except Exception as exc:  # noqa: BLE001
+            # The body may be only partly consumed, so the connection cannot be reused.
+            self.close_connection = True
+            self._json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(exc)})
 
-def main() -> None:
-    server = ThreadingHTTPServer((HOST, PORT), EditorHandler)
-    print(f"Editor running on http://{HOST}:{PORT}/editor")
+
+def serve(mode: str = "threading", port: int = PORT) -> None:
+    editor_page_response()
+    print(f"Editor running on http://{HOST}:{port}/editor ({mode} server)")
     print("Press Ctrl+C to stop.")
+    if mode == "asyncio":
+        try:
+            async_server.run(EditorHandler, HOST, port, WORKERS, MAX_CONNECTIONS)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            STORE.flush()
+        return
+    server = ThreadingHTTPServer((HOST, port), EditorHandler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
         server.server_close()
+        STORE.flush()
+
+
+def run_import(args: argparse.Namespace) -> None:
+    last_report = 0.0
+
+    def progress(read: int, seconds: float) -> None:
+        nonlocal last_report
+        if seconds - last_report >= 1.0:
+            last_report = seconds
+            print(f"  read {read} records ({read / seconds:.0f}/s)", file=sys.stderr)
+
+    stats = import_entries(
+        bulk_io.read_records(args.source, args.format),
+        default_kind=args.kind,
+        on_existing=args.on_existing,
+        dry_run=args.dry_run,
+        strict=args.strict,
+        progress=progress,
+    )
+    for error in stats["errors"][:20]:
+        print(f"invalid: {error}", file=sys.stderr)
+    if len(stats["errors"]) > 20:
+        print(f"... and {len(stats['errors']) - 20} more invalid records", file=sys.stderr)
+    verb = "Imported" if stats["written"] else "Would import"
+    for kind, counts in stats["kinds"].items():
+        print(f"{verb} {kind}: {counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged")
+    read_seconds, write_seconds = stats["read_seconds"], stats["write_seconds"]
+    print(
+        f"{stats['read']} records ({stats['invalid']} invalid, {stats['skipped']} skipped, {stats['renamed']} renamed)"
+        f" read in {read_seconds:.2f} s ({stats['read'] / max(read_seconds, 1e-9):.0f}/s),"
+        f" written in {write_seconds:.2f} s"
+    )
+    if stats["variants"] and image_variants.available():
+        print(f"Building image variants for {stats['variants']} imported entries before exiting...")
+    elif stats["variants"]:
+        print(f"{stats['variants']} imported entries have images: install Pillow and run `editor.py images` for their variants.")
+    if stats["invalid"]:
+        if args.strict:
+            print("Nothing was written because of invalid records (--strict).", file=sys.stderr)
+        raise SystemExit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local portfolio editor.")
+    commands = parser.add_subparsers(dest="command")
+    parser.set_defaults(server=os.environ.get("EDITOR_SERVER", "threading"), port=PORT, access_log=None, profile=None)
+    run_server = commands.add_parser("serve", help="run the editor server (default)")
+    run_server.add_argument(
+        "--server",
+        choices=["threading", "asyncio"],
+        default=os.environ.get("EDITOR_SERVER", "threading"),
+        help="thread per connection, or an event loop with keep-alive and a worker pool (EDITOR_WORKERS)",
+    )
+    run_server.add_argument("--port", type=int, default=PORT)
+    run_server.add_argument("--access-log", metavar="PATH", help="write one JSON line per request to PATH (- for stdout)")
+    run_server.add_argument("--profile", metavar="DIR", help="save a cProfile .prof file per request in DIR")
+    gc = commands.add_parser("gc-images", help="delete images no entry or page references")
+    gc.add_argument("--dry-run", action="store_true", help="only list what would be deleted")
+    gc.add_argument("--min-age-hours", type=float, default=24.0, help="keep files newer than this (default: 24)")
+    migrate = commands.add_parser("migrate", help="convert data files between monolithic and sharded layouts")
+    migrate.add_argument("--layout", choices=["sharded", "monolithic"], default="sharded")
+    migrate.add_argument("--kind", choices=KINDS, action="append", help="limit to a kind (repeatable)")
+    images = commands.add_parser("images", help="build responsive variants for every entry image")
+    images.add_argument("--force", action="store_true", help="rebuild variants even if they are up to date")
+    commands.add_parser("search-index", help="rebuild assets/data/search-index.json from all entries")
+    commands.add_parser("history-compact", help="apply the revision retention policy to every entry's history")
+    commands.add_parser("export-json", help="write the SQLite store's changes to the JSON files the site reads")
+    assets = commands.add_parser("assets", help="minify and fingerprint CSS, JS and data files into assets/build/")
+    assets.add_argument("--force", action="store_true", help="rebuild every file, not just changed ones")
+    bulk_import = commands.add_parser("import", help="add or update many entries from markdown or JSON lines")
+    bulk_import.add_argument("source", help="directory of .md files, one .md file, a .jsonl file, or - for stdin")
+    bulk_import.add_argument("--kind", choices=KINDS, default="article", help="for records that name no kind")
+    bulk_import.add_argument("--format", choices=["auto", "markdown", "jsonl"], default="auto")
+    bulk_import.add_argument(
+        "--on-existing",
+        choices=["update", "skip", "rename"],
+        default="update",
+        help="what to do with an entry whose id or title already exists (default: update)",
+    )
+    bulk_import.add_argument("--dry-run", action="store_true", help="validate and report without writing")
+    bulk_import.add_argument("--strict", action="store_true", help="write nothing if any record is invalid")
+    bulk_export = commands.add_parser("export", help="write entries as markdown files or JSON lines")
+    bulk_export.add_argument("out", help="output directory (markdown), a .jsonl file, or - for stdout")
+    bulk_export.add_argument("--kind", choices=KINDS, action="append", help="limit to a kind (repeatable)")
+    bulk_export.add_argument("--format", choices=["auto", "markdown", "jsonl"], default="auto")
+    args = parser.parse_args()
+
+    if args.command == "gc-images":
+        removed = collect_garbage_images(args.min_age_hours, args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        for path in removed:
+            print(f"{verb} {path.relative_to(ROOT)}")
+        print(f"{verb} {len(removed)} unreferenced image(s).")
+        return
+    if args.command == "migrate":
+        for kind in args.kind or KINDS:
+            moved = migrate_layout(kind, args.layout)
+            print(f"{kind}: {f'converted {moved} entries' if moved else 'already ' + args.layout}")
+        return
+    if args.command == "images":
+        print(f"Processed {build_all_image_variants(args.force)} image(s).")
+        return
+    if args.command == "history-compact":
+        logs, before, after = compact_history()
+        print(f"Compacted {logs} history log(s): {before} -> {after} bytes.")
+        return
+    if args.command == "export-json":
+        if storage_db() is None:
+            print("Storage is JSON (EDITOR_STORAGE is not sqlite); the data files are already current.")
+            return
+        written = export_static_json()
+        print(f"Wrote {len(written)} file(s).")
+        return
+    if args.command == "assets":
+        touched = build_asset_bundle(args.force)
+        for path in touched:
+            print(f"{'Wrote' if path.exists() else 'Removed'} {path.relative_to(ROOT)}")
+        print(f"Assets up to date ({len(touched)} file(s) changed).")
+        return
+    if args.command == "import":
+        run_import(args)
+        return
+    if args.command == "export":
+        count = export_entries(args.out, args.kind or KINDS, args.format)
+        print(f"Exported {count} entries to {args.out}.", file=sys.stderr if args.out == "-" else sys.stdout)
+        return
+    if args.command == "search-index":
+        print(f"Indexed {rebuild_search_index()} entries into {search_index_file().relative_to(ROOT)}.")
+        return
+    metrics.configure(args.access_log, args.profile)
+    serve(args.server, args.port)
 
 
 if __name__ == "__main__":
+    # Modules that ``import editor`` (build_site.py, run by deploys) must share this
+    # instance, with its write-behind store, rather than load a second copy.
+    sys.modules["editor"] = sys.modules[__name__]
     main()
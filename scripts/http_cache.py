@@ -0,0 +1,137 @@
+"""Validators, content negotiation and a compressed-body cache for the editor server.
+
+Dynamic responses get strong ETags built from the content store's per-file
+versions (salted per process, since versions restart at zero), static files
+get ETags from their stat signature, and the editor page from its bytes.
+Compressed bodies are kept in a bounded LRU keyed by the representation, so a
+static asset or an unchanged API response is compressed once, not per request.
+
+brotli is optional: without it only gzip is offered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024
+CACHE_BYTES = int(float(os.environ.get("EDITOR_HTTP_CACHE_MB", "64")) * 1024 * 1024)
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+_PROCESS_SALT = os.urandom(8).hex()
+
+
+def content_etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def version_etag(*parts: object) -> str:
+    """ETag for data identified by store versions; only meaningful within this process."""
+    key = json.dumps([_PROCESS_SALT, *parts], default=str).encode("utf-8")
+    return content_etag(key)
+
+
+def file_etag(st: os.stat_result) -> str:
+    return f'"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def representation_etag(etag: str, encoding: str | None) -> str:
+    # Each encoding is a different representation, so it needs its own strong validator.
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def offered_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Best of our encodings by the client's q-values; ties go to our preference order."""
+    weights: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in offered_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encode(data: bytes, encoding: str | None, thorough: bool = False) -> bytes:
+    """Compress ``data``; ``thorough`` trades CPU for size on bodies that will be cached for long."""
+    if encoding is None:
+        return data
+    with metrics.stage("compress"):
+        if encoding == "gzip":
+            return gzip.compress(data, compresslevel=9 if thorough else 6, mtime=0)
+        if encoding == "br":
+            return brotli.compress(data, quality=11 if thorough else 5)
+        return data
+
+
+class BodyCache:
+    """Byte-bounded LRU of encoded response bodies."""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+                return body
+        # Encode outside the lock; two racing requests at worst both compress.
+        body = factory()
+        if len(body) > self.max_bytes // 4:
+            return body
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = body
+                self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+        return body
+
+
+BODIES = BodyCache()
@@ -0,0 +1,88 @@
+"""Content-addressed storage for editor images.
+
+Images are stored as ``<sha256 prefix><ext>`` so identical bytes uploaded under
+different names share one file, re-saving an article never rewrites an image
+that is already on disk, and a new image can never clobber one that older
+entries point to. ``garbage_collect`` removes files that no entry and no site
+page references any more.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+from content_store import atomic_write_bytes
+
+DIGEST_CHARS = 20
+MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\(([^)\s]+)\)")
+
+
+def content_name(digest: str, ext: str) -> str:
+    return f"{digest[:DIGEST_CHARS]}{ext}"
+
+
+def store_bytes(target_dir: Path, data: bytes, ext: str) -> tuple[str, bool]:
+    """Store ``data`` under its content address; return (file name, whether it was written)."""
+    file_name = content_name(hashlib.sha256(data).hexdigest(), ext)
+    target = target_dir / file_name
+    if target.exists():
+        return file_name, False
+    atomic_write_bytes(target, data)
+    return file_name, True
+
+
+def adopt_temp(tmp_path: Path, digest: str, ext: str) -> tuple[str, bool]:
+    """Move a fully written temp file to its content address, or drop it if that exists."""
+    file_name = content_name(digest, ext)
+    target = tmp_path.parent / file_name
+    if target.exists():
+        tmp_path.unlink()
+        return file_name, False
+    os.replace(tmp_path, target)
+    return file_name, True
+
+
+def entry_image_refs(entry: dict) -> Iterable[str]:
+    image = str(entry.get("image", "") or "").strip()
+    if image:
+        yield image
+    for variant in entry.get("imageVariants", []) or []:
+        if isinstance(variant, dict) and variant.get("src"):
+            yield str(variant["src"])
+    for field in ("content", "details"):
+        yield from MARKDOWN_IMAGE.findall(str(entry.get(field, "") or ""))
+
+
+def reference_counts(entries: Iterable[dict], static_sources: Iterable[Path] = ()) -> Counter:
+    """Count references to image paths from entries and from static site files."""
+    counts: Counter = Counter()
+    for entry in entries:
+        if isinstance(entry, dict):
+            counts.update(ref.lstrip("/") for ref in entry_image_refs(entry))
+    for source in static_sources:
+        text = source.read_text(encoding="utf-8", errors="ignore")
+        counts.update(re.findall(r"assets/images/[^\s\"')]+", text))
+    return counts
+
+
+def garbage_collect(root: Path, image_dir: Path, counts: Counter, min_age: float, dry_run: bool = False) -> list[Path]:
+    """Delete unreferenced files under ``image_dir`` (variants included) older than ``min_age`` seconds."""
+    removed = []
+    cutoff = time.time() - min_age
+    for path in sorted(image_dir.rglob("*")):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        if counts.get(path.relative_to(root).as_posix()):
+            continue
+        if path.stat().st_mtime > cutoff:
+            continue
+        if not dry_run:
+            path.unlink()
+        removed.append(path)
+    return removed
@@ -0,0 +1,183 @@
+"""Responsive derivatives for entry images: width buckets in modern formats.
+
+For each local source image, ``build_variants`` writes resized copies under
+``<image dir>/variants/`` as WebP (and AVIF when the installed Pillow can encode
+it), with EXIF and other metadata stripped. A variant that is already newer
+than its source is left alone, so re-running the pipeline is cheap.
+
+Pillow is optional: without it the editor keeps working and simply records
+whatever variants already exist on disk.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+WIDTHS = (320, 640, 960, 1600)
+FORMATS = {".avif": ("AVIF", "image/avif", {"quality": 55}), ".webp": ("WEBP", "image/webp", {"quality": 78, "method": 6})}
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tif", ".tiff", ".webp"}
+VARIANT_NAME = re.compile(r"^(?P<stem>.+)-(?P<width>\d+)w(?P<ext>\.[a-z0-9]+)$")
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_in_flight: dict[tuple[str, str], tuple[Future, list[Callable[[list[dict]], None]]]] = {}
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def encodable_formats() -> list[str]:
+    if Image is None:
+        return []
+    out = []
+    for ext, (name, _, _) in FORMATS.items():
+        feature = name.lower()
+        try:
+            supported = features.check(feature)
+        except ValueError:
+            supported = name in Image.SAVE
+        if supported:
+            out.append(ext)
+    return out
+
+
+def source_path(root: Path, image: str) -> Path | None:
+    if not image or "://" in image or image.startswith("data:"):
+        return None
+    path = (root / image.lstrip("/")).resolve()
+    if root.resolve() not in path.parents or path.suffix.lower() not in SOURCE_SUFFIXES:
+        return None
+    if path.parent.name == "variants":
+        return None
+    return path if path.is_file() else None
+
+
+def variant_dir(source: Path) -> Path:
+    return source.parent / "variants"
+
+
+def fresh_variants(root: Path, image: str) -> list[dict]:
+    """Variants of ``image`` already on disk and newer than the source, smallest first."""
+    source = source_path(root, image)
+    directory = variant_dir(source) if source else None
+    if source is None or not directory.is_dir():
+        return []
+    source_mtime = source.stat().st_mtime_ns
+    out = []
+    for path in directory.glob(f"{source.stem}-*w.*"):
+        match = VARIANT_NAME.match(path.name)
+        if not match or match["stem"] != source.stem or match["ext"] not in FORMATS:
+            continue
+        if path.stat().st_mtime_ns < source_mtime:
+            continue
+        out.append(
+            {
+                "src": path.relative_to(root).as_posix(),
+                "width": int(match["width"]),
+                "type": FORMATS[match["ext"]][1],
+            }
+        )
+    return sorted(out, key=lambda v: (v["type"], v["width"]))
+
+
+def planned_widths(source_width: int) -> list[int]:
+    return [w for w in WIDTHS if w < source_width] or [source_width]
+
+
+def needs_work(root: Path, image: str) -> bool:
+    source = source_path(root, image)
+    if source is None or Image is None:
+        return False
+    with Image.open(source) as im:
+        expected = len(planned_widths(im.width)) * len(encodable_formats())
+    return len(fresh_variants(root, image)) < expected
+
+
+def build_variants(root: Path, image: str) -> list[dict]:
+    """Write any missing or stale variants of ``image`` and return all of them."""
+    source = source_path(root, image)
+    if source is None or Image is None:
+        return []
+    source_mtime = source.stat().st_mtime_ns
+    directory = variant_dir(source)
+    directory.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        has_alpha = original.mode in ("RGBA", "LA") or "transparency" in original.info
+        base = original.convert("RGBA" if has_alpha else "RGB")
+        for width in planned_widths(base.width):
+            resized = None
+            for ext in encodable_formats():
+                target = directory / f"{source.stem}-{width}w{ext}"
+                if target.exists() and target.stat().st_mtime_ns >= source_mtime:
+                    continue
+                if resized is None:
+                    height = max(1, round(base.height * width / base.width))
+                    resized = base if width == base.width else base.resize((width, height), Image.LANCZOS)
+                name, _, options = FORMATS[ext]
+                # A temp file of its own: another process (or the ``images`` CLI) may be
+                # writing the same variant, since images are shared by content address.
+                fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "wb") as fh:
+                        # A fresh image carries no EXIF/XMP/ICC chunks unless passed explicitly.
+                        resized.save(fh, name, **options)
+                    os.chmod(tmp_name, 0o644)
+                    os.replace(tmp_name, target)
+                except BaseException:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(tmp_name)
+                    raise
+    return fresh_variants(root, image)
+
+
+def submit(root: Path, image: str, on_done: Callable[[list[dict]], None]) -> Future:
+    """Build variants of ``image`` in the pool, then call ``on_done`` with them.
+
+    Entries sharing an image share one job: while a job for it is queued or
+    running, later calls add their ``on_done`` to it instead of starting another.
+    """
+    global _pool
+    key = (str(root), image)
+
+    def run() -> None:
+        try:
+            # Checked here rather than by the caller: opening a bad or unsupported
+            # image must not fail the save that scheduled it.
+            variants = build_variants(root, image) if needs_work(root, image) else None
+        except Exception as exc:  # noqa: BLE001
+            variants = None
+            print(f"image variants: could not process {image}: {exc}")
+        with _pool_lock:
+            callbacks = _in_flight.pop(key)[1]
+        for callback in callbacks if variants is not None else ():
+            try:
+                callback(variants)
+            except Exception as exc:  # noqa: BLE001
+                print(f"image variants: could not record variants of {image}: {exc}")
+
+    with _pool_lock:
+        if _pool is None:
+            workers = max(1, (os.cpu_count() or 2) // 2)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-variants")
+        if key in _in_flight:
+            future, callbacks = _in_flight[key]
+            callbacks.append(on_done)
+            return future
+        # Submitted under the lock, so ``run`` cannot finish before it is registered.
+        future = _pool.submit(run)
+        _in_flight[key] = (future, [on_done])
+    return future
@@ -0,0 +1,251 @@
+"""Python port of the markdown renderer in assets/js/main.js.
+
+``markdown_to_html`` must produce byte-for-byte the same HTML as the browser's
+``markdownToHtml`` so pre-rendered pages and live pages look identical. The
+regular expressions below therefore spell out JavaScript's notion of
+whitespace, ``.`` and ``\\d`` instead of relying on Python's Unicode defaults.
+
+A blank line outside a code fence closes every open paragraph and list, so a
+document renders as the concatenation of the blocks between such lines.
+``RenderCache`` relies on that to re-render only the blocks that changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# JavaScript's \s / String.prototype.trim() whitespace set.
+JS_WS = "\t\n\v\f\r \u00a0\u1680" + "".join(map(chr, range(0x2000, 0x200B))) + "\u2028\u2029\u202f\u205f\u3000\ufeff"
+S = f"[{JS_WS}]"
+# JavaScript's "." (no dotAll): anything but a line terminator.
+DOT = "[^\n\r\u2028\u2029]"
+
+IMAGE = re.compile(rf"!\[([^\]]*)\]\((https?://[^{JS_WS})]+)\)")
+CODE = re.compile(r"`([^`]+)`")
+STRONG_STARS = re.compile(r"\*\*([^*]+)\*\*")
+STRONG_UNDERSCORES = re.compile(r"__([^_]+)__")
+EM_STAR = re.compile(r"\*([^*]+)\*")
+EM_UNDERSCORE = re.compile(r"_([^_]+)_")
+LINK = re.compile(rf"\[([^\]]+)\]\((https?://[^{JS_WS})]+)\)")
+
+FENCE = re.compile(r"^```")
+RULE = re.compile(r"^---+$")
+HEADING = re.compile(rf"^(#{{1,6}}){S}+({DOT}*)$")
+QUOTE = re.compile(rf"^>{S}?({DOT}*)$")
+UL_ITEM = re.compile(rf"^[-*+]{S}+({DOT}*)$")
+OL_ITEM = re.compile(rf"^[0-9]+\.{S}+({DOT}*)$")
+
+
+def js_trim(text: str) -> str:
+    return text.strip(JS_WS)
+
+
+def escape_html(text: str) -> str:
+    return (
+        str(text or "")
+        .replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def render_inline_markdown(text: str) -> str:
+    html = escape_html(text)
+    html = IMAGE.sub(r'<img src="\2" alt="\1" loading="lazy" referrerpolicy="no-referrer" />', html)
+    html = CODE.sub(r"<code>\1</code>", html)
+    html = STRONG_STARS.sub(r"<strong>\1</strong>", html)
+    html = STRONG_UNDERSCORES.sub(r"<strong>\1</strong>", html)
+    html = EM_STAR.sub(r"<em>\1</em>", html)
+    html = EM_UNDERSCORE.sub(r"<em>\1</em>", html)
+    html = LINK.sub(r'<a href="\2" target="_blank" rel="noopener noreferrer">\1</a>', html)
+    return html
+
+
+def markdown_to_html(markdown_text: str) -> str:
+    text = str(markdown_text or "").replace("\r\n", "\n")
+    if not js_trim(text):
+        return ""
+    return render_lines(text.split("\n"))
+
+
+def render_lines(lines: list[str]) -> str:
+    blocks: list[str] = []
+    in_ul = False
+    in_ol = False
+    in_code = False
+    code_lines: list[str] = []
+    paragraph_lines: list[str] = []
+
+    def flush_paragraph() -> None:
+        nonlocal paragraph_lines
+        if not paragraph_lines:
+            return
+        merged = js_trim(" ".join(paragraph_lines))
+        if merged:
+            blocks.append(f"<p>{render_inline_markdown(merged)}</p>")
+        paragraph_lines = []
+
+    def close_lists() -> None:
+        nonlocal in_ul, in_ol
+        if in_ul:
+            blocks.append("</ul>")
+            in_ul = False
+        if in_ol:
+            blocks.append("</ol>")
+            in_ol = False
+
+    def close_open_blocks() -> None:
+        flush_paragraph()
+        close_lists()
+
+    for raw_line in lines:
+        line = js_trim(raw_line)
+
+        if in_code:
+            if FENCE.match(line):
+                blocks.append(f"<pre><code>{escape_html(chr(10).join(code_lines))}</code></pre>")
+                code_lines = []
+                in_code = False
+            else:
+                code_lines.append(raw_line)
+            continue
+
+        if FENCE.match(line):
+            close_open_blocks()
+            in_code = True
+            code_lines = []
+            continue
+
+        if not line:
+            close_open_blocks()
+            continue
+
+        if RULE.match(line):
+            close_open_blocks()
+            blocks.append("<hr />")
+            continue
+
+        heading = HEADING.match(line)
+        if heading:
+            close_open_blocks()
+            level = len(heading[1])
+            blocks.append(f"<h{level}>{render_inline_markdown(heading[2])}</h{level}>")
+            continue
+
+        quote = QUOTE.match(line)
+        if quote:
+            close_open_blocks()
+            blocks.append(f"<blockquote><p>{render_inline_markdown(quote[1])}</p></blockquote>")
+            continue
+
+        ul_item = UL_ITEM.match(line)
+        if ul_item:
+            flush_paragraph()
+            if in_ol:
+                blocks.append("</ol>")
+                in_ol = False
+            if not in_ul:
+                blocks.append("<ul>")
+                in_ul = True
+            blocks.append(f"<li>{render_inline_markdown(ul_item[1])}</li>")
+            continue
+
+        ol_item = OL_ITEM.match(line)
+        if ol_item:
+            flush_paragraph()
+            if in_ul:
+                blocks.append("</ul>")
+                in_ul = False
+            if not in_ol:
+                blocks.append("<ol>")
+                in_ol = True
+            blocks.append(f"<li>{render_inline_markdown(ol_item[1])}</li>")
+            continue
+
+        paragraph_lines.append(line)
+
+    if in_code:
+        blocks.append(f"<pre><code>{escape_html(chr(10).join(code_lines))}</code></pre>")
+
+    close_open_blocks()
+    return "\n".join(blocks)
+
+
+def split_blocks(markdown_text: str) -> list[list[str]]:
+    """The runs of lines between blank lines outside code fences; each renders on its own."""
+    blocks: list[list[str]] = []
+    current: list[str] = []
+    in_code = False
+    for raw_line in str(markdown_text or "").replace("\r\n", "\n").split("\n"):
+        line = js_trim(raw_line)
+        if FENCE.match(line):
+            in_code = not in_code
+        elif not line and not in_code:
+            if current:
+                blocks.append(current)
+                current = []
+            continue
+        current.append(raw_line)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+class RenderCache:
+    """Byte-bounded LRU of rendered HTML keyed by the SHA-256 of its markdown.
+
+    Whole documents and their blocks are both cached, so a long document edited
+    in one paragraph misses once and re-renders just that paragraph.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: bytes) -> str | None:
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+            return html
+
+    def _put(self, key: bytes, html: str) -> None:
+        if len(html) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = html
+                self.size += len(html)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def render(self, markdown_text: str) -> tuple[str, int]:
+        """(``markdown_to_html(markdown_text)``, number of blocks that had to be rendered)."""
+        text = str(markdown_text or "")
+        doc_key = b"d" + hashlib.sha256(text.encode("utf-8")).digest()
+        html = self._get(doc_key)
+        if html is not None:
+            return html, 0
+        parts: list[str] = []
+        rendered = 0
+        for lines in split_blocks(text):
+            # Lines never contain "\n", so joining them is an unambiguous key.
+            key = b"b" + hashlib.sha256("\n".join(lines).encode("utf-8")).digest()
+            part = self._get(key)
+            if part is None:
+                part = render_lines(lines)
+                rendered += 1
+                self._put(key, part)
+            if part:
+                parts.append(part)
+        html = "\n".join(parts)
+        self._put(doc_key, html)
+        return html, rendered
@@ -0,0 +1,260 @@
+"""Request and stage metrics for the editor server, in Prometheus text format.
+
+Handlers run through ``run_request``, which times the request and records
+its status and byte counts; code on the request path wraps expensive steps in
+``stage(name)`` (JSON parsing, serialization, disk writes, image decoding,
+git, compression, search), and each stage is recorded against the route that
+ran it, or "background" for the write-behind flusher and the deploy worker.
+Histograms use fixed buckets, so recording is a lock, a bisect and two adds.
+
+Optional extras, both off by default: a JSON-lines access log with a
+per-request stage breakdown, and a cProfile dump per request. Profiling
+serializes requests (only one profiler can be active at a time), so callers
+pass ``profile=False`` for long-lived streams, which would hold up every
+other request for as long as they stay open. With
+``EDITOR_METRICS=0`` and neither extra enabled, ``stage`` hands back a shared
+no-op context manager and the server skips ``run_request`` altogether.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, TextIO
+
+ENABLED = os.environ.get("EDITOR_METRICS", "1") != "0"
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: dict[str, tuple[str, str]] = {}
+        self._values: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, list[float]]] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self._meta[name] = (kind, text)
+
+    def add(self, name: str, labels: Labels, value: float = 1.0) -> None:
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        slot = bisect.bisect_left(BUCKETS, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts = series.get(labels)
+            if counts is None:
+                # One count per bucket plus +Inf, then the sum.
+                counts = series[labels] = [0.0] * (len(BUCKETS) + 2)
+            counts[slot] += 1
+            counts[-1] += value
+
+    def gauge(self, name: str, fn: Callable[[], float]) -> None:
+        """Report ``fn()`` at scrape time."""
+        self._gauges[name] = fn
+
+    def render(self) -> str:
+        with self._lock:
+            values = {name: dict(series) for name, series in self._values.items()}
+            histograms = {name: {k: list(v) for k, v in series.items()} for name, series in self._histograms.items()}
+        lines: list[str] = []
+
+        def header(name: str, default_kind: str) -> None:
+            kind, text = self._meta.get(name, (default_kind, ""))
+            if text:
+                lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name, series in sorted(values.items()):
+            header(name, "counter")
+            lines.extend(f"{name}{_labels(labels)} {_number(value)}" for labels, value in sorted(series.items()))
+        for name, series in sorted(histograms.items()):
+            header(name, "histogram")
+            for labels, counts in sorted(series.items()):
+                running = 0.0
+                for bound, count in zip((*BUCKETS, "+Inf"), counts):
+                    running += count
+                    lines.append(f"{name}_bucket{_labels((*labels, ('le', str(bound))))} {_number(running)}")
+                lines.append(f"{name}_sum{_labels(labels)} {counts[-1]:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(running)}")
+        for name, fn in sorted(self._gauges.items()):
+            header(name, "gauge")
+            lines.append(f"{name} {_number(fn())}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
+
+
+REGISTRY = Registry()
+REGISTRY.describe("editor_requests_total", "counter", "Requests handled, by route, method and status.")
+REGISTRY.describe("editor_request_seconds", "histogram", "Time spent handling a request.")
+REGISTRY.describe("editor_request_errors_total", "counter", "Requests answered with 4xx/5xx or an unhandled exception.")
+REGISTRY.describe("editor_request_bytes_total", "counter", "Request body bytes received (by Content-Length).")
+REGISTRY.describe("editor_response_bytes_total", "counter", "Response body bytes sent (by Content-Length).")
+REGISTRY.describe("editor_stage_seconds", "histogram", "Time spent in a stage of request handling or background work.")
+REGISTRY.describe("editor_uptime_seconds", "gauge", "Seconds since the server module was loaded.")
+REGISTRY.describe("editor_requests_in_flight", "gauge", "Requests being handled right now.")
+_STARTED = time.monotonic()
+REGISTRY.gauge("editor_uptime_seconds", lambda: time.monotonic() - _STARTED)
+
+_local = threading.local()
+_access_log: TextIO | None = None
+_access_lock = threading.Lock()
+_profile_dir: Path | None = None
+_profile_lock = threading.Lock()
+_profile_serial = 0
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def _count_in_flight(delta: int) -> None:
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+REGISTRY.gauge("editor_requests_in_flight", lambda: _in_flight)
+
+
+def configure(access_log: str | None = None, profile_dir: str | None = None) -> None:
+    """Turn on the JSON access log (a path, or "-" for stdout) and/or per-request profiles."""
+    global _access_log, _profile_dir
+    if access_log:
+        _access_log = open(1, "w", closefd=False, buffering=1) if access_log == "-" else open(access_log, "a", buffering=1)
+    if profile_dir:
+        _profile_dir = Path(profile_dir)
+        _profile_dir.mkdir(parents=True, exist_ok=True)
+
+
+def access_logging() -> bool:
+    return _access_log is not None
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        current = getattr(_local, "request", None)
+        route = current.route if current is not None else "background"
+        if ENABLED:
+            REGISTRY.observe("editor_stage_seconds", (("route", route), ("stage", self.name)), elapsed)
+        if current is not None and current.stages is not None:
+            current.stages[self.name] = current.stages.get(self.name, 0.0) + elapsed
+        return False
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def stage(name: str):
+    if not (ENABLED or _access_log is not None):
+        return _NO_STAGE
+    return _Stage(name)
+
+
+class Request:
+    """What one request reports; the handler fills in status and byte counts as it goes."""
+
+    __slots__ = ("route", "method", "path", "client", "status", "bytes_in", "bytes_out", "stages")
+
+    def __init__(self, route: str, method: str, path: str, client: str):
+        self.route, self.method, self.path, self.client = route, method, path, client
+        self.status = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.stages: dict[str, float] | None = {} if _access_log is not None else None
+
+
+def active() -> bool:
+    return ENABLED or _access_log is not None or _profile_dir is not None
+
+
+def run_request(req: Request, fn: Callable[[], None], profile: bool = True) -> None:
+    """Run ``fn`` as the handling of ``req``: timed, counted, logged and (unless ``profile`` is False) profiled."""
+    _local.request = req
+    _count_in_flight(1)
+    start = time.perf_counter()
+    failed = True
+    try:
+        if _profile_dir is not None and profile:
+            _profiled(req, fn)
+        else:
+            fn()
+        failed = False
+    finally:
+        elapsed = time.perf_counter() - start
+        _count_in_flight(-1)
+        _local.request = None
+        status = str(req.status) if req.status else "exception"
+        if ENABLED:
+            labels = (("route", req.route), ("method", req.method))
+            REGISTRY.add("editor_requests_total", (*labels, ("status", status)))
+            REGISTRY.observe("editor_request_seconds", labels, elapsed)
+            if failed or req.status >= 400:
+                REGISTRY.add("editor_request_errors_total", (*labels, ("status", status)))
+            if req.bytes_in:
+                REGISTRY.add("editor_request_bytes_total", (("route", req.route),), req.bytes_in)
+            if req.bytes_out:
+                REGISTRY.add("editor_response_bytes_total", (("route", req.route),), req.bytes_out)
+        if _access_log is not None:
+            _log(req, status, elapsed)
+
+
+def _log(req: Request, status: str, elapsed: float) -> None:
+    record = {
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "client": req.client,
+        "method": req.method,
+        "path": req.path,
+        "route": req.route,
+        "status": int(status) if status.isdigit() else status,
+        "ms": round(elapsed * 1000, 3),
+        "bytesIn": req.bytes_in,
+        "bytesOut": req.bytes_out,
+        "stagesMs": {name: round(seconds * 1000, 3) for name, seconds in (req.stages or {}).items()},
+    }
+    line = json.dumps(record, ensure_ascii=False)
+    with _access_lock:
+        _access_log.write(line + "\n")
+
+
+def _profiled(req: Request, fn: Callable[[], None]) -> None:
+    global _profile_serial
+    with _profile_lock:
+        _profile_serial += 1
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{_profile_serial:05d}-{req.method}-{re.sub(r'[^A-Za-z0-9]+', '_', req.route).strip('_') or 'root'}.prof"
+        profile = cProfile.Profile()
+        try:
+            profile.runcall(fn)
+        finally:
+            profile.dump_stats(_profile_dir / name)
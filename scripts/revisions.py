@@ -0,0 +1,248 @@
+"""Per-entry revision history stored as line-level deltas.
+
+Each entry has an append-only JSON-lines log. A revision records the entry's
+fields and its body as difflib opcodes against the previous revision's body
+(``[start, end, replacement]`` over lines), so a one-paragraph edit to a long
+article costs a few hundred bytes rather than a full copy. Every
+``KEYFRAME_EVERY`` revisions, or whenever a delta would not be smaller, the
+full body is stored instead, which bounds how far back a read has to replay.
+
+Record keys: ``r`` revision, ``t`` time, ``f`` body field, ``m`` metadata
+(only when it changed, and on keyframes), ``b`` full body or ``d`` delta ops,
+``x`` deleted marker, ``n`` note.
+
+``compact`` applies the retention policy: saves superseded within
+``squash_seconds`` are folded into the next one (noted revisions such as
+baselines and reverts are never folded), and beyond the newest
+``keep`` revisions only those younger than ``keep_days`` survive.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from content_store import atomic_write_text
+
+KEYFRAME_EVERY = 50
+COMPACT_EVERY = 100
+KEEP = int(os.environ.get("EDITOR_HISTORY_KEEP", "200"))
+KEEP_DAYS = float(os.environ.get("EDITOR_HISTORY_KEEP_DAYS", "30"))
+SQUASH_SECONDS = float(os.environ.get("EDITOR_HISTORY_SQUASH_SECONDS", "60"))
+BODY_FIELDS = ("content", "details")
+
+_lock = threading.Lock()
+# path -> (file size, last record, metadata, body field, body, revisions since keyframe)
+_heads: dict[Path, tuple[int, dict, dict, str, str, int]] = {}
+
+
+def split_entry(entry: dict) -> tuple[dict, str, str]:
+    field = next((f for f in BODY_FIELDS if f in entry), "content")
+    meta = {key: value for key, value in entry.items() if key not in BODY_FIELDS}
+    return meta, field, str(entry.get(field, "") or "")
+
+
+def join_entry(meta: dict, field: str, body: str) -> dict:
+    return {**meta, field: body}
+
+
+def diff_ops(old: str, new: str) -> list[list]:
+    a, b = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    return [[i1, i2, "".join(b[j1:j2])] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def apply_ops(old: str, ops: list[list]) -> str:
+    lines = old.splitlines(keepends=True)
+    out, pos = [], 0
+    for start, end, text in ops:
+        out.extend(lines[pos:start])
+        out.append(text)
+        pos = end
+    out.extend(lines[pos:])
+    return "".join(out)
+
+
+def _records(path: Path) -> list[dict]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _replay(records: list[dict]):
+    """Yield (record, metadata, field, body, revisions since keyframe) for every record."""
+    meta, field, body, since = {}, "content", "", 0
+    for record in records:
+        if "m" in record:
+            meta = record["m"]
+        field = record.get("f", field)
+        if "b" in record:
+            body, since = record["b"], 0
+        elif "d" in record:
+            body, since = apply_ops(body, record["d"]), since + 1
+        yield record, meta, field, body, since
+
+
+def _head(path: Path) -> tuple[dict, dict, str, str, int] | None:
+    size = path.stat().st_size if path.exists() else 0
+    cached = _heads.get(path)
+    if cached is not None and cached[0] == size:
+        return cached[1:]
+    head = None
+    for head in _replay(_records(path)):
+        pass
+    if head is not None:
+        _heads[path] = (size, *head)
+    return head
+
+
+def _encode(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _append(path: Path, record: dict, meta: dict, field: str, body: str, since: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(_encode(record))
+    _heads[path] = (path.stat().st_size, record, meta, field, body, since)
+
+
+def record_revision(path: Path, entry: dict, note: str = "", now: float | None = None) -> int:
+    """Append ``entry`` as a new revision (unless it equals the latest); return its number."""
+    meta, field, body = split_entry(entry)
+    with _lock:
+        head = _head(path)
+        if head is not None and not head[0].get("x") and (head[1], head[2], head[3]) == (meta, field, body):
+            return head[0]["r"]
+        rev = head[0]["r"] + 1 if head else 1
+        record: dict = {"r": rev, "t": round(now if now is not None else time.time(), 3), "f": field}
+        if note:
+            record["n"] = note
+        since = 0
+        ops = diff_ops(head[3], body) if head is not None and head[4] + 1 < KEYFRAME_EVERY else None
+        if ops is not None and len(_encode(ops)) < len(_encode(body)):
+            record["d"] = ops
+            since = head[4] + 1
+            if meta != head[1]:
+                record["m"] = meta
+        else:
+            record["m"] = meta
+            record["b"] = body
+        _append(path, record, meta, field, body, since)
+    if rev % COMPACT_EVERY == 0:
+        compact(path)
+    return rev
+
+
+def record_deleted(path: Path, now: float | None = None) -> None:
+    with _lock:
+        head = _head(path)
+        if head is None or head[0].get("x"):
+            return
+        _meta, field, body = head[1], head[2], head[3]
+        record = {"r": head[0]["r"] + 1, "t": round(now if now is not None else time.time(), 3), "x": 1}
+        _append(path, record, _meta, field, body, head[4])
+
+
+def rename(old: Path, new: Path) -> None:
+    """Carry an entry's history over to its new id (an existing log at ``new`` wins)."""
+    with _lock:
+        if old.exists() and not new.exists():
+            new.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(old, new)
+        _heads.pop(old, None)
+        _heads.pop(new, None)
+
+
+def list_revisions(path: Path) -> list[dict]:
+    """Summaries of every revision, newest first."""
+    out = []
+    for record, meta, _field, body, _since in _replay(_records(path)):
+        out.append(
+            {
+                "rev": record["r"],
+                "time": record["t"],
+                "title": meta.get("title", ""),
+                "size": len(body.encode("utf-8")),
+                "stored": "delta" if "d" in record else "full" if "b" in record else "marker",
+                "deleted": bool(record.get("x")),
+                "note": record.get("n", ""),
+            }
+        )
+    return out[::-1]
+
+
+def all_entries(path: Path):
+    """Yield the entry at every revision in ``path``, oldest first (deletion markers skipped)."""
+    for record, meta, field, body, _ in _replay(_records(path)):
+        if not record.get("x"):
+            yield join_entry(meta, field, body)
+
+
+def entry_at(path: Path, rev: int) -> dict | None:
+    records = _records(path)
+    # Replay only from the last keyframe at or before ``rev``.
+    start = 0
+    for i, record in enumerate(records):
+        if record["r"] > rev:
+            break
+        if "b" in record:
+            start = i
+    for record, meta, field, body, _ in _replay(records[start:]):
+        if record["r"] == rev:
+            return None if record.get("x") else join_entry(meta, field, body)
+    return None
+
+
+def compact(
+    path: Path,
+    keep: int = KEEP,
+    keep_days: float = KEEP_DAYS,
+    squash_seconds: float = SQUASH_SECONDS,
+    now: float | None = None,
+) -> tuple[int, int]:
+    """Apply the retention policy and rewrite the log; returns (bytes before, bytes after)."""
+    now = now if now is not None else time.time()
+    with _lock:
+        states = list(_replay(_records(path)))
+        if not states:
+            return 0, 0
+        before = path.stat().st_size
+        squashed = [
+            state
+            for i, state in enumerate(states)
+            if i == len(states) - 1
+            or state[0].get("x")
+            or state[0].get("n")
+            or states[i + 1][0]["t"] - state[0]["t"] >= squash_seconds
+        ]
+        cutoff = now - keep_days * 86400
+        kept = [s for i, s in enumerate(squashed) if i >= len(squashed) - keep or s[0]["t"] >= cutoff]
+        if len(kept) == len(states):
+            return before, before
+
+        lines, previous, since = [], None, 0
+        for record, meta, field, body, _ in kept:
+            out = {key: record[key] for key in ("r", "t", "n", "x") if key in record}
+            if record.get("x"):
+                lines.append(_encode(out))
+                continue
+            out["f"] = field
+            ops = diff_ops(previous[2], body) if previous is not None and since + 1 < KEYFRAME_EVERY else None
+            if ops is not None and len(_encode(ops)) < len(_encode(body)):
+                out["d"], since = ops, since + 1
+                if meta != previous[0]:
+                    out["m"] = meta
+            else:
+                out["m"], out["b"], since = meta, body, 0
+            previous = (meta, field, body)
+            lines.append(_encode(out))
+        atomic_write_text(path, "".join(lines), durable=False)
+        _heads.pop(path, None)
+        return before, path.stat().st_size
@@ -0,0 +1,157 @@
+"""Inverted full-text index over all entries, queried by setupSearch in main.js.
+
+The index covers titles, tags, categories, summaries and bodies, with per-field
+weights. It is kept in memory as term -> {doc: score} postings plus the reverse
+doc -> terms map, so saving or deleting one entry only touches that entry's
+terms. On disk it is a compact JSON document with a sorted term list, which
+lets the browser answer prefix queries with a binary search:
+
+  {"v": 2, "docs": [[kind, id], ...], "terms": [...], "postings": [[doc, score, doc, score, ...], ...]}
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import re
+import unicodedata
+from typing import Iterable
+
+VERSION = 2
+FIELD_WEIGHTS = (("title", 5), ("tags", 4), ("category", 3), ("summary", 2), ("content", 1), ("details", 1))
+MAX_COUNTED = 3
+TOKEN = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` and drop combining marks, as ``foldText`` in main.js does.
+
+    Marks are not word characters, so vowelled Arabic (or an accented letter)
+    would otherwise split into single-letter tokens.
+    """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.category(c).startswith("M"))
+    return unicodedata.normalize("NFC", stripped)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(fold(text))
+
+
+def entry_terms(entry: dict) -> dict[str, int]:
+    scores: dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS:
+        value = entry.get(field)
+        if not value:
+            continue
+        text = " ".join(map(str, value)) if isinstance(value, list) else str(value)
+        counts: dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            scores[token] = scores.get(token, 0) + weight * min(count, MAX_COUNTED)
+    return scores
+
+
+class SearchIndex:
+    def __init__(self):
+        self.docs: dict[tuple[str, str], dict[str, int]] = {}
+        self.postings: dict[str, dict[tuple[str, str], int]] = {}
+        self._sorted_terms: list[str] | None = None
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[str, dict]]) -> "SearchIndex":
+        index = cls()
+        for kind, entry in entries:
+            index.update(kind, entry)
+        return index
+
+    @classmethod
+    def from_json(cls, data: dict) -> "SearchIndex":
+        index = cls()
+        if data.get("v") != VERSION:
+            raise ValueError("unsupported search index version")
+        docs = [tuple(doc) for doc in data["docs"]]
+        for key in docs:
+            index.docs[key] = {}
+        for term, flat in zip(data["terms"], data["postings"]):
+            postings = index.postings[term] = {}
+            for i in range(0, len(flat), 2):
+                key = docs[flat[i]]
+                postings[key] = flat[i + 1]
+                index.docs[key][term] = flat[i + 1]
+        return index
+
+    def update(self, kind: str, entry: dict) -> bool:
+        """(Re)index one entry; False if its terms and scores are unchanged."""
+        key = (kind, str(entry.get("id", "")))
+        if not key[1]:
+            return False
+        terms = entry_terms(entry)
+        if self.docs.get(key) == terms:
+            return False
+        self.remove(kind, key[1])
+        self.docs[key] = terms
+        for term, score in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._sorted_terms = None
+            postings[key] = score
+        return True
+
+    def remove(self, kind: str, entry_id: str) -> bool:
+        key = (kind, entry_id)
+        terms = self.docs.pop(key, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+                    self._sorted_terms = None
+        return True
+
+    def terms_with_prefix(self, prefix: str) -> list[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def search(self, query: str, kind: str | None = None) -> list[tuple[str, str, int]]:
+        """Entries matching every query token, each as a term prefix, best first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        totals: dict[tuple[str, str], int] | None = None
+        for token in tokens:
+            matches: dict[tuple[str, str], int] = {}
+            for term in self.terms_with_prefix(token):
+                for key, score in self.postings[term].items():
+                    if kind is None or key[0] == kind:
+                        matches[key] = matches.get(key, 0) + score
+            totals = matches if totals is None else {k: v + matches[k] for k, v in totals.items() if k in matches}
+        ranked = sorted(totals.items(), key=lambda row: -row[1])
+        return [(k, i, score) for (k, i), score in ranked]
+
+    def to_json(self) -> str:
+        doc_keys = sorted(self.docs)
+        doc_ids = {key: n for n, key in enumerate(doc_keys)}
+        # Sort by UTF-16 code units, the order JavaScript's string comparison uses.
+        terms = sorted(self.postings, key=lambda term: term.encode("utf-16-be"))
+        postings = []
+        for term in terms:
+            flat: list[int] = []
+            for key, score in sorted(self.postings[term].items(), key=lambda row: -row[1]):
+                flat += (doc_ids[key], score)
+            postings.append(flat)
+        data = {"v": VERSION, "docs": [list(key) for key in doc_keys], "terms": terms, "postings": postings}
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
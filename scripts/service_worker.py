@@ -0,0 +1,140 @@
+"""The site's service worker (``sw.js``), generated alongside the fingerprinted assets.
+
+Strategies, by URL:
+
+* ``assets/build/<name>.<hash>.<ext>`` is cache-first. A name never changes
+  content, so a copy cached by any earlier version of the worker is reused and
+  a deploy only downloads the files whose hash changed.
+* Pages and unhashed data (``assets/data/**``, per-entry shards) are
+  stale-while-revalidate: a repeat navigation renders from the cache with no
+  round trip, and the copy is refreshed in the background (a conditional
+  request, so usually a 304).
+* The editor's own routes (``/api/``, ``/editor``, ``/metrics``) and other
+  origins are never intercepted.
+
+The worker embeds a version derived from the asset manifest and the pages, so
+each build that changes either produces a new ``sw.js``. Browsers compare the
+script byte for byte on navigation, install the new one, and it precaches the
+shell (pages and every fingerprinted file) before taking over. Icons are left
+to the HTTP cache: the site's are megabytes each, and every new worker version
+would download them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+FILE_NAME = "sw.js"
+
+TEMPLATE = """// Generated by scripts/asset_bundle.py (see scripts/service_worker.py); do not edit.
+const VERSION = __VERSION__;
+const PRECACHE = __PRECACHE__;
+const SHELL_CACHE = `shell-${VERSION}`;
+const PAGES_CACHE = "pages";
+const FINGERPRINTED = /\\/assets\\/build\\/[^/]+\\.[0-9a-f]{__HASH_CHARS__}\\.\\w+$/;
+const BYPASS = /^\\/(api\\/|editor|metrics)/;
+
+function cacheKey(url) {
+  // Pages are cached without their query (detail.html?type=..&id=.. is one page) and "/" as "/index.html".
+  const key = new URL(url);
+  if (key.pathname.endsWith("/")) key.pathname += "index.html";
+  if (key.pathname.endsWith(".html")) key.search = "";
+  key.hash = "";
+  return key.href;
+}
+
+async function fetchOk(request) {
+  const response = await fetch(request);
+  if (!response.ok) throw new Error(`${response.status} for ${request.url || request}`);
+  return response;
+}
+
+async function precache() {
+  const shell = await caches.open(SHELL_CACHE);
+  const pages = await caches.open(PAGES_CACHE);
+  await Promise.all(
+    PRECACHE.map(async (path) => {
+      const url = new URL(path, self.registration.scope).href;
+      if (FINGERPRINTED.test(url)) {
+        const cached = await caches.match(url);
+        await shell.put(url, cached || (await fetchOk(url)));
+      } else {
+        await pages.put(cacheKey(url), await fetchOk(new Request(url, { cache: "no-cache" })));
+      }
+    })
+  );
+}
+
+async function dropOldVersions() {
+  const names = await caches.keys();
+  await Promise.all(names.filter((name) => name.startsWith("shell-") && name !== SHELL_CACHE).map((name) => caches.delete(name)));
+}
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) return cached;
+  const response = await fetchOk(request);
+  const shell = await caches.open(SHELL_CACHE);
+  await shell.put(request, response.clone());
+  return response;
+}
+
+async function staleWhileRevalidate(event) {
+  const key = cacheKey(event.request.url);
+  const pages = await caches.open(PAGES_CACHE);
+  const cached = await pages.match(key);
+  const refresh = fetch(event.request).then(async (response) => {
+    if (response.ok) await pages.put(key, response.clone());
+    return response;
+  });
+  if (!cached) return refresh;
+  event.waitUntil(refresh.catch(() => undefined));
+  return cached;
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(dropOldVersions().then(() => self.clients.claim()));
+});
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== "GET" || url.origin !== self.location.origin || BYPASS.test(url.pathname)) return;
+  if (FINGERPRINTED.test(url.pathname)) {
+    event.respondWith(cacheFirst(request));
+  } else if (request.mode === "navigate" || url.pathname.endsWith(".html") || url.pathname.includes("/assets/data/")) {
+    event.respondWith(staleWhileRevalidate(event));
+  }
+});
+"""
+
+
+def precache_list(root: Path, pages: tuple[str, ...], built: list[str]) -> list[str]:
+    """Site-relative URLs the worker fetches at install: pages and every build."""
+    paths = [p for p in pages if (root / p).exists()]
+    return sorted(set(paths)) + sorted(set(built))
+
+
+def version(root: Path, precache: list[str]) -> str:
+    """Changes whenever a precached file does (builds already carry their hash in the name)."""
+    h = hashlib.sha256()
+    for path in precache:
+        h.update(path.encode("utf-8") + b"\0")
+        if not path.startswith("assets/build/"):
+            h.update(hashlib.sha256((root / path).read_bytes()).digest())
+    return h.hexdigest()[:16]
+
+
+def render(root: Path, pages: tuple[str, ...], built: list[str], hash_chars: int) -> str:
+    precache = precache_list(root, pages, built)
+    return (
+        TEMPLATE.replace("__VERSION__", json.dumps(version(root, precache)))
+        .replace("__PRECACHE__", json.dumps(precache, indent=2))
+        .replace("__HASH_CHARS__", str(hash_chars))
+    )
@@ -0,0 +1,342 @@
+"""SQLite storage for entries: the editor's alternative to the JSON data files.
+
+Selected with ``EDITOR_STORAGE=sqlite``. Every entry is one row, so saving,
+deleting or reading one entry no longer scales with the size of its kind,
+and search is answered by an FTS5 index weighted like
+assets/data/search-index.json (title, tags, category, summary, body).
+
+The database runs in WAL mode, so readers never wait for the writer. Each
+thread has its own connection and writes are serialised. ``synchronous=NORMAL``
+gives up durability of the last few commits on power loss, not consistency;
+the JSON store's write-behind makes a similar trade.
+
+Listing order is a ``position`` per row, and "move to front" takes the
+current minimum minus one. Each kind has a version that every write bumps,
+and every row records the version that last wrote it. Together with
+tombstones for deleted ids, this lets ``pending_export`` hand back only what
+changed since the static JSON files were last written.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from search_index import VERSION as SEARCH_VERSION, fold, tokenize
+
+BODY_FIELDS = ("content", "details")
+# bm25 column weights, in entries_fts column order; the same weights as search_index.FIELD_WEIGHTS.
+SEARCH_WEIGHTS = (5.0, 4.0, 3.0, 2.0, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kinds (
+    kind TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    exported INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    n INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position REAL NOT NULL,
+    record TEXT NOT NULL,
+    field TEXT NOT NULL,
+    body TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    UNIQUE (kind, id)
+);
+CREATE INDEX IF NOT EXISTS entries_order ON entries (kind, position);
+CREATE TABLE IF NOT EXISTS deleted (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, tags, category, summary, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+"""
+
+
+def split_entry(item: dict) -> tuple[dict, str, str]:
+    field = next((f for f in BODY_FIELDS if f in item), BODY_FIELDS[0])
+    record = {key: value for key, value in item.items() if key not in BODY_FIELDS}
+    return record, field, str(item.get(field, "") or "")
+
+
+def _encode(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _search_columns(item: dict, body: str) -> tuple[str, ...]:
+    # Folded as search_index.tokenize folds queries; FTS5's unicode61 would split at the marks.
+    tags = item.get("tags") or []
+    return tuple(
+        fold(column)
+        for column in (
+            str(item.get("title", "")),
+            " ".join(str(tag) for tag in tags) if isinstance(tags, list) else str(tags),
+            str(item.get("category", "")),
+            str(item.get("summary", "")),
+            body,
+        )
+    )
+
+
+class SqliteStore:
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # kind -> (version, listing): reloading every row per request is the slow part of a list.
+        self._index: dict[str, tuple[int, list[dict]]] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SEARCH_VERSION:
+            self._reindex_search()
+
+    def _reindex_search(self) -> None:
+        """Rebuild the FTS rows, for a database indexed under another ``search_index.VERSION``."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM entries_fts")
+            for n, record, field, body in conn.execute("SELECT n, record, field, body FROM entries").fetchall():
+                conn.execute(
+                    "INSERT INTO entries_fts (rowid, title, tags, category, summary, body) VALUES (?, ?, ?, ?, ?, ?)",
+                    (n, *_search_columns(self._row_entry(record, field, body), body)),
+                )
+            conn.execute(f"PRAGMA user_version = {SEARCH_VERSION}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_entry(record: str, field: str, body: str) -> dict:
+        return {**json.loads(record), field: body}
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, kind: str) -> int:
+        conn.execute("INSERT OR IGNORE INTO kinds (kind) VALUES (?)", (kind,))
+        conn.execute("UPDATE kinds SET version = version + 1 WHERE kind = ?", (kind,))
+        return conn.execute("SELECT version FROM kinds WHERE kind = ?", (kind,)).fetchone()[0]
+
+    @staticmethod
+    def _front(conn: sqlite3.Connection, kind: str) -> float:
+        row = conn.execute("SELECT MIN(position) FROM entries WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row[0] is not None else 0.0
+
+    def _put(self, conn: sqlite3.Connection, kind: str, item: dict, position: float | None, version: int) -> None:
+        """Insert or overwrite one entry; ``position`` None keeps an existing row where it is."""
+        record, field, body = split_entry(item)
+        entry_id = str(item.get("id", ""))
+        row = conn.execute("SELECT n, position FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)).fetchone()
+        if row is None:
+            cursor = conn.execute(
+                "INSERT INTO entries (kind, id, position, record, field, body, version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, entry_id, position if position is not None else 0.0, _encode(record), field, body, version),
+            )
+            n = cursor.lastrowid
+        else:
+            n = row[0]
+            conn.execute(
+                "UPDATE entries SET position = ?, record = ?, field = ?, body = ?, version = ? WHERE n = ?",
+                (position if position is not None else row[1], _encode(record), field, body, version, n),
+            )
+            conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (n,))
+        conn.execute(
+            "INSERT INTO entries_fts (rowid, title, tags, category, summary, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (n, *_search_columns(item, body)),
+        )
+        conn.execute("DELETE FROM deleted WHERE kind = ? AND id = ?", (kind, entry_id))
+
+    def _drop(self, conn: sqlite3.Connection, kind: str, entry_id: str, version: int) -> bool:
+        row = conn.execute("SELECT n FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM entries WHERE n = ?", (row[0],))
+        conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (row[0],))
+        conn.execute("INSERT OR REPLACE INTO deleted (kind, id, version) VALUES (?, ?, ?)", (kind, entry_id, version))
+        return True
+
+    def has_kind(self, kind: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM kinds WHERE kind = ?", (kind,)).fetchone() is not None
+
+    def seed(self, kind: str, entries: Iterable[dict]) -> int:
+        """Load a kind from its JSON files, in listing order; the JSON already matches, so nothing is pending export."""
+        count = 0
+        with self._write() as conn:
+            version = self._bump(conn, kind)
+            for count, item in enumerate(entries, 1):
+                self._put(conn, kind, item, float(count), version)
+            conn.execute("UPDATE kinds SET exported = version WHERE kind = ?", (kind,))
+        return count
+
+    def version(self, kind: str) -> int:
+        row = self._conn().execute("SELECT version FROM kinds WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else 0
+
+    def entry_version(self, kind: str, entry_id: str) -> int:
+        conn = self._conn()
+        row = conn.execute("SELECT version FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)).fetchone()
+        if row is None:
+            row = conn.execute("SELECT version FROM deleted WHERE kind = ? AND id = ?", (kind, entry_id)).fetchone()
+        return row[0] if row else 0
+
+    def entry_versions(self, kind: str) -> dict[str, int]:
+        rows = self._conn().execute("SELECT id, version FROM entries WHERE kind = ?", (kind,))
+        return {entry_id: version for entry_id, version in rows}
+
+    def index(self, kind: str) -> list[dict]:
+        """Listing records in order, shared between callers until the kind's version moves."""
+        version = self.version(kind)
+        cached = self._index.get(kind)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        conn = self._conn()
+        # Read version and rows in one snapshot so the cache never pairs old rows with a new version.
+        conn.execute("BEGIN")
+        try:
+            version = conn.execute("SELECT version FROM kinds WHERE kind = ?", (kind,)).fetchone()
+            rows = conn.execute("SELECT record FROM entries WHERE kind = ? ORDER BY position", (kind,)).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        listing = [json.loads(record) for (record,) in rows]
+        self._index[kind] = (version[0] if version else 0, listing)
+        return listing
+
+    def entries(self, kind: str) -> list[dict]:
+        rows = self._conn().execute("SELECT record, field, body FROM entries WHERE kind = ? ORDER BY position", (kind,))
+        return [self._row_entry(*row) for row in rows]
+
+    def get(self, kind: str, entry_id: str) -> dict | None:
+        row = (
+            self._conn()
+            .execute("SELECT record, field, body FROM entries WHERE kind = ? AND id = ?", (kind, entry_id))
+            .fetchone()
+        )
+        return self._row_entry(*row) if row else None
+
+    def upsert_front(self, kind: str, item: dict, replace_ids: list[str] = ()) -> bool:
+        """Store ``item`` as the first entry of its kind, dropping ``replace_ids``; False if nothing changed."""
+        entry_id = str(item.get("id", ""))
+        with self._write() as conn:
+            renamed = any(
+                conn.execute("SELECT 1 FROM entries WHERE kind = ? AND id = ?", (kind, old)).fetchone()
+                for old in replace_ids
+            )
+            row = conn.execute(
+                "SELECT record, field, body, position FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)
+            ).fetchone()
+            if not renamed and row is not None and row[3] <= self._front(conn, kind):
+                if self._row_entry(*row[:3]) == item:
+                    return False
+            version = self._bump(conn, kind)
+            for old in replace_ids:
+                self._drop(conn, kind, old, version)
+            self._put(conn, kind, item, self._front(conn, kind) - 1, version)
+        return True
+
+    def update(self, kind: str, entry_id: str, fn: Callable[[dict], dict | None]) -> bool:
+        """Replace an entry in place with ``fn(entry)``; ``fn`` returns None to leave it alone."""
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT record, field, body FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)
+            ).fetchone()
+            if row is None:
+                return False
+            current = self._row_entry(*row)
+            new = fn(current)
+            if new is None or new == current:
+                return False
+            self._put(conn, kind, {**new, "id": entry_id}, None, self._bump(conn, kind))
+        return True
+
+    def delete(self, kind: str, entry_id: str) -> bool:
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM entries WHERE kind = ? AND id = ?", (kind, entry_id)).fetchone() is None:
+                return False
+            return self._drop(conn, kind, entry_id, self._bump(conn, kind))
+
+    def save_many(self, kind: str, items: list[dict], dry_run: bool = False) -> tuple[int, int, int]:
+        """Bulk ``upsert`` in one transaction: new entries go to the front in input order,
+        existing ones are updated where they stand. Returns (added, updated, unchanged)."""
+        with self._write() as conn:
+            added, updated, unchanged = [], [], 0
+            for item in items:
+                row = conn.execute(
+                    "SELECT record, field, body FROM entries WHERE kind = ? AND id = ?", (kind, item["id"])
+                ).fetchone()
+                if row is None:
+                    added.append(item)
+                elif self._row_entry(*row) == item:
+                    unchanged += 1
+                else:
+                    updated.append(item)
+            if not dry_run and (added or updated):
+                version = self._bump(conn, kind)
+                for item in updated:
+                    self._put(conn, kind, item, None, version)
+                front = self._front(conn, kind)
+                for offset, item in enumerate(added):
+                    self._put(conn, kind, item, front - len(added) + offset, version)
+        return len(added), len(updated), unchanged
+
+    def search(self, kind: str, query: str) -> list[str]:
+        """Ids of ``kind`` entries matching every token of ``query`` as a prefix, best match first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " AND ".join(f'"{token}"*' for token in tokens)
+        rows = self._conn().execute(
+            "SELECT e.id FROM entries_fts JOIN entries e ON e.n = entries_fts.rowid"
+            f" WHERE entries_fts MATCH ? AND e.kind = ? ORDER BY bm25(entries_fts, {', '.join(map(str, SEARCH_WEIGHTS))}),"
+            " e.position",
+            (match, kind),
+        )
+        return [entry_id for (entry_id,) in rows]
+
+    def pending_export(self, kind: str) -> tuple[int, list[dict], list[str]] | None:
+        """(version, entries written, ids deleted) since ``mark_exported``; None if nothing changed."""
+        conn = self._conn()
+        row = conn.execute("SELECT version, exported FROM kinds WHERE kind = ?", (kind,)).fetchone()
+        if row is None or row[0] == row[1]:
+            return None
+        version, exported = row
+        changed = [
+            self._row_entry(*r)
+            for r in conn.execute(
+                "SELECT record, field, body FROM entries WHERE kind = ? AND version > ?", (kind, exported)
+            )
+        ]
+        deleted = [
+            entry_id
+            for (entry_id,) in conn.execute("SELECT id FROM deleted WHERE kind = ? AND version > ?", (kind, exported))
+        ]
+        return version, changed, deleted
+
+    def mark_exported(self, kind: str, version: int) -> None:
+        with self._write() as conn:
+            conn.execute("UPDATE kinds SET exported = ? WHERE kind = ?", (version, kind))
+            conn.execute("DELETE FROM deleted WHERE kind = ? AND version <= ?", (kind, version))
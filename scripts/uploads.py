@@ -0,0 +1,87 @@
+"""Streaming request bodies for the editor server.
+
+Uploads are read from the socket in fixed-size chunks, hashed as they arrive
+and written to a temp file next to their destination, so an image is never
+held in memory as a whole (let alone as base64 inside a JSON payload).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import tempfile
+from email.message import Message
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+def iter_body_chunks(rfile: BinaryIO, headers: Message, limit: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the request body in chunks, honouring Content-Length or chunked encoding."""
+    if "chunked" in headers.get("Transfer-Encoding", "").lower():
+        yield from _iter_chunked(rfile, limit, chunk_size)
+        return
+    remaining = int(headers.get("Content-Length") or 0)
+    if remaining > limit:
+        raise BodyTooLarge(f"Upload exceeds limit of {limit} bytes")
+    while remaining > 0:
+        chunk = rfile.read(min(chunk_size, remaining))
+        if not chunk:
+            raise ValueError("Connection closed before upload finished")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _iter_chunked(rfile: BinaryIO, limit: int, chunk_size: int) -> Iterator[bytes]:
+    total = 0
+    while True:
+        size_line = rfile.readline(1024)
+        if not size_line:
+            raise ValueError("Connection closed before upload finished")
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            while rfile.readline(1024) not in (b"\r\n", b"\n", b""):
+                pass
+            return
+        total += size
+        if total > limit:
+            raise BodyTooLarge(f"Upload exceeds limit of {limit} bytes")
+        while size > 0:
+            chunk = rfile.read(min(chunk_size, size))
+            if not chunk:
+                raise ValueError("Connection closed before upload finished")
+            size -= len(chunk)
+            yield chunk
+        rfile.readline(1024)
+
+
+def read_body(rfile: BinaryIO, headers: Message, limit: int) -> bytes:
+    return b"".join(iter_body_chunks(rfile, headers, limit))
+
+
+def stream_to_temp(chunks: Iterator[bytes], directory: Path) -> tuple[Path, str, int]:
+    """Write ``chunks`` to a temp file in ``directory``; return (path, sha256 hex, size)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".upload-", suffix=".tmp", dir=directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in chunks:
+                digest.update(chunk)
+                fh.write(chunk)
+                size += len(chunk)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp_name, 0o644)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    return Path(tmp_name), digest.hexdigest(), size
@@ -0,0 +1,97 @@
+// Generated by scripts/asset_bundle.py (see scripts/service_worker.py); do not edit.
+const VERSION = "0d7a1dc3e6bd32b7";
+const PRECACHE = [
+  "articles.html",
+  "detail.html",
+  "index.html",
+  "projects.html",
+  "quranic-notes.html",
+  "assets/build/articles.4f53cda18c.json",
+  "assets/build/content.77ae450a78.js",
+  "assets/build/main.c62a9abd96.css",
+  "assets/build/main.e718fbe485.js",
+  "assets/build/projects.41718d6043.json",
+  "assets/build/quranic_notes.4f53cda18c.json",
+  "assets/build/search-index.42fa4ab0d6.json"
+];
+const SHELL_CACHE = `shell-${VERSION}`;
+const PAGES_CACHE = "pages";
+const FINGERPRINTED = /\/assets\/build\/[^/]+\.[0-9a-f]{10}\.\w+$/;
+const BYPASS = /^\/(api\/|editor|metrics)/;
+
+function cacheKey(url) {
+  // Pages are cached without their query (detail.html?type=..&id=.. is one page) and "/" as "/index.html".
+  const key = new URL(url);
+  if (key.pathname.endsWith("/")) key.pathname += "index.html";
+  if (key.pathname.endsWith(".html")) key.search = "";
+  key.hash = "";
+  return key.href;
+}
+
+async function fetchOk(request) {
+  const response = await fetch(request);
+  if (!response.ok) throw new Error(`${response.status} for ${request.url || request}`);
+  return response;
+}
+
+async function precache() {
+  const shell = await caches.open(SHELL_CACHE);
+  const pages = await caches.open(PAGES_CACHE);
+  await Promise.all(
+    PRECACHE.map(async (path) => {
+      const url = new URL(path, self.registration.scope).href;
+      if (FINGERPRINTED.test(url)) {
+        const cached = await caches.match(url);
+        await shell.put(url, cached || (await fetchOk(url)));
+      } else {
+        await pages.put(cacheKey(url), await fetchOk(new Request(url, { cache: "no-cache" })));
+      }
+    })
+  );
+}
+
+async function dropOldVersions() {
+  const names = await caches.keys();
+  await Promise.all(names.filter((name) => name.startsWith("shell-") && name !== SHELL_CACHE).map((name) => caches.delete(name)));
+}
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) return cached;
+  const response = await fetchOk(request);
+  const shell = await caches.open(SHELL_CACHE);
+  await shell.put(request, response.clone());
+  return response;
+}
+
+async function staleWhileRevalidate(event) {
+  const key = cacheKey(event.request.url);
+  const pages = await caches.open(PAGES_CACHE);
+  const cached = await pages.match(key);
+  const refresh = fetch(event.request).then(async (response) => {
+    if (response.ok) await pages.put(key, response.clone());
+    return response;
+  });
+  if (!cached) return refresh;
+  event.waitUntil(refresh.catch(() => undefined));
+  return cached;
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(dropOldVersions().then(() => self.clients.claim()));
+});
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== "GET" || url.origin !== self.location.origin || BYPASS.test(url.pathname)) return;
+  if (FINGERPRINTED.test(url.pathname)) {
+    event.respondWith(cacheFirst(request));
+  } else if (request.mode === "navigate" || url.pathname.endsWith(".html") || url.pathname.includes("/assets/data/")) {
+    event.respondWith(staleWhileRevalidate(event));
+  }
+});